@@ -0,0 +1,332 @@
+"""
+Job queue for AI model requests.
+
+- at most max_concurrency model calls in flight, optionally rate limited
+- priorities: INTERACTIVE jobs are taken ahead of every queued BATCH job
+- BATCH jobs can be packed, up to batch_size at a time (per job, defaulting
+  to the queue's), into one request whose answer is split back per job
+- a failed, timed-out or missing item is re-queued on its own with jittered
+  exponential backoff, so it never holds up the rest
+- identical jobs (same key) share one future; an interactive submit of a
+  queued batch job moves it ahead
+
+The queue knows nothing about prompts: jobs carry an opaque request, and
+the caller supplies the functions that turn one request (generate) or many
+(generate_many) into text.
+"""
+
+import itertools
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from http_client import TokenBucket
+
+# Lower runs first
+INTERACTIVE = 0
+BATCH = 10
+
+
+class AIJob:
+    __slots__ = (
+        "key",
+        "request",
+        "priority",
+        "model_client",
+        "batch_size",
+        "future",
+        "attempts",
+        "packable",
+        "entry",
+    )
+
+    def __init__(
+        self,
+        key: Hashable,
+        request: Any,
+        priority: int,
+        model_client: Any = None,
+        batch_size: int = 1,
+    ):
+        self.key = key
+        self.request = request
+        self.priority = priority
+        self.model_client = model_client
+        # Most jobs packed with this one into a single request
+        self.batch_size = batch_size
+        self.future = Future()
+        self.attempts = 0
+        # Cleared after a failed pack so the retry goes out alone
+        self.packable = True
+        # The live queue entry; None while running or waiting to retry
+        self.entry = None
+
+
+class AIJobQueue:
+    """
+    generate(request, model_client) -> text
+    generate_many({key: request}, model_client) -> {key: text}, where keys
+    missing from the answer are retried individually
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[Any, Any], str],
+        generate_many: Optional[
+            Callable[[Dict[Hashable, Any], Any], Dict[Hashable, str]]
+        ] = None,
+        name: str = "ai",
+        max_concurrency: int = 4,
+        batch_size: int = 1,
+        batch_wait: float = 0.05,
+        retries: int = 2,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        timeout: float = 60.0,
+        rate: float = 0.0,
+        burst: float = 1.0,
+    ):
+        self.generate = generate
+        self.generate_many = generate_many
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, burst)
+
+        self._queue = queue.PriorityQueue()  # (priority, order, job)
+        self._order = itertools.count()
+        self._jobs: Dict[Hashable, AIJob] = {}
+        self._lock = threading.Lock()
+        # Workers and the call pool start with the first job
+        self._workers: List[threading.Thread] = []
+        self._calls: Optional[ThreadPoolExecutor] = None
+
+        self._stats = {
+            "submitted": 0,
+            "shared": 0,
+            "requests": 0,
+            "packed_requests": 0,
+            "packed_jobs": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "failed": 0,
+            "completed": 0,
+            "throttled_seconds": 0.0,
+        }
+
+    def _incr(self, counter: str, amount: float = 1) -> None:
+        with self._lock:
+            self._stats[counter] += amount
+
+    def submit(
+        self,
+        key: Hashable,
+        request: Any,
+        priority: int = INTERACTIVE,
+        model_client: Any = None,
+        batch_size: Optional[int] = None,
+    ) -> Future:
+        """
+        Queues a job; the future resolves to its text or its last error.
+        batch_size overrides the queue's pack size for this job.
+        """
+
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                self._stats["shared"] += 1
+                if priority < job.priority:
+                    job.priority = priority
+                    if job.entry is not None:
+                        # Still queued: re-queue at the new priority; the old
+                        # entry is skipped when it comes up
+                        self._put(job)
+                return job.future
+
+            job = self._jobs[key] = AIJob(
+                key, request, priority, model_client, batch_size or self.batch_size
+            )
+            self._stats["submitted"] += 1
+            if not self._workers:
+                self._start_workers()
+            self._put(job)
+
+        job.future.add_done_callback(lambda _: self._forget(job))
+        return job.future
+
+    def _forget(self, job: AIJob) -> None:
+        with self._lock:
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+
+    def _put(self, job: AIJob, order: Optional[int] = None) -> None:
+        entry = (job.priority, next(self._order) if order is None else order, job)
+        job.entry = entry
+        self._queue.put(entry)
+
+    def _requeue(self, job: AIJob) -> None:
+        with self._lock:
+            self._put(job)
+
+    def _start_workers(self) -> None:
+        # Model calls run here so a worker can give up on one that hangs; the
+        # spare threads absorb abandoned calls
+        self._calls = ThreadPoolExecutor(
+            max_workers=self.max_concurrency * 2, thread_name_prefix=f"{self.name}-call"
+        )
+        for i in range(self.max_concurrency):
+            worker = threading.Thread(
+                target=self._work, name=f"{self.name}-worker-{i}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _claim(self, entry: tuple) -> Optional[AIJob]:
+        job = entry[2]
+        with self._lock:
+            if job.entry is not entry:
+                return None  # superseded by a later entry
+            job.entry = None
+            return job
+
+    def _packable(self, job: AIJob) -> bool:
+        # Interactive jobs always go out alone and without waiting
+        return (
+            self.generate_many is not None
+            and job.batch_size > 1
+            and job.priority >= BATCH
+            and job.packable
+        )
+
+    def _take_batch(self, first: AIJob) -> List[AIJob]:
+        jobs = [first]
+        if not self._packable(first):
+            return jobs
+
+        deadline = time.monotonic() + self.batch_wait
+        while len(jobs) < first.batch_size:
+            try:
+                entry = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+
+            job = self._claim(entry)
+            if job is None:
+                continue
+            if (
+                not self._packable(job)
+                or job.priority != first.priority
+                or job.model_client is not first.model_client
+                or job.batch_size != first.batch_size
+            ):
+                # Back in its original place for another worker
+                with self._lock:
+                    self._put(job, entry[1])
+                break
+            jobs.append(job)
+        return jobs
+
+    def _work(self) -> None:
+        while True:
+            job = self._claim(self._queue.get())
+            if job is None:
+                continue
+
+            jobs = self._take_batch(job)
+            throttled = self.bucket.acquire()
+            if throttled:
+                self._incr("throttled_seconds", throttled)
+
+            if len(jobs) == 1:
+                self._run_one(job)
+            else:
+                self._run_many(jobs)
+
+    def _call(self, fn: Callable, *args) -> Any:
+        self._incr("requests")
+        started = threading.Event()
+
+        def run() -> Any:
+            started.set()
+            return fn(*args)
+
+        call = self._calls.submit(run)
+        # The timeout starts once the call runs: waiting for a thread still
+        # held by an abandoned call (until its client gives up) doesn't count
+        started.wait()
+        try:
+            return call.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Not the builtin TimeoutError before Python 3.11
+            self._incr("timeouts")
+            raise TimeoutError(
+                f"{self.name} request timed out after {self.timeout:g}s"
+            ) from None
+
+    def _run_one(self, job: AIJob) -> None:
+        try:
+            text = self._call(self.generate, job.request, job.model_client)
+        except Exception as e:
+            self._retry(job, e)
+            return
+        self._complete(job, text)
+
+    def _run_many(self, jobs: List[AIJob]) -> None:
+        self._incr("packed_requests")
+        self._incr("packed_jobs", len(jobs))
+        try:
+            texts = self._call(
+                self.generate_many,
+                {job.key: job.request for job in jobs},
+                jobs[0].model_client,
+            )
+        except Exception as e:
+            texts, error = {}, e
+        else:
+            error = LookupError("missing from the packed response")
+
+        for job in jobs:
+            text = texts.get(job.key)
+            if text:
+                self._complete(job, text)
+            else:
+                job.packable = False
+                self._retry(job, error)
+
+    def _complete(self, job: AIJob, text: str) -> None:
+        self._incr("completed")
+        job.future.set_result(text)
+
+    def _retry(self, job: AIJob, error: Exception) -> None:
+        job.attempts += 1
+        if job.attempts > self.retries:
+            self._incr("failed")
+            job.future.set_exception(error)
+            return
+
+        self._incr("retries")
+        delay = random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (job.attempts - 1))
+        )
+        timer = threading.Timer(delay, self._requeue, (job,))
+        timer.daemon = True
+        timer.start()
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._jobs)
+        stats["throttled_seconds"] = round(stats["throttled_seconds"], 3)
+        stats["queued"] = self._queue.qsize()
+        stats["max_concurrency"] = self.max_concurrency
+        stats["batch_size"] = self.batch_size
+        return stats
@@ -1,8 +1,39 @@
 import streamlit as st
 
-from pokemon_analyzer import analyze_complete_team
+from metrics import configure_logging, start_metrics_server, timed
+from names import suggest_names
+from pokemon_analyzer import (
+    get_cached_team_analysis,
+    prefetch_pokemon,
+    stream_ai_team_recommendations,
+)
+from sprites import get_sprites, prefetch_sprite
+
+# Sprites are shown (and cached) at this width in pixels
+SPRITE_SIZE = 80
+
+def prefetch_input(key):
+    """Starts fetching a Pokemon, then its sprite, as soon as its name field is filled"""
+    future = prefetch_pokemon(st.session_state.get(key, ""))
+    if future is not None:
+        future.add_done_callback(prefetch_sprite_of)
+
+def prefetch_sprite_of(future):
+    pokemon = future.result() if future.exception() is None else None
+    if pokemon:
+        prefetch_sprite(pokemon["sprite"], SPRITE_SIZE)
+
+def show_name_suggestions(names):
+    """'Did you mean' hints for names the local index doesn't know"""
+    for name, candidates in suggest_names(names).items():
+        options = " or ".join(f"**{candidate.title()}**" for candidate in candidates)
+        st.info(f"💡 {name}: did you mean {options}?")
 
 def main():
+    # Logs go to stderr; the metrics endpoint only starts when METRICS_PORT is set
+    configure_logging()
+    start_metrics_server()
+
     # Page config
     st.set_page_config(
         page_title="Pokemon Team Analyzer",
@@ -26,7 +57,9 @@ def main():
             pokemon = st.text_input(
                 f"Pokemon {i+1}:",
                 key=f"pokemon_{i}",
-                placeholder=f"e.g., Charizard"
+                placeholder=f"e.g., Charizard",
+                on_change=prefetch_input,
+                args=(f"pokemon_{i}",),
            )
             if pokemon.strip():
                 pokemon_inputs.append(pokemon.strip())
@@ -37,7 +70,7 @@ def main():
         st.markdown("---")
         st.markdown("### 💡 Tips:")
         st.markdown("• Enter Pokemon names in English")
-        st.markdown("• Spelling matters (e.g., 'Charizard')")
+        st.markdown("• Spaces and forms (e.g., 'Alolan Raichu') are OK; misspelled names get suggestions")
         st.markdown("• Minimum 1 Pokemon required")
     
     # Main content area
@@ -47,11 +80,13 @@ def main():
             return
         
         with st.spinner("🔍 Analyzing your team..."):
-            # Run analysis
-            result = analyze_complete_team(pokemon_inputs)
+            # Run analysis (shared across sessions); AI recommendations
+            # stream in afterwards
+            result = get_cached_team_analysis(pokemon_inputs)
         
         if not result["success"]:
             st.error(f"❌ Analysis failed: {result['error']}")
+            show_name_suggestions(pokemon_inputs)
             return
         
         # Display results
@@ -68,7 +103,7 @@ def main():
             st.markdown("• **AI-powered recommendations** for improvement")
             st.markdown("• **Strategic notes** for competitive play")
 
-def display_results(result, pokemon_inputs):
+def display_results(result, pokemon_inputs, model_client=None):
     """Display the complete analysis results"""
     
     team_data = result["team_data"]
@@ -82,6 +117,10 @@ def display_results(result, pokemon_inputs):
     
     with col1:
         st.subheader("Your Team:")
+        # Served from the local sprite cache; falls back to the URL if a download failed
+        sprites = get_sprites(
+            [pokemon["sprite"] for pokemon in team_data["team_members"]], SPRITE_SIZE
+        )
         for pokemon in team_data["team_members"]:
             types_badges = ""
             for ptype in pokemon["types"]:
@@ -91,7 +130,7 @@ def display_results(result, pokemon_inputs):
             col_img, col_info = st.columns([1, 4])
             with col_img:
                 if pokemon["sprite"]:
-                    st.image(pokemon["sprite"], width=80)
+                    st.image(sprites.get(pokemon["sprite"], pokemon["sprite"]), width=SPRITE_SIZE)
             with col_info:
                 st.markdown(f"**{pokemon['name']}** {types_badges}")
     
@@ -104,6 +143,7 @@ def display_results(result, pokemon_inputs):
     # Failed Pokemon (if any)
     if team_data["failed_pokemon"]:
         st.warning(f"⚠️ Could not find: {', '.join(team_data['failed_pokemon'])}")
+        show_name_suggestions(team_data["failed_pokemon"])
     
     st.markdown("---")
     
@@ -148,7 +188,14 @@ def display_results(result, pokemon_inputs):
     
     # AI Recommendations Section
     st.header("🤖 AI Strategic Recommendations")
-    st.markdown(ai_recommendations)
+    if ai_recommendations is None:
+        # Everything above is already on screen while Gemini is writing
+        with timed("ai", result["metrics"]["timings"]):
+            st.write_stream(
+                stream_ai_team_recommendations(team_data, weakness_analysis, model_client)
+            )
+    else:
+        st.markdown(ai_recommendations)
     
     st.markdown("---")
     st.markdown("*Analysis powered by PokeAPI and Gemini AI*")
@@ -0,0 +1,314 @@
+"""
+Bulk team analysis: streams teams from JSONL/CSV, fetches every distinct
+species once and spreads the weakness analysis over a process pool.
+
+Usage:
+    python batch_analyzer.py teams.jsonl -o results.jsonl
+    python batch_analyzer.py teams.csv -o results.jsonl --workers 8 --ai
+    python batch_analyzer.py teams.jsonl -o results.jsonl --ai --ai-batch-size 5
+    python batch_analyzer.py teams.jsonl --meta usage.csv
+    python batch_analyzer.py teams.jsonl -o results.jsonl --metrics-json metrics.json
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from meta import MetaGame, load_usage, score_teams
+from metrics import STAGE_SECONDS, configure_logging, dump_json
+from models import PokemonRecord, TeamAnalysis
+from pokemon_analyzer import (
+    POKEAPI_MAX_WORKERS,
+    analyze_team_weaknesses,
+    build_team_data,
+    get_ai_recommendations_many,
+    get_pokemon_data,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def read_teams(path: str) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Lazily yields (team_id, pokemon_list) from a JSONL or CSV file.
+
+    JSONL lines can be a plain list of names or an object with "team" and
+    an optional "id". CSV files need a header; an "id" column is used as the
+    team id and every other non-empty cell is a team member.
+    """
+
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            for line_number, row in enumerate(csv.DictReader(f), 1):
+                team_id = row.pop("id", None) or str(line_number)
+                team = [name.strip() for name in row.values() if name and name.strip()]
+                yield team_id, team
+        return
+
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            record = json.loads(line)
+            if isinstance(record, list):
+                yield str(line_number), record
+            else:
+                yield str(record.get("id", line_number)), record["team"]
+
+
+def collect_species(path: str) -> List[str]:
+    """First pass over the input: every distinct (lowercased) species name"""
+
+    species = set()
+    for _, team in read_teams(path):
+        species.update(name.lower() for name in team)
+    return sorted(species)
+
+
+def fetch_species(species: List[str], workers: int = POKEAPI_MAX_WORKERS) -> Dict:
+    """Resolves each distinct species exactly once (cache first, then PokeAPI)"""
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(get_pokemon_data, species)
+        return dict(zip(species, results))
+
+
+def summarize_team(team_id: str, analysis: TeamAnalysis) -> Dict:
+    """Compact, JSON-friendly result for a single team"""
+
+    if len(analysis.members) + len(analysis.failed_pokemon) > 6:
+        return {
+            "id": team_id,
+            "success": False,
+            "error": "Pokemon teams should have maximum 6 members",
+            "failed_pokemon": [],
+        }
+
+    if not analysis.members:
+        return {
+            "id": team_id,
+            "success": False,
+            "error": "No valid Pokemon found in the team",
+            "failed_pokemon": list(analysis.failed_pokemon),
+        }
+
+    weakness_types = analysis.weakness_types()
+    return {
+        "id": team_id,
+        "success": True,
+        "team": [member.name for member in analysis.members],
+        "failed_pokemon": list(analysis.failed_pokemon),
+        "summary": analysis.summary(),
+        "critical_weaknesses": weakness_types["critical"],
+        "major_weaknesses": weakness_types["major"],
+        "minor_weaknesses": weakness_types["minor"],
+        "immunities": weakness_types["immunities"],
+        "resistances": weakness_types["resistances"],
+    }
+
+
+def _analyze_chunk(
+    chunk: List[Tuple[str, TeamAnalysis]], meta: Optional[MetaGame] = None
+) -> List[Dict]:
+    # Runs inside a worker process
+    results = [summarize_team(team_id, analysis) for team_id, analysis in chunk]
+
+    if meta is not None:
+        # The whole chunk is scored against the meta in one vectorized pass
+        scored = [i for i, result in enumerate(results) if result["success"]]
+        scores = score_teams([chunk[i][1].members for i in scored], meta)
+        for i, score in zip(scored, scores):
+            results[i]["meta"] = score
+
+    return results
+
+
+def _chunks(
+    path: str, species_records: Dict, chunk_size: int
+) -> Iterator[List[Tuple[str, TeamAnalysis]]]:
+    chunk = []
+    for team_id, team in read_teams(path):
+        members = []
+        failed = []
+        for name in team:
+            record = species_records.get(name.lower())
+            if record is None:
+                failed.append(name)
+            else:
+                members.append(record)
+        chunk.append((team_id, TeamAnalysis.build(members, failed)))
+
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def run_batch(
+    input_path: str,
+    output_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+    with_ai: bool = False,
+    meta_path: Optional[str] = None,
+    ai_batch_size: Optional[int] = None,
+) -> Dict:
+    """
+    Analyzes every team in input_path and streams results as JSONL.
+
+    Args:
+        input_path: JSONL or CSV file with teams
+        output_path: Destination JSONL file, stdout when None
+        workers: Number of analysis processes (defaults to CPU count)
+        chunk_size: Teams sent to a worker per task
+        with_ai: Also request Gemini recommendations for each team
+        meta_path: Usage file (CSV/JSON) to score every team against
+        ai_batch_size: Teams packed into one Gemini request (default AI_BATCH_SIZE)
+
+    Returns:
+        Dictionary with run statistics
+    """
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    logger.info("📥 Collecting species from %s...", input_path)
+    species = collect_species(input_path)
+
+    logger.info("🌐 Resolving %d distinct species...", len(species))
+    species_data = fetch_species(species)
+    fetch_seconds = time.perf_counter() - start
+
+    # One shared record per species, referenced by every team that uses it
+    species_records = {
+        name: PokemonRecord.from_dict(data)
+        for name, data in species_data.items()
+        if data
+    }
+
+    meta = None
+    if meta_path:
+        meta = MetaGame.from_usage(load_usage(meta_path))
+        logger.info("📊 Meta: %d species from %s", len(meta), meta_path)
+        if meta.missing:
+            logger.warning("⚠️ Unknown meta species: %s", ", ".join(meta.missing))
+
+    out = open(output_path, "w", encoding="utf-8") if output_path else sys.stdout
+    teams_done = 0
+    analyze_start = time.perf_counter()
+
+    def write_results(results: List[Dict]) -> None:
+        nonlocal teams_done
+        if with_ai:
+            _add_ai_recommendations(results, ai_batch_size)
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+        teams_done += len(results)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Bounded number of in-flight chunks keeps memory flat on huge inputs
+            pending = deque()
+            for chunk in _chunks(input_path, species_records, chunk_size):
+                pending.append(executor.submit(_analyze_chunk, chunk, meta))
+                if len(pending) >= workers * 2:
+                    write_results(pending.popleft().result())
+
+            while pending:
+                write_results(pending.popleft().result())
+    finally:
+        if output_path:
+            out.close()
+
+    total_seconds = time.perf_counter() - start
+    analyze_seconds = time.perf_counter() - analyze_start
+
+    stats = {
+        "teams": teams_done,
+        "species": len(species),
+        "species_found": sum(1 for data in species_data.values() if data),
+        "fetch_seconds": round(fetch_seconds, 3),
+        "analyze_seconds": round(analyze_seconds, 3),
+        "total_seconds": round(total_seconds, 3),
+        "teams_per_second": (
+            round(teams_done / analyze_seconds, 1) if analyze_seconds else 0.0
+        ),
+    }
+    STAGE_SECONDS.observe(fetch_seconds, "batch_fetch")
+    STAGE_SECONDS.observe(analyze_seconds, "batch_analyze")
+
+    logger.info(
+        "✅ %d teams in %ss (%s teams/sec)",
+        stats["teams"],
+        stats["total_seconds"],
+        stats["teams_per_second"],
+        extra={"batch": stats},
+    )
+    return stats
+
+
+def _add_ai_recommendations(
+    results: List[Dict], batch_size: Optional[int] = None
+) -> None:
+    # Rebuild the full inputs for the prompt only when AI output was requested;
+    # every member was fetched in the species pass, so these are cache hits.
+    # The whole chunk is queued at batch priority in one go.
+    succeeded = [result for result in results if result["success"]]
+    analyses = []
+    for result in succeeded:
+        members = [get_pokemon_data(name) for name in result["team"]]
+        team_data = build_team_data(result["team"], members, verbose=False)
+        analyses.append((team_data, analyze_team_weaknesses(team_data)))
+
+    for result, (recommendations, _) in zip(
+        succeeded, get_ai_recommendations_many(analyses, batch_size=batch_size)
+    ):
+        result["ai_recommendations"] = recommendations
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk Pokemon team analysis")
+    parser.add_argument("input", help="JSONL or CSV file with one team per line")
+    parser.add_argument("-o", "--output", help="Output JSONL file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, help="Analysis processes")
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument(
+        "--ai", action="store_true", help="Include Gemini recommendations"
+    )
+    parser.add_argument(
+        "--ai-batch-size", type=int, help="Teams packed into one Gemini request"
+    )
+    parser.add_argument("--meta", help="Usage file (CSV/JSON) to score teams against")
+    parser.add_argument(
+        "--metrics-json", help="Write latency histograms and cache stats here"
+    )
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    run_batch(
+        args.input,
+        args.output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        with_ai=args.ai,
+        meta_path=args.meta,
+        ai_batch_size=args.ai_batch_size,
+    )
+
+    if args.metrics_json:
+        dump_json(args.metrics_json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Load test for the app's shared caches: many simulated sessions analyze a
+small set of teams at the same time, against the stub PokeAPI and a fake
+Gemini client. Backend calls should track unique teams, not page views.
+
+    python benchmarks/app_load.py --sessions 500 --unique-teams 10
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stubs import SPECIES, FakeGenaiClient, StubPokeAPI  # noqa: E402
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Simulated multi-session load")
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--unique-teams", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--pokeapi-latency", type=float, default=0.05)
+    parser.add_argument("--ai-latency", type=float, default=0.5)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp()
+    stub = StubPokeAPI(latency=args.pokeapi_latency).start()
+
+    # Configure before the analyzer reads its settings at import
+    os.environ["POKEAPI_BASE_URL"] = stub.base_url
+    os.environ["POKEAPI_CACHE_PATH"] = os.path.join(tmp, "pokeapi.sqlite3")
+    os.environ["AI_CACHE_PATH"] = os.path.join(tmp, "ai.sqlite3")
+    os.environ["POKEDEX_PATH"] = os.path.join(tmp, "missing.arrow")
+
+    import pokemon_analyzer
+
+    fake_ai = FakeGenaiClient(latency=args.ai_latency)
+    pokemon_analyzer.client = fake_ai
+
+    rng = random.Random(0)
+    names = sorted(SPECIES)
+    teams = [rng.sample(names, 6) for _ in range(args.unique_teams)]
+    page_views = [rng.choice(teams) for _ in range(args.sessions)]
+
+    def session(team: List[str]) -> None:
+        # What app.main does on "Analyze Team"
+        result = pokemon_analyzer.get_cached_team_analysis(team)
+        "".join(
+            pokemon_analyzer.stream_ai_team_recommendations(
+                result["team_data"], result["weakness_analysis"]
+            )
+        )
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(session, page_views))
+    seconds = time.perf_counter() - start
+
+    stub.stop()
+
+    results = {
+        "page_views": args.sessions,
+        "unique_teams": len({tuple(t) for t in page_views}),
+        "unique_species": len({name for t in page_views for name in t}),
+        "pokeapi_requests": stub.request_count,
+        "ai_calls": fake_ai.calls,
+        "seconds": round(seconds, 3),
+        "team_cache": pokemon_analyzer.get_team_cache_stats(),
+    }
+
+    print(
+        f"{results['page_views']} page views, {results['unique_teams']} unique teams "
+        f"({results['unique_species']} species) -> "
+        f"{results['pokeapi_requests']} PokeAPI requests, "
+        f"{results['ai_calls']} AI calls in {results['seconds']}s"
+    )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Cold-start cost of the pure type-analysis path.
+
+Each run starts a fresh interpreter, imports pokemon_analyzer and analyzes
+one team (no network, no AI). Pass --rev to measure another git revision
+side by side, e.g. the commit before lazy imports:
+
+    python benchmarks/import_time.py --runs 10 --rev HEAD~1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = """
+import time
+start = time.perf_counter()
+import pokemon_analyzer
+imported = time.perf_counter()
+pokemon_analyzer.analyze_team_weaknesses(
+    {"team_members": [{"name": "Charizard", "types": ["fire", "flying"]}]}
+)
+done = time.perf_counter()
+print(imported - start, done - start)
+"""
+
+
+def measure(source_dir: str, runs: int, env: Dict) -> Dict:
+    import_times: List[float] = []
+    total_times: List[float] = []
+
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", SNIPPET],
+            cwd=source_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        import_times.append(float(output[-2]))
+        total_times.append(float(output[-1]))
+
+    return {
+        "runs": runs,
+        "import_ms_median": round(statistics.median(import_times) * 1000, 1),
+        "import_ms_min": round(min(import_times) * 1000, 1),
+        "first_analysis_ms_median": round(statistics.median(total_times) * 1000, 1),
+    }
+
+
+def export_revision(rev: str, target: str) -> None:
+    archive = subprocess.run(
+        ["git", "archive", rev], cwd=REPO_ROOT, capture_output=True, check=True
+    ).stdout
+    subprocess.run(["tar", "-x", "-C", target], input=archive, check=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--rev", help="Also measure this git revision")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env.setdefault("POKEAPI_CACHE_PATH", os.path.join(tmp, "pokeapi.sqlite3"))
+        env.setdefault("AI_CACHE_PATH", os.path.join(tmp, "ai.sqlite3"))
+        # Older revisions build the Gemini client at import and need a key
+        env.setdefault("GEMINI_API_KEY", "benchmark")
+
+        results = {"current": measure(REPO_ROOT, args.runs, env)}
+
+        if args.rev:
+            rev_dir = os.path.join(tmp, "rev")
+            os.makedirs(rev_dir)
+            export_revision(args.rev, rev_dir)
+            results[args.rev] = measure(rev_dir, args.runs, env)
+
+    for name, result in results.items():
+        print(
+            f"{name:>10}: import {result['import_ms_median']} ms (median), "
+            f"first analysis {result['first_analysis_ms_median']} ms"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Memory held by N analyzed teams: the nested dicts from build_team_data +
+analyze_team_weaknesses versus models.TeamAnalysis with shared records and
+its weakness template. Both sides compute every team's analysis from a cold
+template cache, and a sample is checked to give identical dictionaries.
+
+    python benchmarks/memory_model.py --teams 100000
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import PokemonRecord, TeamAnalysis  # noqa: E402
+from pokemon_analyzer import (  # noqa: E402
+    TYPE_COMBINATIONS,
+    analyze_team_weaknesses,
+    build_team_data,
+    weakness_template_cache,
+)
+
+SPRITE_URL = (
+    "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{id}.png"
+)
+
+
+def synthetic_species(count: int) -> List[Dict]:
+    return [
+        {
+            "name": f"Pokemon-{i}",
+            "id": i,
+            "types": list(TYPE_COMBINATIONS[i % len(TYPE_COMBINATIONS)]),
+            "sprite": SPRITE_URL.format(id=i),
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def measure(build: Callable[[], List]) -> Dict:
+    weakness_template_cache.clear()
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    held = build()
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return {
+        "retained_mb": round(current / 1024 / 1024, 1),
+        "peak_mb": round(peak / 1024 / 1024, 1),
+        "seconds": round(seconds, 2),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Team data model memory usage")
+    parser.add_argument("--teams", type=int, default=100000)
+    parser.add_argument("--species", type=int, default=1025)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    species = synthetic_species(args.species)
+    teams = [rng.sample(range(args.species), 6) for _ in range(args.teams)]
+
+    def dicts(teams: List[List[int]]) -> List:
+        held = []
+        for team in teams:
+            members = [dict(species[i]) for i in team]
+            team_data = build_team_data(
+                [m["name"] for m in members], members, verbose=False
+            )
+            held.append((team_data, analyze_team_weaknesses(team_data)))
+        return held
+
+    def compact(teams: List[List[int]]) -> List:
+        records = [PokemonRecord.from_dict(s) for s in species]
+        held = []
+        for team in teams:
+            analysis = TeamAnalysis.build([records[i] for i in team])
+            analysis.summary()  # computes the template, which the team keeps
+            held.append(analysis)
+        return held
+
+    # Same output on both sides
+    for (team_data, weaknesses), analysis in zip(
+        dicts(teams[:100]), compact(teams[:100])
+    ):
+        assert analysis.weakness_analysis() == weaknesses
+        assert analysis.team_data()["team_members"] == team_data["team_members"]
+
+    results = {
+        "teams": args.teams,
+        "dicts": measure(lambda: dicts(teams)),
+        "compact": measure(lambda: compact(teams)),
+    }
+    results["retained_ratio"] = round(
+        results["dicts"]["retained_mb"] / max(results["compact"]["retained_mb"], 0.1),
+        1,
+    )
+
+    for name in ("dicts", "compact"):
+        r = results[name]
+        print(f"{name:>8}: {r['retained_mb']} MB retained, built in {r['seconds']}s")
+    print(f"compact model is {results['retained_ratio']}x smaller")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
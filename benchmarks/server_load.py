@@ -0,0 +1,139 @@
+"""
+Load test for the JSON service (server.py), fully local: the service runs
+in-process against the stub PokeAPI and the fake Gemini client, and client
+threads with keep-alive sessions replay a mix of teams.
+
+    python benchmarks/server_load.py --requests 5000 --concurrency 64
+    python benchmarks/server_load.py --endpoint /analyze --ai -o server.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stubs import SPECIES, FakeGenaiClient, StubPokeAPI  # noqa: E402
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load test the JSON service")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--unique-teams", type=int, default=50)
+    parser.add_argument(
+        "--endpoint", default="/weaknesses", choices=["/weaknesses", "/analyze"]
+    )
+    parser.add_argument("--ai", action="store_true", help="Include the AI stage")
+    parser.add_argument("--workers", type=int, default=32, help="Server threads")
+    parser.add_argument("--pokeapi-latency", type=float, default=0.05)
+    parser.add_argument("--ai-latency", type=float, default=0.5)
+    parser.add_argument("-o", "--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp()
+    stub = StubPokeAPI(latency=args.pokeapi_latency).start()
+
+    # Configure before the analyzer reads its settings at import
+    os.environ["POKEAPI_BASE_URL"] = stub.base_url
+    os.environ["POKEAPI_CACHE_PATH"] = os.path.join(tmp, "pokeapi.sqlite3")
+    os.environ["AI_CACHE_PATH"] = os.path.join(tmp, "ai.sqlite3")
+    os.environ["POKEDEX_PATH"] = os.path.join(tmp, "missing.arrow")
+    os.environ["SPECIES_LIST_PATH"] = os.path.join(tmp, "missing.json")
+
+    import requests
+    import tornado.netutil
+
+    import pokemon_analyzer
+    import server
+
+    fake_ai = FakeGenaiClient(latency=args.ai_latency)
+    pokemon_analyzer.client = fake_ai
+
+    sockets = tornado.netutil.bind_sockets(0, "127.0.0.1")
+    port = sockets[0].getsockname()[1]
+    threading.Thread(
+        target=lambda: asyncio.run(server.serve(sockets, args.workers)), daemon=True
+    ).start()
+
+    url = f"http://127.0.0.1:{port}{args.endpoint}"
+    rng = random.Random(0)
+    names = sorted(SPECIES)
+    teams = [rng.sample(names, 6) for _ in range(args.unique_teams)]
+    bodies = [
+        json.dumps({"team": rng.choice(teams), "ai": args.ai})
+        for _ in range(args.requests)
+    ]
+
+    # One keep-alive session per client thread
+    local = threading.local()
+
+    def send(body: str):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        start = time.perf_counter()
+        response = local.session.post(url, data=body)
+        return response.status_code, time.perf_counter() - start
+
+    while True:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            break
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.05)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        responses = list(executor.map(send, bodies))
+    seconds = time.perf_counter() - start
+
+    health = requests.get(f"http://127.0.0.1:{port}/health").json()
+    stub.stop()
+
+    latencies = sorted(latency for _, latency in responses)
+    results = {
+        "endpoint": args.endpoint,
+        "ai": args.ai,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "unique_teams": args.unique_teams,
+        "seconds": round(seconds, 3),
+        "requests_per_second": round(args.requests / seconds, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "statuses": dict(Counter(status for status, _ in responses)),
+        "pokeapi_requests": stub.request_count,
+        "ai_calls": fake_ai.calls,
+        "coalescer": health["coalescer"],
+    }
+
+    print(
+        f"{results['requests']} requests to {args.endpoint} in {results['seconds']}s: "
+        f"{results['requests_per_second']} req/s, p50 {results['p50_ms']}ms, "
+        f"p99 {results['p99_ms']}ms, {results['pokeapi_requests']} PokeAPI requests, "
+        f"{results['ai_calls']} AI calls"
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
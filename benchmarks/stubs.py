@@ -0,0 +1,353 @@
+"""
+Local stand-ins for the external services: a stub PokeAPI HTTP server and a
+fake Gemini client. Both count the calls they receive so benchmarks can
+check how much backend traffic a workload generates.
+
+The stub serves synthetic payloads for SPECIES by default. Real responses
+can be recorded once and replayed instead:
+
+    python benchmarks/stubs.py record -o payloads.json
+    python benchmarks/suite.py --payloads payloads.json
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# name -> (id, types) for the species used by the benchmark workloads
+SPECIES: Dict[str, Tuple[int, List[str]]] = {
+    "venusaur": (3, ["grass", "poison"]),
+    "charizard": (6, ["fire", "flying"]),
+    "blastoise": (9, ["water"]),
+    "pikachu": (25, ["electric"]),
+    "ninetales": (38, ["fire"]),
+    "arcanine": (59, ["fire"]),
+    "alakazam": (65, ["psychic"]),
+    "rapidash": (78, ["fire"]),
+    "gengar": (94, ["ghost", "poison"]),
+    "snorlax": (143, ["normal"]),
+    "flareon": (136, ["fire"]),
+    "dragonite": (149, ["dragon", "flying"]),
+    "tyranitar": (248, ["rock", "dark"]),
+    "metagross": (376, ["steel", "psychic"]),
+    "latios": (381, ["dragon", "psychic"]),
+    "garchomp": (445, ["dragon", "ground"]),
+    "lucario": (448, ["fighting", "steel"]),
+    "magmortar": (467, ["fire"]),
+    "rotom-wash": (10009, ["electric", "water"]),
+    "heatran": (485, ["fire", "steel"]),
+    "ferrothorn": (598, ["grass", "steel"]),
+    "scizor": (212, ["bug", "steel"]),
+    "togekiss": (468, ["fairy", "flying"]),
+    "gyarados": (130, ["water", "flying"]),
+}
+
+# name -> (type, damage class, power) for the moves in the stub movepools
+MOVES: Dict[str, Tuple[str, str, Optional[int]]] = {
+    "body-slam": ("normal", "physical", 85),
+    "flamethrower": ("fire", "special", 90),
+    "surf": ("water", "special", 90),
+    "thunderbolt": ("electric", "special", 90),
+    "energy-ball": ("grass", "special", 90),
+    "ice-beam": ("ice", "special", 90),
+    "close-combat": ("fighting", "physical", 120),
+    "sludge-bomb": ("poison", "special", 90),
+    "earthquake": ("ground", "physical", 100),
+    "brave-bird": ("flying", "physical", 120),
+    "psychic": ("psychic", "special", 90),
+    "x-scissor": ("bug", "physical", 80),
+    "stone-edge": ("rock", "physical", 100),
+    "shadow-ball": ("ghost", "special", 80),
+    "dragon-claw": ("dragon", "physical", 80),
+    "dark-pulse": ("dark", "special", 80),
+    "flash-cannon": ("steel", "special", 80),
+    "moonblast": ("fairy", "special", 95),
+    "protect": ("normal", "status", None),
+}
+
+# Every species learns its own types' moves plus these
+SHARED_MOVES = ["protect", "body-slam", "earthquake"]
+
+SPRITE_URL = (
+    "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{id}.png"
+)
+
+
+def movepool(types: List[str]) -> List[str]:
+    own = [move for move, (move_type, _, _) in MOVES.items() if move_type in types]
+    return own + [move for move in SHARED_MOVES if move not in own]
+
+
+def move_payload(name: str) -> Dict:
+    """The subset of a /move/{name} response the coverage analysis reads"""
+
+    move_type, damage_class, power = MOVES[name]
+    return {
+        "name": name,
+        "type": {"name": move_type},
+        "power": power,
+        "damage_class": {"name": damage_class},
+    }
+
+
+def pokemon_payload(name: str, pokemon_id: int, types: List[str]) -> Dict:
+    """The subset of a /pokemon/{name} response the analyzer reads"""
+
+    return {
+        "name": name,
+        "id": pokemon_id,
+        "types": [
+            {"slot": slot, "type": {"name": type_name}}
+            for slot, type_name in enumerate(types, 1)
+        ],
+        "sprites": {"front_default": SPRITE_URL.format(id=pokemon_id)},
+        "moves": [{"move": {"name": move}} for move in movepool(types)],
+    }
+
+
+def trim_payload(data: Dict) -> Dict:
+    """A real /pokemon/{name} response reduced to the fields pokemon_payload has"""
+
+    return {
+        "name": data["name"],
+        "id": data["id"],
+        "types": [
+            {"slot": t["slot"], "type": {"name": t["type"]["name"]}}
+            for t in data["types"]
+        ],
+        "sprites": {"front_default": data["sprites"]["front_default"]},
+        "moves": [{"move": {"name": m["move"]["name"]}} for m in data["moves"]],
+    }
+
+
+def record_payloads(
+    names: List[str], base_url: str = "https://pokeapi.co/api/v2"
+) -> Dict[str, Dict]:
+    """Fetches (trimmed) real /pokemon responses, keyed by name"""
+
+    import requests
+
+    payloads = {}
+    for name in names:
+        response = requests.get(f"{base_url}/pokemon/{name}", timeout=30)
+        response.raise_for_status()
+        payloads[name] = trim_payload(response.json())
+    return payloads
+
+
+def load_payloads(path: str) -> Dict[str, Dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class StubPokeAPI:
+    """
+    Serves /pokemon/{name}, /pokemon?limit= and /move/{name} from memory with
+    a fixed artificial latency. Use as a context manager; base_url points at
+    it. The next `failures` requests are answered with failure_status, to
+    exercise retries and the circuit breaker. Other paths can be served
+    as-is through files (path -> (content type, body)), e.g. sprites.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        payloads: Optional[Dict] = None,
+        failures: int = 0,
+        failure_status: int = 503,
+    ):
+        self.latency = latency
+        self.failures = failures
+        self.failure_status = failure_status
+        self.payloads = payloads or {
+            name: pokemon_payload(name, pokemon_id, types)
+            for name, (pokemon_id, types) in SPECIES.items()
+        }
+        for payload in list(self.payloads.values()):
+            self.payloads.setdefault(str(payload["id"]), payload)
+
+        self.files: Dict[str, Tuple[str, bytes]] = {}
+
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def request_count(self) -> int:
+        return sum(self.requests.values())
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api/v2"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without TCP_NODELAY each
+            # keep-alive response waits out the client's delayed ACK (~40ms)
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split("?")[0].rstrip("/")
+                with stub._lock:
+                    stub.requests[path] += 1
+                    failing = stub.failures > 0
+                    if failing:
+                        stub.failures -= 1
+
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                if failing:
+                    self._send(stub.failure_status, "Injected failure")
+                    return
+
+                if path in stub.files:
+                    content_type, body = stub.files[path]
+                    self._send(200, body, content_type)
+                    return
+
+                if path.endswith("/pokemon"):
+                    names = [n for n in stub.payloads if not n.isdigit()]
+                    self._send(200, {"results": [{"name": n} for n in names]})
+                    return
+
+                collection, _, key = path.rpartition("/")
+                if collection.endswith("/move"):
+                    payload = move_payload(key) if key in MOVES else None
+                else:
+                    payload = stub.payloads.get(key)
+                if payload is None:
+                    self._send(404, "Not Found")
+                else:
+                    self._send(200, payload)
+
+            def _send(self, status, body, content_type="application/json"):
+                if isinstance(body, (dict, list)):
+                    body = json.dumps(body)
+                data = body.encode() if isinstance(body, str) else body
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def start(self) -> "StubPokeAPI":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        # A short poll interval, since stop() waits for the loop to notice
+        threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self) -> "StubPokeAPI":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class _FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _FakeModels:
+    def __init__(self, owner: "FakeGenaiClient"):
+        self._owner = owner
+
+    def generate_content(self, model, contents, config=None):
+        self._owner._record(contents)
+        time.sleep(self._owner.latency)
+        self._owner._maybe_fail()
+        if getattr(config, "response_mime_type", None) == "application/json":
+            # Packed prompt: one entry per "### TEAM <n>" section
+            ids = re.findall(r"^### TEAM (\S+)$", contents, re.MULTILINE)
+            return _FakeResponse(
+                json.dumps(
+                    [{"id": i, "recommendations": self._owner.text} for i in ids]
+                )
+            )
+        return _FakeResponse(self._owner.text)
+
+    def generate_content_stream(self, model, contents, config=None) -> Iterator:
+        self._owner._record(contents)
+        words = self._owner.text.split(" ")
+        delay = self._owner.latency / max(len(words), 1)
+        for i, word in enumerate(words):
+            time.sleep(delay)
+            yield _FakeResponse(word if i == 0 else " " + word)
+
+
+class FakeGenaiClient:
+    """
+    Drop-in for genai.Client() that answers every prompt with canned text
+    (a JSON list for packed structured-output prompts). The first `failures`
+    calls raise instead, to exercise retries.
+    """
+
+    def __init__(
+        self, latency: float = 0.0, text: Optional[str] = None, failures: int = 0
+    ):
+        self.latency = latency
+        self.failures = failures
+        self.text = text or (
+            "## TEAM EVALUATION\nA balanced team.\n\n## TOP 3 THREATS\n"
+            "1. Ground\n2. Ice\n3. Rock\n"
+        )
+        self.calls = 0
+        self.prompts: List[str] = []
+        self._lock = threading.Lock()
+        self.models = _FakeModels(self)
+
+    def _record(self, contents) -> None:
+        with self._lock:
+            self.calls += 1
+            self.prompts.append(contents)
+
+    def _maybe_fail(self) -> None:
+        with self._lock:
+            if self.failures <= 0:
+                return
+            self.failures -= 1
+        raise RuntimeError("fake model error")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Stub PokeAPI payloads")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record = subparsers.add_parser("record", help="Save real PokeAPI responses")
+    record.add_argument("names", nargs="*", help="Species (default: SPECIES)")
+    record.add_argument("-o", "--output", default="payloads.json")
+    record.add_argument("--base-url", default="https://pokeapi.co/api/v2")
+
+    args = parser.parse_args(argv)
+
+    payloads = record_payloads(args.names or sorted(SPECIES), args.base_url)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(payloads, f)
+    print(f"✅ Recorded {len(payloads)} payloads to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
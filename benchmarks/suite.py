@@ -0,0 +1,320 @@
+"""
+Reproducible benchmark suite, fully offline: the stub PokeAPI (synthetic or
+recorded payloads) with a fixed latency and the fake Gemini client.
+
+Micro-benchmarks time calculate_damage_multiplier and
+analyze_team_weaknesses (memoized and uncached); end-to-end benchmarks
+measure get_team_data and analyze_complete_team latency with cold and warm
+caches, and concurrent analyze_complete_team throughput. Results are written
+as JSON so two commits can be compared:
+
+    python benchmarks/suite.py -o before.json
+    git checkout my-branch
+    python benchmarks/suite.py -o after.json --compare before.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from stubs import SPECIES, FakeGenaiClient, StubPokeAPI, load_payloads  # noqa: E402
+
+# Headline number of each kind of result, and whether bigger is better
+PRIMARY_METRICS = {
+    "median_us": False,
+    "p50_ms": False,
+    "teams_per_second": True,
+}
+
+
+def time_calls(fn: Callable[[], None], calls_per_run: int, repeat: int) -> Dict:
+    """Per-call microseconds of fn (which makes calls_per_run calls)"""
+
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    runs = [t / number / calls_per_run * 1e6 for t in timer.repeat(repeat, number)]
+    return {
+        "calls": number * calls_per_run * repeat,
+        "best_us": round(min(runs), 3),
+        "median_us": round(statistics.median(runs), 3),
+    }
+
+
+def latency_stats(samples: List[float]) -> Dict:
+    samples = sorted(samples)
+    return {
+        "samples": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+        "p95_ms": round(
+            samples[min(int(len(samples) * 0.95), len(samples) - 1)] * 1000, 3
+        ),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+def micro_benchmarks(
+    analyzer, teams: List[List[str]], types: Dict[str, List[str]], repeat: int
+) -> Dict:
+    pairs = [
+        (attacking, list(combo))
+        for attacking in analyzer.ALL_TYPES
+        for combo in analyzer.TYPE_COMBINATIONS
+    ]
+
+    def damage_multipliers() -> None:
+        for attacking, defending in pairs:
+            analyzer.calculate_damage_multiplier(attacking, defending)
+
+    team_data = [
+        {
+            "team_members": [
+                {"name": name.title(), "types": types[name]} for name in team
+            ]
+        }
+        for team in teams[:20]
+    ]
+
+    def weaknesses() -> None:
+        for data in team_data:
+            analyzer.analyze_team_weaknesses(data)
+
+    def weaknesses_uncached() -> None:
+        for data in team_data:
+            analyzer.weakness_template_cache.clear()
+            analyzer.analyze_team_weaknesses(data)
+
+    return {
+        "calculate_damage_multiplier": time_calls(
+            damage_multipliers, len(pairs), repeat
+        ),
+        "analyze_team_weaknesses": time_calls(weaknesses, len(team_data), repeat),
+        "analyze_team_weaknesses_uncached": time_calls(
+            weaknesses_uncached, len(team_data), repeat
+        ),
+    }
+
+
+def clear_caches(analyzer) -> None:
+    """Empties the Pokemon, team, weakness and AI caches (memory and disk)"""
+
+    analyzer.pokemon_memory_cache.clear()
+    analyzer.pokeapi_cache.clear()
+    analyzer.team_analysis_cache.clear()
+    analyzer.weakness_template_cache.clear()
+    analyzer.ai_memory_cache.clear()
+    analyzer.ai_disk_cache.clear()
+
+
+def measure_latency(
+    fn: Callable[[List[str]], object],
+    teams: List[List[str]],
+    before_each: Optional[Callable[[], None]] = None,
+) -> Dict:
+    samples = []
+    for team in teams:
+        if before_each is not None:
+            before_each()
+        start = time.perf_counter()
+        fn(team)
+        samples.append(time.perf_counter() - start)
+    return latency_stats(samples)
+
+
+def end_to_end_benchmarks(
+    analyzer,
+    stub: StubPokeAPI,
+    fake_ai: FakeGenaiClient,
+    teams: List[List[str]],
+    concurrency: int,
+) -> Dict:
+    results = {}
+
+    def cold() -> None:
+        clear_caches(analyzer)
+
+    for name, fn in (
+        ("get_team_data", analyzer.get_team_data),
+        ("analyze_complete_team", analyzer.analyze_complete_team),
+    ):
+        for state, before_each in (("cold", cold), ("warm", None)):
+            if state == "warm":
+                # Untimed pass so every team is cached before measuring
+                for team in teams:
+                    fn(team)
+            requests_before = stub.request_count
+            ai_before = fake_ai.calls
+            result = measure_latency(fn, teams, before_each)
+            result["pokeapi_requests"] = stub.request_count - requests_before
+            result["ai_calls"] = fake_ai.calls - ai_before
+            results[f"{name}_{state}"] = result
+
+    # Many sessions at once, every team distinct, starting from empty caches
+    clear_caches(analyzer)
+    requests_before = stub.request_count
+    ai_before = fake_ai.calls
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(analyzer.analyze_complete_team, teams))
+    seconds = time.perf_counter() - start
+    results["analyze_complete_team_throughput"] = {
+        "teams": len(teams),
+        "concurrency": concurrency,
+        "seconds": round(seconds, 3),
+        "teams_per_second": round(len(teams) / seconds, 2),
+        "pokeapi_requests": stub.request_count - requests_before,
+        "ai_calls": fake_ai.calls - ai_before,
+    }
+
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def primary_metric(result: Dict):
+    for metric, higher_is_better in PRIMARY_METRICS.items():
+        if metric in result:
+            return metric, higher_is_better
+    return None, False
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Prints old vs new primary metrics; returns the regressed benchmarks"""
+
+    regressions = []
+    print(
+        f"\n{'benchmark':<36} {'metric':<18} {'before':>10} {'after':>10} {'change':>8}"
+    )
+    for name, result in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        metric, higher_is_better = primary_metric(result)
+        if before is None or metric is None or not before.get(metric):
+            continue
+
+        change = result[metric] / before[metric] - 1
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > threshold:
+            flag = "  ⚠️ regression"
+            regressions.append(name)
+        print(
+            f"{name:<36} {metric:<18} {before[metric]:>10} {result[metric]:>10} "
+            f"{change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmark suite")
+    parser.add_argument("-o", "--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Regression ratio")
+    parser.add_argument(
+        "--payloads", help="Recorded PokeAPI payloads (stubs.py record)"
+    )
+    parser.add_argument("--teams", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pokeapi-latency", type=float, default=0.02)
+    parser.add_argument("--ai-latency", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.payloads:
+        payloads = load_payloads(args.payloads)
+        types = {
+            name: [t["type"]["name"] for t in payload["types"]]
+            for name, payload in payloads.items()
+        }
+    else:
+        payloads = None
+        types = {name: species_types for name, (_, species_types) in SPECIES.items()}
+
+    rng = random.Random(args.seed)
+    species = sorted(types)
+    teams = [rng.sample(species, min(6, len(species))) for _ in range(args.teams)]
+
+    tmp = tempfile.mkdtemp()
+    stub = StubPokeAPI(latency=args.pokeapi_latency, payloads=payloads).start()
+
+    # Configure before the analyzer reads its settings at import
+    os.environ["POKEAPI_BASE_URL"] = stub.base_url
+    os.environ["POKEAPI_CACHE_PATH"] = os.path.join(tmp, "pokeapi.sqlite3")
+    os.environ["AI_CACHE_PATH"] = os.path.join(tmp, "ai.sqlite3")
+    os.environ["POKEDEX_PATH"] = os.path.join(tmp, "missing.arrow")
+    os.environ["SPECIES_LIST_PATH"] = os.path.join(tmp, "missing.json")
+    # Measure the code, not the outbound rate limiter
+    os.environ.setdefault("POKEAPI_RATE_LIMIT", "0")
+
+    import pokemon_analyzer
+
+    fake_ai = FakeGenaiClient(latency=args.ai_latency)
+    pokemon_analyzer.client = fake_ai
+
+    benchmarks = micro_benchmarks(pokemon_analyzer, teams, types, args.repeat)
+    with contextlib.redirect_stdout(io.StringIO()):
+        benchmarks.update(
+            end_to_end_benchmarks(
+                pokemon_analyzer, stub, fake_ai, teams, args.concurrency
+            )
+        )
+    stub.stop()
+
+    results = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "compare", "threshold")
+        },
+        "benchmarks": benchmarks,
+    }
+
+    for name, result in benchmarks.items():
+        metric, _ = primary_metric(result)
+        print(f"{name:<36} {metric}={result[metric]}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(json.load(f), results, args.threshold)
+        if regressions:
+            sys.exit(
+                f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
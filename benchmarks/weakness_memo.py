@@ -0,0 +1,134 @@
+"""
+Cost of analyze_team_weaknesses with the weakness template memo.
+
+Times the same random teams three ways: cold (template cache emptied before
+every team, so each one is a miss), mixed (cache emptied once; --repeat-share
+of the teams reuse an earlier team's types in another order and with other
+names) and warm (every template cached). Pass --rev to run the same teams on
+another git revision, e.g. the commit before the memo, where all three are
+the plain computation:
+
+    python benchmarks/weakness_memo.py --rev 5caed17~1
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+from import_time import REPO_ROOT, export_revision
+
+SNIPPET = """
+import json, random, sys, time
+import pokemon_analyzer as analyzer
+
+count, share, seed, repeat = int(sys.argv[1]), float(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4])
+rng = random.Random(seed)
+teams = []
+for i in range(count):
+    if teams and rng.random() < share:
+        combos = [m["types"] for m in rng.choice(teams)["team_members"]]
+        rng.shuffle(combos)
+    else:
+        combos = [list(rng.choice(analyzer.TYPE_COMBINATIONS)) for _ in range(6)]
+    teams.append(
+        {"team_members": [{"name": f"Mon{i}-{j}", "types": t} for j, t in enumerate(combos)]}
+    )
+
+cache = getattr(analyzer, "weakness_template_cache", None)
+
+def clear():
+    if cache is not None:
+        cache.clear()
+
+def cold():
+    for team in teams:
+        clear()
+        analyzer.analyze_team_weaknesses(team)
+
+def mixed():
+    clear()
+    for team in teams:
+        analyzer.analyze_team_weaknesses(team)
+
+def warm():
+    for team in teams:
+        analyzer.analyze_team_weaknesses(team)
+
+results = {}
+for name, fn in (("cold", cold), ("mixed", mixed), ("warm", warm)):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    results[name + "_us"] = round(best / count * 1e6, 1)
+print(json.dumps(results))
+"""
+
+
+def measure(source_dir: str, args: argparse.Namespace, env: Dict) -> Dict:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            SNIPPET,
+            str(args.teams),
+            str(args.repeat_share),
+            str(args.seed),
+            str(args.repeat),
+        ],
+        cwd=source_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teams", type=int, default=5000)
+    parser.add_argument(
+        "--repeat-share",
+        type=float,
+        default=0.3,
+        help="Fraction of teams reusing an earlier team's types (mixed run)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Best of N runs")
+    parser.add_argument("--rev", help="Also measure this git revision")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env.setdefault("POKEAPI_CACHE_PATH", os.path.join(tmp, "pokeapi.sqlite3"))
+        env.setdefault("AI_CACHE_PATH", os.path.join(tmp, "ai.sqlite3"))
+        env.setdefault("GEMINI_API_KEY", "benchmark")
+
+        results = {"current": measure(REPO_ROOT, args, env)}
+
+        if args.rev:
+            rev_dir = os.path.join(tmp, "rev")
+            os.makedirs(rev_dir)
+            export_revision(args.rev, rev_dir)
+            results[args.rev] = measure(rev_dir, args, env)
+
+    for name, result in results.items():
+        print(
+            f"{name:>10}: cold {result['cold_us']} us/team, "
+            f"mixed {result['mixed_us']} us/team, warm {result['warm_us']} us/team"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+# Sentinel stored for negative cache entries (e.g. a 404 from PokeAPI)
+NEGATIVE = {"__negative__": True}
+
+# Keys per query in PersistentCache.get_many (below SQLite's variable limit)
+BULK_QUERY_SIZE = 500
+
+
+class CacheStats:
+    """Thread-safe hit/miss counters shared by the cache implementations"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.expired = 0
+        self.writes = 0
+
+    def incr(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "writes": self.writes,
+                "hit_rate": (
+                    (self.hits + self.negative_hits) / lookups if lookups else 0.0
+                ),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.negative_hits = 0
+            self.expired = self.writes = 0
+
+
+class LRUCache:
+    """In-memory LRU with optional per-entry TTL"""
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.incr("misses")
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                self.stats.incr("expired")
+                self.stats.incr("misses")
+                return None
+
+            self._entries.move_to_end(key)
+
+        self.stats.incr("hits")
+        return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.time() + ttl if ttl else None
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        self.stats.incr("writes")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def as_dict(self) -> Dict:
+        stats = self.stats.as_dict()
+        stats["entries"] = len(self)
+        stats["max_entries"] = self.max_entries
+        stats["evictions"] = self.evictions
+        return stats
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the
+    function, everyone else arriving before it finishes waits for its result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.shared = 0
+
+    def begin(self, key: Any) -> Tuple[_Call, bool]:
+        """
+        Registers interest in key. Returns the call and whether this caller is
+        the leader; the leader must report back through finish().
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                return call, False
+
+            call = self._calls[key] = _Call()
+            self.calls += 1
+            return call, True
+
+    def finish(
+        self, key: Any, call: _Call, result: Any = None, error: Exception = None
+    ) -> None:
+        call.result = result
+        call.error = error
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.done.set()
+
+    def wait(self, call: _Call) -> Any:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(self, key: Any, fn: Callable[[], Any]) -> Any:
+        call, leader = self.begin(key)
+
+        if leader:
+            try:
+                result = fn()
+            except Exception as e:
+                self.finish(key, call, error=e)
+            else:
+                self.finish(key, call, result=result)
+
+        return self.wait(call)
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "shared": self.shared,
+                "in_flight": len(self._calls),
+            }
+
+
+class PersistentCache:
+    """
+    Small SQLite key/value store with per-entry expiry.
+
+    Values are stored as JSON. Entries live in a namespace so several caches
+    (PokeAPI responses, AI output, ...) can share one database file. The
+    file is opened on first use, so creating a cache touches no files.
+    """
+
+    def __init__(self, path: str, namespace: str = "default"):
+        self.path = path
+        self.namespace = namespace
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Callers hold self._lock
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    PRIMARY KEY (namespace, key)
+                )"""
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the stored value, NEGATIVE for negative entries or None on miss"""
+
+        return self.get_with_ttl(key)[0]
+
+    def get_with_ttl(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """
+        get plus the seconds the entry has left (None if it never expires),
+        so a copy kept elsewhere can expire with it
+        """
+
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+
+        if row is None:
+            self.stats.incr("misses")
+            return None, None
+
+        value, expires_at = row
+        ttl = None if expires_at is None else expires_at - time.time()
+        if ttl is not None and ttl < 0:
+            self.stats.incr("expired")
+            self.stats.incr("misses")
+            return None, None
+
+        value = json.loads(value)
+        if value == NEGATIVE:
+            self.stats.incr("negative_hits")
+        else:
+            self.stats.incr("hits")
+        return value, ttl
+
+    def get_stale(self, key: str) -> Optional[Any]:
+        """
+        The stored value even if it has expired (None when absent). Used as a
+        fallback when the upstream can't be reached.
+        """
+
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl else None
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), expires_at),
+            )
+            conn.commit()
+        self.stats.incr("writes")
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Looks up many keys with one query per BULK_QUERY_SIZE keys. Returns
+        only the keys that were found (values may be NEGATIVE).
+        """
+
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+
+        for start in range(0, len(keys), BULK_QUERY_SIZE):
+            batch = keys[start : start + BULK_QUERY_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                conn = self._connection()
+                rows = conn.execute(
+                    "SELECT key, value, expires_at FROM cache "
+                    f"WHERE namespace = ? AND key IN ({placeholders})",
+                    (self.namespace, *batch),
+                ).fetchall()
+
+            for key, value, expires_at in rows:
+                if expires_at is not None and expires_at < now:
+                    self.stats.incr("expired")
+                    continue
+                found[key] = json.loads(value)
+
+        negative = sum(1 for value in found.values() if value == NEGATIVE)
+        self.stats.incr("hits", len(found) - negative)
+        self.stats.incr("negative_hits", negative)
+        self.stats.incr("misses", len(keys) - len(found))
+        return found
+
+    def set_many(self, items: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Stores many entries in a single transaction"""
+
+        if not items:
+            return
+
+        expires_at = time.time() + ttl if ttl else None
+        rows = [
+            (self.namespace, key, json.dumps(value), expires_at)
+            for key, value in items.items()
+        ]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+        self.stats.incr("writes", len(rows))
+
+    def set_negative(self, key: str, ttl: Optional[float] = None) -> None:
+        self.set(key, NEGATIVE, ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND expires_at < ?",
+                (self.namespace, time.time()),
+            )
+            conn.commit()
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            conn = self._connection()
+            (count,) = conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()
+        return count
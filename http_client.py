@@ -0,0 +1,273 @@
+"""
+Resilient HTTP client for upstream APIs.
+
+Wraps a requests.Session with:
+- bounded concurrency (at most max_concurrency requests in flight)
+- a token bucket limiting the outbound request rate
+- jittered exponential retries (tenacity) for connection errors, timeouts,
+  429 and 5xx responses; 404 and other 4xx answers are returned as is
+- a circuit breaker that fails fast with CircuitOpenError after repeated
+  transient failures, so an outage costs microseconds instead of timeouts
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    Retrying,
+    retry_if_exception,
+    retry_if_result,
+    stop_after_attempt,
+    stop_after_delay,
+    wait_random_exponential,
+)
+
+# Responses worth retrying: rate limited or a server-side failure
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Errors worth retrying (unlike e.g. an invalid URL)
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without a request while the circuit breaker is open"""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: rate tokens per second, up to capacity saved
+    up for bursts. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Takes one token, sleeping until it is available; returns the wait"""
+
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # Reserve the token now (possibly going negative) so waiters are
+            # served in arrival order
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """
+    Closed: requests flow. After failure_threshold consecutive failures it
+    opens and rejects requests for reset_timeout seconds, then lets a single
+    probe through (half open): success closes it, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.opens = 0
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or self._open_for() >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def _open_for(self) -> float:
+        return time.monotonic() - self._opened_at
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if not self._probing and self._open_for() >= self.reset_timeout:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    self.opens += 1
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def release_probe(self) -> None:
+        """The probe ended without telling us anything about the upstream"""
+
+        with self._lock:
+            self._probing = False
+
+    def as_dict(self) -> Dict:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "open": state != "closed",
+                "consecutive_failures": self._failures,
+                "opens": self.opens,
+            }
+
+
+class ResilientClient:
+    """
+    GETs through a shared session with the protections described above.
+    Without a session, one pooling max_concurrency keep-alive connections
+    per host is built on the first request.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        name: str = "http",
+        max_concurrency: int = 8,
+        rate: float = 0.0,
+        burst: float = 10.0,
+        retries: int = 3,
+        backoff: float = 0.2,
+        max_backoff: float = 2.0,
+        timeout: Union[float, Tuple[float, float]] = 10.0,
+        retry_deadline: Optional[float] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self._session = session
+        self._session_lock = threading.Lock()
+        self.max_concurrency = max_concurrency
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # Attempts stop after this long in total; defaults to the read timeout
+        self.retry_deadline = retry_deadline or (
+            timeout[1] if isinstance(timeout, tuple) else timeout
+        )
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "attempts": 0,
+            "retries": 0,
+            "transient_failures": 0,
+            "rejected": 0,
+            "throttled_seconds": 0.0,
+        }
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1, pool_maxsize=self.max_concurrency
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def _incr(self, counter: str, amount: float = 1) -> None:
+        with self._stats_lock:
+            self._stats[counter] += amount
+
+    def _attempt(self, url: str, kwargs: Dict) -> requests.Response:
+        if not self.breaker.allow():
+            self._incr("rejected")
+            raise CircuitOpenError(f"{self.name} circuit breaker is open")
+
+        throttled = self.bucket.acquire()
+        if throttled:
+            self._incr("throttled_seconds", throttled)
+
+        self._incr("attempts")
+        with self._slots:
+            try:
+                response = self.session.get(url, timeout=self.timeout, **kwargs)
+            except TRANSIENT_ERRORS:
+                self._incr("transient_failures")
+                self.breaker.record_failure()
+                raise
+            except Exception:
+                self.breaker.release_probe()
+                raise
+
+        if response.status_code in RETRY_STATUSES:
+            self._incr("transient_failures")
+            self.breaker.record_failure()
+        else:
+            # Including 404: the upstream is answering
+            self.breaker.record_success()
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Like session.get. Transient failures are retried; when they persist,
+        the last response (429/5xx) is returned or the last exception raised.
+        Raises CircuitOpenError without a request while the breaker is open.
+        """
+
+        self._incr("requests")
+        retrying = Retrying(
+            stop=stop_after_attempt(self.retries + 1)
+            | stop_after_delay(self.retry_deadline),
+            wait=wait_random_exponential(multiplier=self.backoff, max=self.max_backoff),
+            retry=retry_if_exception(_is_transient_error)
+            | retry_if_result(lambda r: r.status_code in RETRY_STATUSES),
+            before_sleep=lambda _: self._incr("retries"),
+            # Out of attempts: the last response, or re-raise the last error
+            retry_error_callback=lambda state: state.outcome.result(),
+        )
+        return retrying(self._attempt, url, kwargs)
+
+    def as_dict(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["throttled_seconds"] = round(stats["throttled_seconds"], 3)
+        stats["breaker"] = self.breaker.as_dict()
+        return stats
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    return isinstance(error, TRANSIENT_ERRORS) and not isinstance(
+        error, CircuitOpenError
+    )
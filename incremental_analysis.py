@@ -0,0 +1,206 @@
+from typing import Dict, List, Optional, Tuple
+
+from pokemon_analyzer import ALL_TYPES, get_defensive_profile
+
+_NO_MASKS = (0, 0, 0, 0)
+
+
+def _category(critical: int, vulnerable: int) -> Optional[str]:
+    if critical:
+        return "critical"
+    if vulnerable >= 2:
+        return "major"
+    if vulnerable >= 1:
+        return "minor"
+    return None
+
+
+class IncrementalTeamAnalysis:
+    """
+    Weakness analysis that is updated one member at a time.
+
+    Keeps each member's defensive bitmasks (critical, vulnerable, resistant,
+    immune; from the precomputed type-combination profiles) and running
+    per-type counts, so adding, removing or replacing one Pokemon only
+    touches the attacking types that member is weak to, resists or is immune
+    to. Name lists for those types are refreshed lazily, the next time
+    weakness_analysis() is called; it returns exactly what
+    analyze_team_weaknesses would for the same team.
+
+    Library-only: the app re-analyzes whole teams through the shared team
+    cache, and the optimizer keeps its own bitmask state per partial team.
+    Use this for code that edits one team slot by slot.
+    """
+
+    def __init__(self, members: Optional[List[Dict]] = None):
+        self.members: List[Dict] = []
+        self._masks: List[Tuple[int, int, int, int]] = []
+
+        # Rows: critical (4x+), vulnerable (2x+), resistant, immune
+        self.counts = [[0] * len(ALL_TYPES) for _ in range(4)]
+        self._threats = {t: self._threat_info(t, [], [], [], []) for t in ALL_TYPES}
+        self._dirty = 0  # bitmask of types whose name lists are stale
+        self._categories = None  # category -> attacking type columns
+
+        for pokemon in members or []:
+            self.add(pokemon)
+
+    @classmethod
+    def from_team_data(cls, team_data: Dict) -> "IncrementalTeamAnalysis":
+        return cls(team_data["team_members"])
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    @staticmethod
+    def _member_masks(pokemon: Dict) -> Tuple[int, int, int, int]:
+        profile = get_defensive_profile(pokemon["types"])
+        return (
+            profile.critical_mask,
+            profile.vulnerable_mask,
+            profile.resistant_mask,
+            profile.immune_mask,
+        )
+
+    @staticmethod
+    def _threat_info(attacking_type, vulnerable, critical, resistant, immune) -> Dict:
+        return {
+            "type": attacking_type,
+            "vulnerable_count": len(vulnerable),
+            "critical_count": len(critical),
+            "vulnerable_pokemon": vulnerable,
+            "critical_pokemon": critical,
+            "resistant_pokemon": resistant,
+            "immune_pokemon": immune,
+        }
+
+    def add(self, pokemon: Dict) -> Dict:
+        """Appends a member; returns the per-type category changes"""
+
+        masks = self._member_masks(pokemon)
+        self.members.append(pokemon)
+        self._masks.append(masks)
+        return self._update(added=masks)
+
+    def remove(self, index: int) -> Dict:
+        """Removes the member at index; returns the per-type category changes"""
+
+        self.members.pop(index)
+        masks = self._masks.pop(index)
+        return self._update(removed=masks)
+
+    def replace(self, index: int, pokemon: Dict) -> Dict:
+        """Swaps the member at index; returns the per-type category changes"""
+
+        masks = self._member_masks(pokemon)
+        old_masks = self._masks[index]
+        self.members[index] = pokemon
+        self._masks[index] = masks
+        return self._update(added=masks, removed=old_masks)
+
+    def _update(self, added=_NO_MASKS, removed=_NO_MASKS) -> Dict:
+        affected = 0
+        for mask in added + removed:
+            affected |= mask
+
+        critical, vulnerable = self.counts[0], self.counts[1]
+        delta = {}
+
+        for col, attacking_type in enumerate(ALL_TYPES):
+            bit = 1 << col
+            if not affected & bit:
+                continue
+
+            old = _category(critical[col], vulnerable[col])
+            for row in range(4):
+                if added[row] & bit:
+                    self.counts[row][col] += 1
+                if removed[row] & bit:
+                    self.counts[row][col] -= 1
+            new = _category(critical[col], vulnerable[col])
+
+            if old != new:
+                delta[attacking_type] = {"before": old, "after": new}
+
+        # Name lists of the affected types are rebuilt when the view is needed
+        self._dirty |= affected
+        self._categories = None
+        return delta
+
+    def _rebuild_threats(self) -> None:
+        names = [pokemon["name"] for pokemon in self.members]
+
+        for col, attacking_type in enumerate(ALL_TYPES):
+            bit = 1 << col
+            if not self._dirty & bit:
+                continue
+
+            # Rebuilt rather than mutated, so earlier analyses stay untouched
+            self._threats[attacking_type] = self._threat_info(
+                attacking_type,
+                [n for n, m in zip(names, self._masks) if m[1] & bit],
+                [n for n, m in zip(names, self._masks) if m[0] & bit],
+                [n for n, m in zip(names, self._masks) if m[2] & bit],
+                [n for n, m in zip(names, self._masks) if m[3] & bit],
+            )
+
+        self._dirty = 0
+
+    def _build_categories(self) -> Dict[str, List[int]]:
+        categories = {
+            "critical_weaknesses": [],
+            "major_weaknesses": [],
+            "minor_weaknesses": [],
+            "resistances": [],
+            "immunities": [],
+        }
+
+        for col in range(len(ALL_TYPES)):
+            category = _category(self.counts[0][col], self.counts[1][col])
+            if category is not None:
+                categories[f"{category}_weaknesses"].append(col)
+
+            if self.counts[2][col] or self.counts[3][col]:
+                categories["resistances"].append(col)
+
+            if self.counts[3][col]:
+                categories["immunities"].append(col)
+
+        categories["critical_weaknesses"].sort(
+            key=lambda col: self.counts[0][col], reverse=True
+        )
+        categories["major_weaknesses"].sort(
+            key=lambda col: self.counts[1][col], reverse=True
+        )
+        return categories
+
+    def weakness_analysis(self) -> Dict:
+        """
+        Same dictionary analyze_team_weaknesses returns for the current team.
+        A new one on every call, so callers may modify it.
+        """
+
+        if self._categories is None:
+            self._rebuild_threats()
+            self._categories = self._build_categories()
+
+        threats = []
+        for attacking_type in ALL_TYPES:
+            threat = self._threats[attacking_type]
+            threats.append(
+                self._threat_info(
+                    attacking_type,
+                    list(threat["vulnerable_pokemon"]),
+                    list(threat["critical_pokemon"]),
+                    list(threat["resistant_pokemon"]),
+                    list(threat["immune_pokemon"]),
+                )
+            )
+
+        analysis = {
+            category: [threats[col] for col in cols]
+            for category, cols in self._categories.items()
+        }
+        analysis["team_coverage"] = {}
+        analysis["type_threat_level"] = {threat["type"]: threat for threat in threats}
+        return analysis
@@ -0,0 +1,352 @@
+"""
+Usage-weighted metagame matchups.
+
+A meta is a local usage file (species plus usage weight). Every team member
+is matched against every meta species in one vectorized pass: the offensive
+multiplier (member's best same-type attack on the meta species) and the
+defensive multiplier (meta species' best same-type attack on the member),
+both from TYPE_EFFECTIVENESS. Those cells are then reduced per team into
+usage-weighted threat scores.
+
+Usage:
+    python meta.py usage.csv garchomp scizor rotom-wash heatran togekiss tyranitar
+    python batch_analyzer.py teams.jsonl --meta usage.csv
+"""
+
+import argparse
+import csv
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from metrics import configure_logging
+from pokemon_analyzer import (
+    ALL_TYPES,
+    DEFENSIVE_PROFILES,
+    POKEAPI_MAX_WORKERS,
+    TYPE_COMBINATIONS,
+    TYPE_INDEX,
+    canonical_types,
+    get_pokemon_data,
+)
+
+logger = logging.getLogger(__name__)
+
+# Share of a threat that remains when the team has a check for it: a member
+# that hits it super effectively and takes at most neutral damage back
+CHECKED_THREAT_FACTOR = 0.5
+
+# Teams scored per vectorized block; bounds the meta x members matrices
+BLOCK_TEAMS = 2048
+
+# Last combination index: no known types, neutral both ways
+TYPELESS = len(TYPE_COMBINATIONS)
+# Row of MetaGame.tables for an empty team slot: no flags set
+EMPTY_SLOT = TYPELESS + 1
+COMBO_INDEX = {combo: i for i, combo in enumerate(TYPE_COMBINATIONS)}
+
+
+def _build_stab_chart() -> np.ndarray:
+    """
+    STAB_CHART[attacker, defender]: best multiplier the attacker's own types
+    deal to the defender, for every pair of type combinations (plus typeless).
+    """
+
+    defending = np.stack([DEFENSIVE_PROFILES[c].multipliers for c in TYPE_COMBINATIONS])
+    attacking = np.zeros((len(TYPE_COMBINATIONS), len(ALL_TYPES)), dtype=bool)
+    for row, combo in enumerate(TYPE_COMBINATIONS):
+        attacking[row, [TYPE_INDEX[t] for t in combo]] = True
+
+    chart = np.ones((TYPELESS + 1, TYPELESS + 1))
+    chart[:TYPELESS, :TYPELESS] = np.where(
+        attacking[:, None, :], defending[None, :, :], 0.0
+    ).max(axis=2)
+    return chart
+
+
+STAB_CHART = _build_stab_chart()
+
+
+_combo_rows: Dict[Tuple[str, ...], int] = {}
+
+
+def combo_index(types: Sequence[str]) -> int:
+    """Row of STAB_CHART for a list of type names"""
+
+    key = tuple(types)
+    row = _combo_rows.get(key)
+    if row is None:
+        known = canonical_types([t for t in types if t in TYPE_INDEX])
+        row = _combo_rows[key] = COMBO_INDEX.get(known, TYPELESS)
+    return row
+
+
+def _member_fields(member) -> Tuple[str, List[str]]:
+    # team_data member dicts and models.PokemonRecord both work
+    if isinstance(member, dict):
+        return member["name"], member["types"]
+    return member.name, member.types
+
+
+class MetaGame:
+    """Meta species with normalized usage weights and type-combination rows"""
+
+    def __init__(self, names: List[str], weights: np.ndarray, combos: np.ndarray):
+        self.names = names
+        self.weights = weights
+        self.combos = combos
+        self.missing: List[str] = []
+        self._tables = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def tables(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (hits, answers, checks): type combination x meta species flags, plus
+        an all-False EMPTY_SLOT row. A member's row is looked up by its
+        combination instead of recomputed.
+        """
+
+        if self._tables is None:
+            empty = np.zeros((1, len(self)), dtype=bool)
+            offense = STAB_CHART[:, self.combos]
+            defense = STAB_CHART[self.combos, :].T
+            hits = np.vstack([defense >= 2.0, empty])
+            answers = np.vstack([offense >= 2.0, empty])
+            checks = np.vstack([(offense >= 2.0) & (defense <= 1.0), empty])
+            self._tables = (hits, answers, checks)
+        return self._tables
+
+    @classmethod
+    def from_records(cls, records: List[Dict], usage: List[float]) -> "MetaGame":
+        weights = np.asarray(usage, dtype=np.float64)
+        total = weights.sum()
+        if total > 0:
+            weights = weights / total
+
+        return cls(
+            names=[record["name"] for record in records],
+            weights=weights,
+            combos=np.array([combo_index(r["types"]) for r in records], dtype=np.int16),
+        )
+
+    @classmethod
+    def from_usage(cls, usage: List[Tuple[str, float]], pokedex=None) -> "MetaGame":
+        """
+        Resolves each species (local Pokedex first, then the cache/PokeAPI).
+        Unknown species are dropped and listed in .missing.
+        """
+
+        combined: Dict[str, float] = {}
+        for name, weight in usage:
+            key = name.strip().lower()
+            combined[key] = combined.get(key, 0.0) + weight
+
+        names = list(combined)
+        records: Dict[str, Optional[Dict]] = {}
+        if pokedex is not None:
+            records = {name: pokedex.get(name) for name in names}
+
+        unresolved = [name for name in names if records.get(name) is None]
+        if unresolved:
+            with ThreadPoolExecutor(max_workers=POKEAPI_MAX_WORKERS) as executor:
+                records.update(
+                    zip(unresolved, executor.map(get_pokemon_data, unresolved))
+                )
+
+        found = [name for name in names if records.get(name)]
+        meta = cls.from_records(
+            [records[name] for name in found], [combined[name] for name in found]
+        )
+        meta.missing = [name for name in names if not records.get(name)]
+        return meta
+
+
+def load_usage(path: str) -> List[Tuple[str, float]]:
+    """
+    Reads (species, usage) pairs.
+
+    CSV files need a header with a name column ("name", "pokemon" or
+    "species") and a weight column ("usage" or "weight"). JSON files can be
+    an object of name -> weight or a list of {"name", "usage"} objects.
+    """
+
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            usage = []
+            for row in csv.DictReader(f):
+                row = {key.strip().lower(): value for key, value in row.items() if key}
+                name = row.get("name") or row.get("pokemon") or row.get("species")
+                weight = row.get("usage") or row.get("weight")
+                if name and weight:
+                    usage.append((name, float(weight.rstrip("%"))))
+            return usage
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        return [(name, float(weight)) for name, weight in data.items()]
+    return [
+        (entry["name"], float(entry.get("usage", entry.get("weight", 0))))
+        for entry in data
+    ]
+
+
+def matchup_matrix(members: List, meta: MetaGame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Meta x member multiplier matrices.
+
+    Returns:
+        (offense, defense): offense[j, m] is member m's best same-type
+        multiplier against meta species j, defense[j, m] is meta species j's
+        best same-type multiplier against member m
+    """
+
+    member_combos = np.array(
+        [combo_index(_member_fields(member)[1]) for member in members], dtype=np.int16
+    )
+    offense = STAB_CHART[member_combos[None, :], meta.combos[:, None]]
+    defense = STAB_CHART[meta.combos[:, None], member_combos[None, :]]
+    return offense, defense
+
+
+def score_teams(
+    teams: List[List], meta: MetaGame, top_threats: int = 5
+) -> List[Optional[Dict]]:
+    """
+    Usage-weighted meta scores for many teams at once.
+
+    For each team and meta species: pressure is the share of the team it
+    hits super effectively; the team has a check when a member hits it super
+    effectively and takes at most neutral damage back. Threat is pressure,
+    scaled by CHECKED_THREAT_FACTOR when checked, and the team's
+    meta_threat_score is the usage-weighted sum (0 = nothing threatens it).
+
+    Args:
+        teams: Lists of members (team_data member dicts or PokemonRecords)
+        meta: Meta species and usage weights
+        top_threats: Number of individual threats to list per team
+
+    Returns:
+        One dictionary per team, None for empty teams
+    """
+
+    results: List[Optional[Dict]] = [None] * len(teams)
+    if len(meta) == 0:
+        return results
+
+    scored = [i for i, team in enumerate(teams) if team]
+    for block_start in range(0, len(scored), BLOCK_TEAMS):
+        block = scored[block_start : block_start + BLOCK_TEAMS]
+        for i, result in zip(
+            block, _score_block([teams[i] for i in block], meta, top_threats)
+        ):
+            results[i] = result
+    return results
+
+
+def _score_block(teams: List[List], meta: MetaGame, top_threats: int) -> List[Dict]:
+    sizes = np.array([len(team) for team in teams])
+
+    # teams x slots of type combination rows, short teams padded with EMPTY_SLOT
+    slots = np.full((len(teams), sizes.max()), EMPTY_SLOT, dtype=np.int16)
+    slots[np.arange(slots.shape[1]) < sizes[:, None]] = [
+        combo_index(_member_fields(member)[1]) for team in teams for member in team
+    ]
+
+    # teams x slots x meta
+    hit_table, answer_table, check_table = meta.tables
+    hits = hit_table[slots]
+    checks = check_table[slots]
+
+    # teams x meta
+    pressure = hits.sum(axis=1, dtype=np.uint8) / sizes[:, None]
+    covered = answer_table[slots].any(axis=1)
+    checked = checks.any(axis=1)
+    weighted_threat = (
+        pressure * np.where(checked, CHECKED_THREAT_FACTOR, 1.0) * meta.weights
+    )
+
+    threat_scores = weighted_threat.sum(axis=1).tolist()
+    coverage = (covered @ meta.weights).tolist()
+    checked_share = (checked @ meta.weights).tolist()
+
+    # Top threats of every team: highest weighted threat first, ties by meta order
+    top_k = max(min(top_threats, len(meta)), 1)
+    top = np.sort(np.argpartition(-weighted_threat, top_k - 1, axis=1)[:, :top_k])
+    values = np.take_along_axis(weighted_threat, top, axis=1)
+    order = np.argsort(-values, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    values = np.take_along_axis(values, order, axis=1).tolist()
+
+    # Who each top threat hits and who checks it, teams x slots x top_k
+    top_hits = np.take_along_axis(hits, top[:, None, :], axis=2).tolist()
+    top_checks = np.take_along_axis(checks, top[:, None, :], axis=2).tolist()
+    top = top.tolist()
+    usage = meta.weights.round(4).tolist()
+
+    results = []
+    for k, team in enumerate(teams):
+        names = [_member_fields(member)[0] for member in team]
+        team_hits = top_hits[k]
+        team_checks = top_checks[k]
+
+        threats = []
+        for i, col in enumerate(top[k][:top_threats]):
+            if values[k][i] <= 0:
+                break
+            threats.append(
+                {
+                    "name": meta.names[col],
+                    "usage": usage[col],
+                    "threat": round(values[k][i], 4),
+                    "hits": [n for n, h in zip(names, team_hits) if h[i]],
+                    "checked_by": [n for n, c in zip(names, team_checks) if c[i]],
+                }
+            )
+
+        results.append(
+            {
+                "meta_threat_score": round(threat_scores[k], 4),
+                "meta_coverage": round(coverage[k], 4),
+                "meta_checked": round(checked_share[k], 4),
+                "top_threats": threats,
+            }
+        )
+
+    return results
+
+
+def score_team(team_data: Dict, meta: MetaGame, top_threats: int = 5) -> Optional[Dict]:
+    """score_teams for a single get_team_data result"""
+
+    return score_teams([team_data["team_members"]], meta, top_threats)[0]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Score a team against a local meta")
+    parser.add_argument("usage", help="CSV or JSON usage file")
+    parser.add_argument("team", nargs="+", help="Pokemon names")
+    parser.add_argument("--top", type=int, default=5, help="Threats to list")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    from pokedex import get_local_pokedex
+
+    meta = MetaGame.from_usage(load_usage(args.usage), get_local_pokedex())
+    if meta.missing:
+        logger.warning("⚠️ Unknown meta species: %s", ", ".join(meta.missing))
+
+    members = [get_pokemon_data(name) for name in args.team]
+    team = [member for member in members if member]
+    print(json.dumps(score_teams([team], meta, args.top)[0], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Instrumentation: latency histograms, per-stage timers, logging setup and
+metrics exporters (Prometheus text format on a local HTTP endpoint, or a
+JSON dump).
+
+    METRICS_PORT=9108 streamlit run app.py
+    curl localhost:9108/metrics        # Prometheus text format
+    curl localhost:9108/metrics.json   # same data as JSON
+"""
+
+import bisect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))  # 0 = exporter off
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # "text" or "json"
+
+# Upper bounds in seconds, from a cached lookup to a slow Gemini call
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class Histogram:
+    """
+    Thread-safe latency histogram with one label (e.g. stage or source),
+    exported with cumulative buckets like a Prometheus histogram
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label: str,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # label value -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[str, list] = {}
+
+    def observe(self, seconds: float, label_value: str) -> None:
+        slot = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                    0,
+                ]
+            series[0][slot] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    @contextmanager
+    def time(self, label_value: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, label_value)
+
+    def _snapshot(self) -> Dict[str, Tuple[List[int], float, int]]:
+        with self._lock:
+            return {
+                label_value: (list(counts), total, count)
+                for label_value, (counts, total, count) in self._series.items()
+            }
+
+    def as_dict(self) -> Dict:
+        result = {}
+        for label_value, (counts, total, count) in self._snapshot().items():
+            cumulative = 0
+            buckets = {}
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                buckets[str(bound)] = cumulative
+            result[label_value] = {
+                "count": count,
+                "sum": round(total, 6),
+                "mean": round(total / count, 6) if count else 0.0,
+                "buckets": buckets,
+            }
+        return result
+
+    def prometheus_lines(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for label_value, series in sorted(self.as_dict().items()):
+            label = f'{self.label}="{label_value}"'
+            for bound, cumulative in series["buckets"].items():
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {series['sum']}")
+            lines.append(f"{self.name}_count{{{label}}} {series['count']}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+STAGE_SECONDS = Histogram(
+    "pokemon_analyzer_stage_seconds",
+    "Wall-clock time of each team analysis stage",
+    label="stage",
+)
+POKEMON_LOOKUP_SECONDS = Histogram(
+    "pokemon_analyzer_pokemon_lookup_seconds",
+    "get_pokemon_data latency by where the answer came from",
+    label="source",
+)
+
+_histograms: List[Histogram] = [STAGE_SECONDS, POKEMON_LOOKUP_SECONDS]
+_collectors: Dict[str, Callable[[], Dict]] = {}
+
+
+def register_histogram(histogram: Histogram) -> Histogram:
+    _histograms.append(histogram)
+    return histogram
+
+
+def register_collector(name: str, collect: Callable[[], Dict]) -> None:
+    """Adds a stats function (e.g. get_pokemon_cache_stats) to the exports"""
+
+    _collectors[name] = collect
+
+
+@contextmanager
+def timed(stage: str, timings: Dict[str, float]) -> Iterator[None]:
+    """Times a block into timings[stage] (seconds) and STAGE_SECONDS"""
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings[stage] = round(elapsed, 4)
+        STAGE_SECONDS.observe(elapsed, stage)
+
+
+def _flatten(stats: Dict, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    for key, value in stats.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{name}_")
+        elif isinstance(value, (bool, int, float)):
+            yield name, float(value)
+
+
+def metrics_as_dict() -> Dict:
+    return {
+        "histograms": {h.name: h.as_dict() for h in _histograms},
+        "caches": {name: collect() for name, collect in _collectors.items()},
+    }
+
+
+def render_prometheus() -> str:
+    lines = []
+    for histogram in _histograms:
+        lines.extend(histogram.prometheus_lines())
+
+    # Cache statistics as gauges, one metric per statistic, labelled by cache
+    gauges: Dict[str, List[str]] = {}
+    for cache_name, collect in _collectors.items():
+        for stat, value in _flatten(collect()):
+            metric = f"pokemon_analyzer_cache_{stat}"
+            gauges.setdefault(metric, []).append(
+                f'{metric}{{cache="{cache_name}"}} {value}'
+            )
+    for metric, samples in sorted(gauges.items()):
+        lines.append(f"# TYPE {metric} gauge")
+        lines.extend(samples)
+
+    return "\n".join(lines) + "\n"
+
+
+def dump_json(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(metrics_as_dict(), f, indent=2)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = "127.0.0.1"):
+    """
+    Serves /metrics (Prometheus text) and /metrics.json from a daemon thread.
+    Safe to call repeatedly (e.g. on every Streamlit rerun); returns the
+    server, or None when port is 0.
+    """
+
+    global _server
+    if not port:
+        return None
+
+    with _server_lock:
+        if _server is not None:
+            return _server
+
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path == "/metrics":
+                    body = render_prometheus().encode()
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif path == "/metrics.json":
+                    body = json.dumps(metrics_as_dict()).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        _server = ThreadingHTTPServer((host, port), Handler)
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
+        logging.getLogger(__name__).info(
+            "📈 Metrics on http://%s:%s/metrics", host, _server.server_address[1]
+        )
+        return _server
+
+
+# Attributes every LogRecord has; anything else was passed with extra=
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any extra= fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: Optional[str] = None) -> None:
+    """
+    Sends log records to stderr: plain messages (as the old progress prints
+    looked) or JSON lines with LOG_FORMAT=json. Only configures once.
+    """
+
+    root = logging.getLogger()
+    if any(getattr(h, "_pokemon_analyzer", False) for h in root.handlers):
+        return
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler._pokemon_analyzer = True
+    if (fmt or LOG_FORMAT) == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+    root.addHandler(handler)
+    root.setLevel(level.upper())
@@ -0,0 +1,164 @@
+"""
+Compact representations of Pokemon and analyzed teams.
+
+The analyzer's public functions pass around nested dicts with repeated name
+lists. These classes keep the same information in a few small integers per
+team: types as indices, and weaknesses as per-type member bitmasks held in a
+WeaknessTemplate that every team of the same type combinations shares. The
+familiar dict shapes are rebuilt on demand, so large batches and long-lived
+caches stay small.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from pokemon_analyzer import (
+    ALL_TYPES,
+    TYPE_INDEX,
+    WeaknessTemplate,
+    bind_weakness_template,
+    get_weakness_template,
+)
+
+# Categories types_in accepts (WeaknessTemplate fields)
+WEAKNESS_CATEGORIES = ("critical", "major", "minor", "resistances", "immunities")
+
+
+@dataclass
+class PokemonRecord:
+    """One species; share a single instance across every team that uses it"""
+
+    __slots__ = ("name", "id", "type_ids", "sprite")
+
+    name: str
+    id: int
+    type_ids: bytes  # indices into ALL_TYPES, in PokeAPI slot order
+    sprite: Optional[str]
+
+    @classmethod
+    def from_dict(cls, pokemon: Dict) -> "PokemonRecord":
+        return cls(
+            name=pokemon["name"],
+            id=pokemon["id"],
+            type_ids=bytes(TYPE_INDEX[t] for t in pokemon["types"] if t in TYPE_INDEX),
+            sprite=pokemon.get("sprite"),
+        )
+
+    @property
+    def types(self) -> List[str]:
+        return [ALL_TYPES[i] for i in self.type_ids]
+
+    def to_dict(self) -> Dict:
+        """Same shape get_pokemon_data returns"""
+
+        return {
+            "name": self.name,
+            "id": self.id,
+            "types": self.types,
+            "sprite": self.sprite,
+        }
+
+
+@dataclass
+class TeamAnalysis:
+    """
+    A fetched and analyzed team.
+
+    template holds, for each category (critical, vulnerable, resistant,
+    immune) and attacking type, a bitmask of the template slots that fall
+    into it; order maps slots back to member positions. Both are filled on
+    first use and then kept, so the team no longer depends on the template
+    LRU. Teams of the same types point at one shared template.
+    """
+
+    __slots__ = ("members", "failed_pokemon", "template", "order")
+
+    members: Tuple[PokemonRecord, ...]
+    failed_pokemon: Tuple[str, ...]
+    template: Optional[WeaknessTemplate]
+    order: Optional[Tuple[int, ...]]
+
+    @classmethod
+    def build(
+        cls, members: List[PokemonRecord], failed_pokemon: List[str] = ()
+    ) -> "TeamAnalysis":
+        # The template is left to the first view, so batch workers compute it
+        return cls(tuple(members), tuple(failed_pokemon), None, None)
+
+    @classmethod
+    def from_team_data(cls, team_data: Dict) -> "TeamAnalysis":
+        members = [PokemonRecord.from_dict(p) for p in team_data["team_members"]]
+        return cls.build(members, team_data["failed_pokemon"])
+
+    def _template(self) -> Tuple[WeaknessTemplate, Tuple[int, ...]]:
+        if self.template is None:
+            self.template, self.order = get_weakness_template(
+                [member.types for member in self.members]
+            )
+        return self.template, self.order
+
+    def types_in(self, category: str) -> List[str]:
+        """
+        Attacking types in a weakness category ("critical", "major", "minor"),
+        or "resistances"/"immunities", in analyze_team_weaknesses order
+        """
+
+        if category not in WEAKNESS_CATEGORIES:
+            return []
+        template, _ = self._template()
+        return [ALL_TYPES[col] for col in getattr(template, category)]
+
+    def weakness_types(self) -> Dict[str, List[str]]:
+        """types_in for every category at once"""
+
+        template, _ = self._template()
+        return {
+            category: [ALL_TYPES[col] for col in getattr(template, category)]
+            for category in WEAKNESS_CATEGORIES
+        }
+
+    # Dict views, built on demand
+
+    def team_data(self) -> Dict:
+        """Same shape get_team_data returns"""
+
+        all_types = [t for member in self.members for t in member.types]
+        unique_types = list(set(all_types))
+        return {
+            "team_members": [member.to_dict() for member in self.members],
+            "all_types": all_types,
+            "success_count": len(self.members),
+            "failed_pokemon": list(self.failed_pokemon),
+            "unique_types": unique_types,
+            "type_coverage": len(unique_types),
+        }
+
+    def weakness_analysis(self) -> Dict:
+        """Same dictionary analyze_team_weaknesses returns"""
+
+        template, order = self._template()
+        return bind_weakness_template(
+            template, order, [member.name for member in self.members]
+        )
+
+    def summary(self) -> Dict:
+        template, _ = self._template()
+        return {
+            "team_size": len(self.members),
+            "type_coverage": len(
+                {t for member in self.members for t in member.type_ids}
+            ),
+            "critical_weaknesses_count": len(template.critical),
+            "major_weaknesses_count": len(template.major),
+        }
+
+    def to_result(self) -> Dict:
+        """Same shape analyze_team returns"""
+
+        return {
+            "success": True,
+            "team_data": self.team_data(),
+            "weakness_analysis": self.weakness_analysis(),
+            "ai_recommendations": None,
+            "summary": self.summary(),
+        }
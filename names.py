@@ -0,0 +1,255 @@
+"""
+Local Pokemon name index.
+
+User input is normalized ("Mr. Mime" -> "mr-mime", "Alolan Raichu" ->
+"raichu-alola", "Giratina" -> "giratina-altered") and resolved to the
+canonical PokeAPI slug before any request is made, so typos cost a dict
+lookup instead of a 404 round trip. Names that don't resolve get "did you
+mean" suggestions from a trigram index.
+
+The species list comes from the local Pokedex snapshot when there is one,
+otherwise from SPECIES_LIST_PATH (`python names.py sync`).
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+SPECIES_LIST_PATH = os.getenv("SPECIES_LIST_PATH", "data/species.json")
+
+# Minimum Dice similarity (shared trigrams) for a suggestion
+SUGGESTION_MIN_SCORE = 0.4
+
+# Spellings normalization alone doesn't map to the API slug
+ALIASES = {
+    "nidoran-female": "nidoran-f",
+    "nidoran-male": "nidoran-m",
+}
+
+# Words naming a form, as users write them -> as the API spells them. The
+# API puts the form after the species ("alolan raichu" -> "raichu-alola").
+FORM_WORDS = {
+    "alolan": "alola",
+    "galarian": "galar",
+    "hisuian": "hisui",
+    "paldean": "paldea",
+    "mega": "mega",
+    "primal": "primal",
+    "gigantamax": "gmax",
+    "gmax": "gmax",
+}
+
+_SYMBOLS = {"♀": "-f", "♂": "-m", "é": "e", "’": "", "'": "", ".": "", ":": ""}
+_SEPARATORS = re.compile(r"[\s_]+|-{2,}")
+
+
+def normalize_name(name: str) -> str:
+    """Lowercased, ASCII, hyphen-separated slug as PokeAPI spells names"""
+
+    name = name.strip().lower()
+    for symbol, replacement in _SYMBOLS.items():
+        name = name.replace(symbol, replacement)
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    name = _SEPARATORS.sub("-", name).strip("-")
+    return ALIASES.get(name, name)
+
+
+def _form_candidates(slug: str) -> List[str]:
+    """
+    Spellings to try for input naming a form: "alolan-raichu" ->
+    "raichu-alola"; "mega-charizard-x" -> "charizard-mega-x";
+    "galarian-mr-mime" -> ..., "mr-mime-galar"
+    """
+
+    words = slug.split("-")
+    if not any(word in FORM_WORDS for word in words):
+        return []
+
+    words = [FORM_WORDS.get(word, word) for word in words]
+    candidates = ["-".join(words)]
+    if slug.split("-", 1)[0] in FORM_WORDS and len(words) > 1:
+        form, rest = words[0], words[1:]
+        for i in range(1, len(rest) + 1):
+            candidates.append("-".join(rest[:i] + [form] + rest[i:]))
+    return candidates
+
+
+def _trigrams(name: str) -> Set[str]:
+    padded = f"  {name.replace('-', ' ')} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Canonical species slugs (in id order) with exact, alias, default-form
+    and trigram lookups.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names = list(dict.fromkeys(name.lower() for name in names))
+        self._known = set(self.names)
+
+        # "giratina" -> "giratina-altered": first form (lowest id) of a
+        # species the API only lists with a form suffix
+        self.default_forms: Dict[str, str] = {}
+        for name in self.names:
+            base = name.split("-", 1)[0]
+            if base != name and base not in self._known:
+                self.default_forms.setdefault(base, name)
+
+        self._grams = [_trigrams(name) for name in self.names]
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for row, grams in enumerate(self._grams):
+            for gram in grams:
+                self._postings[gram].append(row)
+
+        self._resolved: Dict[str, Optional[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return self.resolve(name) is not None
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Canonical slug for user input, or None when it isn't a known species"""
+
+        resolved = self._resolved.get(name, False)
+        if resolved is not False:
+            return resolved
+
+        slug = normalize_name(name)
+        if slug not in self._known:
+            slug = next(
+                (c for c in _form_candidates(slug) if c in self._known),
+                self.default_forms.get(slug),
+            )
+
+        # Bounded: only the distinct spellings users actually type
+        if len(self._resolved) < 65536:
+            self._resolved[name] = slug
+        return slug
+
+    def suggest(self, name: str, limit: int = 3) -> List[str]:
+        """Closest known slugs by trigram similarity, best first"""
+
+        grams = _trigrams(normalize_name(name))
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for row in self._postings.get(gram, ()):
+                shared[row] += 1
+
+        scored = []
+        for row, count in shared.items():
+            score = 2 * count / (len(grams) + len(self._grams[row]))
+            if score >= SUGGESTION_MIN_SCORE:
+                scored.append((-score, row))
+
+        scored.sort()
+        return [self.names[row] for _, row in scored[:limit]]
+
+
+def load_species_list(path: str = SPECIES_LIST_PATH) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+_name_index = None
+_name_index_loaded = False
+
+
+def get_name_index() -> Optional[NameIndex]:
+    """
+    Process-wide index over the local Pokedex snapshot or species list, or
+    None when neither exists (names then go to PokeAPI as typed). Built, or
+    found missing, once per process.
+    """
+
+    global _name_index, _name_index_loaded
+    if not _name_index_loaded:
+        from pokedex import get_local_pokedex
+
+        pokedex = get_local_pokedex()
+        if pokedex is not None:
+            _name_index = NameIndex(pokedex.names)
+        elif os.path.exists(SPECIES_LIST_PATH):
+            _name_index = NameIndex(load_species_list())
+        _name_index_loaded = True
+    return _name_index
+
+
+def suggest_names(names: List[str], limit: int = 3) -> Dict[str, List[str]]:
+    """Suggestions ("did you mean") for each name that doesn't resolve"""
+
+    index = get_name_index()
+    if index is None:
+        return {}
+
+    suggestions = {}
+    for name in names:
+        if not name.strip().isdigit() and index.resolve(name) is None:
+            candidates = index.suggest(name, limit)
+            if candidates:
+                suggestions[name] = candidates
+    return suggestions
+
+
+def sync_species_list(path: str = SPECIES_LIST_PATH) -> List[str]:
+    """Downloads every species slug from PokeAPI and saves the list"""
+
+    from pokedex import list_species
+
+    names = list_species()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(names, f)
+
+    logger.info("✅ Saved %d Pokemon names to %s", len(names), path)
+    return names
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local Pokemon name index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync = subparsers.add_parser("sync", help="Download the species list")
+    sync.add_argument("-o", "--output", default=SPECIES_LIST_PATH)
+
+    lookup = subparsers.add_parser("lookup", help="Resolve names")
+    lookup.add_argument("names", nargs="+")
+
+    args = parser.parse_args(argv)
+
+    from metrics import configure_logging
+
+    configure_logging()
+
+    if args.command == "sync":
+        sync_species_list(args.output)
+        return
+
+    index = get_name_index()
+    if index is None:
+        parser.error("no Pokedex snapshot or species list; run `names.py sync`")
+
+    for name in args.names:
+        slug = index.resolve(name)
+        if slug is not None:
+            print(f"{name} -> {slug}")
+        else:
+            print(
+                f"{name} -> not found; did you mean {', '.join(index.suggest(name))}?"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+Offensive coverage: which defending type combinations a team can hit super
+effectively with the damaging moves its members learn.
+
+Movepools and move data are fetched from PokeAPI once and then served from
+the same SQLite file as the Pokemon cache. Lookups are batched: every
+member's movepool in one cache query, then every distinct move across the
+team (or across many teams) in one more, with only the misses fetched,
+concurrently and de-duplicated.
+
+Usage:
+    python offensive_coverage.py garchomp scizor rotom-wash heatran togekiss tyranitar
+"""
+
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import requests
+
+from cache import NEGATIVE, LRUCache, PersistentCache, SingleFlight
+from metrics import configure_logging, register_collector
+from pokemon_analyzer import (
+    ALL_TYPES,
+    DEFENSIVE_PROFILES,
+    POKEAPI_BASE_URL,
+    POKEAPI_CACHE_PATH,
+    POKEAPI_CACHE_TTL,
+    POKEAPI_MAX_WORKERS,
+    POKEAPI_NEGATIVE_CACHE_TTL,
+    POKEAPI_OFFLINE,
+    TYPE_COMBINATIONS,
+    TYPE_INDEX,
+    build_team_data,
+    get_pokemon_data,
+    movepool_cache,
+    pokeapi_client,
+)
+
+logger = logging.getLogger(__name__)
+
+MOVE_MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("MOVE_MEMORY_CACHE_MAX_ENTRIES", 4096))
+
+move_cache = PersistentCache(POKEAPI_CACHE_PATH, namespace="move")
+move_memory_cache = LRUCache(max_entries=MOVE_MEMORY_CACHE_MAX_ENTRIES)
+move_single_flight = SingleFlight()
+movepool_single_flight = SingleFlight()
+
+# Moves in these classes deal damage; status moves don't count for coverage
+DAMAGE_CLASSES = ("physical", "special")
+
+# Defending combination x attacking type multipliers, TYPE_COMBINATIONS order
+COMBO_MULTIPLIERS = np.stack(
+    [DEFENSIVE_PROFILES[combo].multipliers for combo in TYPE_COMBINATIONS]
+)
+
+
+def _fetch_movepool(name: str) -> Optional[List[str]]:
+    url = f"{POKEAPI_BASE_URL}/pokemon/{name}"
+
+    try:
+        response = pokeapi_client.get(url)
+
+        if response.status_code == 200:
+            data = response.json()
+            movepool = [move_info["move"]["name"] for move_info in data["moves"]]
+            movepool_cache.set(f"name:{data['name']}", movepool, POKEAPI_CACHE_TTL)
+            if data["name"] != name:
+                movepool_cache.set(f"name:{name}", movepool, POKEAPI_CACHE_TTL)
+            return movepool
+
+        if response.status_code == 404:
+            movepool_cache.set_negative(f"name:{name}", POKEAPI_NEGATIVE_CACHE_TTL)
+            logger.warning("Movepool for %s not found", name)
+            return None
+
+        logger.error(
+            "PokeApi answered %s for the movepool of %s", response.status_code, name
+        )
+        return None
+
+    except requests.exceptions.RequestException as e:
+        logger.error("Error connecting to PokeApi: %s", e)
+        return None
+
+    except KeyError as e:
+        logger.error("Error parsing movepool data: %s", e)
+        return None
+
+
+def _fetch_move(name: str):
+    """Move record, NEGATIVE for a 404, or None on a transient error"""
+
+    url = f"{POKEAPI_BASE_URL}/move/{name}"
+
+    try:
+        response = pokeapi_client.get(url)
+
+        if response.status_code == 200:
+            data = response.json()
+            return {
+                "name": data["name"],
+                "type": data["type"]["name"],
+                "power": data["power"],
+                "damage_class": data["damage_class"]["name"],
+            }
+
+        if response.status_code == 404:
+            logger.warning("Move %s not found", name)
+            return NEGATIVE
+
+        logger.error("PokeApi answered %s for move %s", response.status_code, name)
+        return None
+
+    except requests.exceptions.RequestException as e:
+        logger.error("Error connecting to PokeApi: %s", e)
+        return None
+
+    except (KeyError, TypeError) as e:
+        logger.error("Error parsing move data: %s", e)
+        return None
+
+
+def get_movepools(
+    names: Iterable[str], offline: Optional[bool] = None
+) -> Dict[str, Optional[List[str]]]:
+    """
+    Move names each species can learn, keyed by lowercased name (None when
+    unavailable). Cached movepools are read in one query; the rest are
+    fetched concurrently.
+    """
+
+    if offline is None:
+        offline = POKEAPI_OFFLINE
+
+    names = list(dict.fromkeys(name.lower() for name in names))
+    cached = movepool_cache.get_many(f"name:{name}" for name in names)
+
+    movepools = {}
+    missing = []
+    for name in names:
+        movepool = cached.get(f"name:{name}")
+        if movepool is None:
+            missing.append(name)
+        else:
+            movepools[name] = _positive(movepool)
+
+    if missing and not offline:
+
+        def fetch(name: str) -> Optional[List[str]]:
+            return movepool_single_flight.do(name, lambda: _fetch_movepool(name))
+
+        with ThreadPoolExecutor(max_workers=POKEAPI_MAX_WORKERS) as executor:
+            movepools.update(zip(missing, executor.map(fetch, missing)))
+
+    for name in missing:
+        movepools.setdefault(name, None)
+    return movepools
+
+
+def get_moves(
+    move_names: Iterable[str], offline: Optional[bool] = None
+) -> Dict[str, Optional[Dict]]:
+    """
+    Move records ({"name", "type", "power", "damage_class"}) for every
+    distinct name: memory first, then one on-disk query, then concurrent
+    fetches for what is left. Unknown moves map to None.
+    """
+
+    if offline is None:
+        offline = POKEAPI_OFFLINE
+
+    names = list(dict.fromkeys(move_names))
+    moves = {}
+    missing = []
+    for name in names:
+        move = move_memory_cache.get(name)
+        if move is None:
+            missing.append(name)
+        else:
+            moves[name] = move
+
+    if missing:
+        cached = move_cache.get_many(f"name:{name}" for name in missing)
+        still_missing = []
+        for name in missing:
+            move = cached.get(f"name:{name}")
+            if move is None:
+                still_missing.append(name)
+            else:
+                move_memory_cache.set(name, move)
+                moves[name] = move
+        missing = still_missing
+
+    if missing and not offline:
+
+        def fetch(name: str):
+            return move_single_flight.do(name, lambda: _fetch_move(name))
+
+        with ThreadPoolExecutor(max_workers=POKEAPI_MAX_WORKERS) as executor:
+            fetched = dict(zip(missing, executor.map(fetch, missing)))
+
+        found = {name: move for name, move in fetched.items() if move is not None}
+        move_cache.set_many(
+            {f"name:{n}": m for n, m in found.items() if m != NEGATIVE},
+            POKEAPI_CACHE_TTL,
+        )
+        move_cache.set_many(
+            {f"name:{n}": m for n, m in found.items() if m == NEGATIVE},
+            POKEAPI_NEGATIVE_CACHE_TTL,
+        )
+        for name, move in found.items():
+            move_memory_cache.set(name, move)
+        moves.update(found)
+
+    return {name: _positive(moves.get(name)) for name in names}
+
+
+def _positive(value):
+    return None if value == NEGATIVE else value
+
+
+def _combo_names(mask: np.ndarray) -> List[List[str]]:
+    return [list(TYPE_COMBINATIONS[i]) for i in np.flatnonzero(mask)]
+
+
+def _type_names(mask: np.ndarray) -> List[str]:
+    return [ALL_TYPES[i] for i in np.flatnonzero(mask)]
+
+
+def analyze_teams_offensive_coverage(
+    teams: List[Dict], offline: Optional[bool] = None
+) -> List[Dict]:
+    """
+    Offensive coverage for many teams with one batched lookup of every
+    distinct species' movepool and every distinct move.
+
+    A member whose movepool can't be loaded is assumed to attack with its
+    own types and is listed under "missing_movepools".
+
+    Args:
+        teams: Team dictionaries from get_team_data
+        offline: Only use cached movepools and moves
+
+    Returns:
+        One coverage dictionary per team
+    """
+
+    species = {
+        member["name"].lower(): member
+        for team_data in teams
+        for member in team_data["team_members"]
+    }
+    movepools = get_movepools(species, offline)
+    moves = get_moves(
+        (move for movepool in movepools.values() if movepool for move in movepool),
+        offline,
+    )
+
+    # Attacking types per species (18 flags) and damaging move counts
+    attack_masks = {}
+    move_counts = {}
+    for name, member in species.items():
+        mask = np.zeros(len(ALL_TYPES), dtype=bool)
+        movepool = movepools.get(name)
+        if movepool is None:
+            mask[[TYPE_INDEX[t] for t in member["types"] if t in TYPE_INDEX]] = True
+            move_counts[name] = 0
+        else:
+            damaging = [
+                moves[move]
+                for move in movepool
+                if moves.get(move) and moves[move]["damage_class"] in DAMAGE_CLASSES
+            ]
+            for move in damaging:
+                if move["type"] in TYPE_INDEX:
+                    mask[TYPE_INDEX[move["type"]]] = True
+            move_counts[name] = len(damaging)
+        attack_masks[name] = mask
+
+    if not teams:
+        return []
+
+    # teams x 18 attacking types -> teams x combinations best multiplier
+    team_masks = np.stack(
+        [
+            np.any(
+                [attack_masks[m["name"].lower()] for m in team_data["team_members"]]
+                or [np.zeros(len(ALL_TYPES), dtype=bool)],
+                axis=0,
+            )
+            for team_data in teams
+        ]
+    )
+    best = np.where(team_masks[:, None, :], COMBO_MULTIPLIERS[None, :, :], 0.0).max(
+        axis=2
+    )
+
+    # Combinations each species hits super effectively on its own
+    member_super_effective = {
+        name: int((np.where(mask, COMBO_MULTIPLIERS, 0.0).max(axis=1) >= 2.0).sum())
+        for name, mask in attack_masks.items()
+    }
+
+    results = []
+    for k, team_data in enumerate(teams):
+        super_effective = best[k] >= 2.0
+        results.append(
+            {
+                "attacking_types": _type_names(team_masks[k]),
+                "super_effective": _combo_names(super_effective),
+                "neutral": _combo_names(best[k] == 1.0),
+                "resisted": _combo_names((best[k] < 1.0) & (best[k] > 0.0)),
+                "no_effect": _combo_names(best[k] == 0.0),
+                "super_effective_count": int(super_effective.sum()),
+                "combination_count": len(TYPE_COMBINATIONS),
+                "coverage_ratio": float(super_effective.mean()),
+                "members": [
+                    {
+                        "name": member["name"],
+                        "damaging_moves": move_counts[member["name"].lower()],
+                        "attacking_types": _type_names(
+                            attack_masks[member["name"].lower()]
+                        ),
+                        "super_effective_count": member_super_effective[
+                            member["name"].lower()
+                        ],
+                    }
+                    for member in team_data["team_members"]
+                ],
+                "missing_movepools": [
+                    member["name"]
+                    for member in team_data["team_members"]
+                    if movepools.get(member["name"].lower()) is None
+                ],
+            }
+        )
+
+    return results
+
+
+def analyze_offensive_coverage(team_data: Dict, offline: Optional[bool] = None) -> Dict:
+    """analyze_teams_offensive_coverage for a single get_team_data result"""
+
+    return analyze_teams_offensive_coverage([team_data], offline)[0]
+
+
+def get_move_cache_stats() -> Dict:
+    stats = move_cache.stats.as_dict()
+    stats["entries"] = len(move_cache)
+    stats["memory"] = move_memory_cache.as_dict()
+    stats["single_flight"] = move_single_flight.as_dict()
+    stats["movepools"] = movepool_cache.stats.as_dict()
+    return stats
+
+
+register_collector("move", get_move_cache_stats)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Offensive type coverage of a team")
+    parser.add_argument("team", nargs="+", help="Pokemon names")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    members = [get_pokemon_data(name) for name in args.team]
+    team_data = build_team_data(args.team, members, verbose=False)
+    coverage = analyze_offensive_coverage(team_data)
+
+    print(
+        json.dumps(
+            {
+                key: coverage[key]
+                for key in (
+                    "attacking_types",
+                    "super_effective_count",
+                    "combination_count",
+                    "resisted",
+                    "no_effect",
+                    "members",
+                    "missing_movepools",
+                )
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
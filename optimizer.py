@@ -0,0 +1,297 @@
+"""
+Search for six-member type compositions with the fewest weaknesses.
+
+Teams are scored with the same categories analyze_team_weaknesses reports
+(critical, major and minor weaknesses). Each member is one of the 171
+canonical type combinations (no two members share one), and its weaknesses
+are stored as bitmasks, so adding a member to a partial team is a handful
+of integer operations.
+"""
+
+import heapq
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from pokedex import Pokedex
+from pokemon_analyzer import (
+    ALL_TYPES,
+    DEFENSIVE_PROFILES,
+    TYPE_COMBINATIONS,
+    canonical_types,
+    get_defensive_profile,
+    get_pokemon_data,
+)
+
+TEAM_SIZE = 6
+
+# Penalty weights. They must satisfy critical >= major >= minor >= 0 so that
+# a partial team's penalty never decreases when members are added, which is
+# what makes it a valid lower bound for branch-and-bound.
+PENALTY_WEIGHTS = {"critical": 100, "major": 10, "minor": 1}
+
+_shared_bound = None
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def _add_member(state: Tuple[int, int, int, int], profile) -> Tuple[int, int, int, int]:
+    once, twice, critical, covered = state
+    return (
+        once | profile.vulnerable_mask,
+        twice | (once & profile.vulnerable_mask),
+        critical | profile.critical_mask,
+        covered | profile.resistant_mask | profile.immune_mask,
+    )
+
+
+def _penalty(state: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    once, twice, critical, _ = state
+    critical_count = _popcount(critical)
+    major_count = _popcount(twice & ~critical)
+    minor_count = _popcount(once & ~twice & ~critical)
+    penalty = (
+        PENALTY_WEIGHTS["critical"] * critical_count
+        + PENALTY_WEIGHTS["major"] * major_count
+        + PENALTY_WEIGHTS["minor"] * minor_count
+    )
+    return penalty, critical_count, major_count, minor_count
+
+
+def _score(state: Tuple[int, int, int, int]) -> Tuple[int, int]:
+    # Lower is better: penalty first, then more resisted/immune types
+    return _penalty(state)[0], -_popcount(state[3])
+
+
+def _init_worker(shared_bound) -> None:
+    global _shared_bound
+    _shared_bound = shared_bound
+
+
+def _search_branch(
+    first: int,
+    candidates: List[Tuple[str, ...]],
+    base_state: Tuple[int, int, int, int],
+    base_team: Tuple[Tuple[str, ...], ...],
+    slots: int,
+    top_n: int,
+    max_critical: Optional[int],
+    deadline: float,
+) -> Tuple[List, int, bool]:
+    """
+    Depth-first search of every team whose first open slot is candidates[first].
+
+    Returns the best (score, team) pairs found, the number of nodes expanded
+    and whether the time budget ran out.
+    """
+
+    profiles = [DEFENSIVE_PROFILES[combo] for combo in candidates]
+    best = []  # max-heap on score via negation: (-penalty, resist, team)
+    nodes = 0
+    timed_out = False
+
+    def bound() -> float:
+        local = -best[0][0] if len(best) >= top_n else float("inf")
+        if _shared_bound is not None:
+            local = min(local, _shared_bound.value)
+        return local
+
+    def publish() -> None:
+        if _shared_bound is not None and len(best) >= top_n:
+            with _shared_bound.get_lock():
+                if -best[0][0] < _shared_bound.value:
+                    _shared_bound.value = -best[0][0]
+
+    def visit(start: int, state, team, remaining: int) -> None:
+        nonlocal nodes, timed_out
+
+        if timed_out:
+            return
+
+        for i in range(start, len(candidates)):
+            nodes += 1
+            if nodes % 4096 == 0 and time.monotonic() > deadline:
+                timed_out = True
+                return
+
+            new_state = _add_member(state, profiles[i])
+            penalty, critical_count, _, _ = _penalty(new_state)
+
+            if max_critical is not None and critical_count > max_critical:
+                continue
+            # Penalties only grow as members are added
+            if penalty > bound():
+                continue
+
+            new_team = team + (candidates[i],)
+            if remaining == 1:
+                score = _score(new_state)
+                entry = (-score[0], -score[1], new_team)
+                if len(best) < top_n:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+                publish()
+            else:
+                # Increasing indices: each set of combinations is visited once
+                visit(i + 1, new_state, new_team, remaining - 1)
+
+    state = _add_member(base_state, profiles[first])
+    penalty, critical_count, _, _ = _penalty(state)
+    within_cap = max_critical is None or critical_count <= max_critical
+
+    if within_cap and penalty <= bound():
+        team = base_team + (candidates[first],)
+        if slots == 1:
+            score = _score(state)
+            best.append((-score[0], -score[1], team))
+        else:
+            visit(first + 1, state, team, slots - 1)
+
+    results = [
+        ((-neg_penalty, -neg_resist), team) for neg_penalty, neg_resist, team in best
+    ]
+    return results, nodes, timed_out
+
+
+def _resolve_member_types(name: str, pokedex: Optional[Pokedex]) -> Tuple[str, ...]:
+    record = pokedex.get(name) if pokedex is not None else None
+    if record is None:
+        record = get_pokemon_data(name)
+    if record is None:
+        raise ValueError(f"Unknown Pokemon: {name}")
+    return canonical_types(record["types"])
+
+
+def _team_result(score, team, pokedex: Optional[Pokedex]) -> Dict:
+    state = (0, 0, 0, 0)
+    for combo in team:
+        state = _add_member(state, DEFENSIVE_PROFILES[combo])
+    penalty, critical_count, major_count, minor_count = _penalty(state)
+
+    result = {
+        "types": [list(combo) for combo in team],
+        "penalty": penalty,
+        "critical_weaknesses": critical_count,
+        "major_weaknesses": major_count,
+        "minor_weaknesses": minor_count,
+        "covered_types": [t for i, t in enumerate(ALL_TYPES) if state[3] >> i & 1],
+    }
+
+    if pokedex is not None:
+        examples = _examples_by_combo(pokedex)
+        result["example_species"] = [examples.get(combo) for combo in team]
+
+    return result
+
+
+def _examples_by_combo(pokedex: Pokedex) -> Dict[Tuple[str, ...], str]:
+    examples = {}
+    for record in pokedex.records:
+        examples.setdefault(canonical_types(record["types"]), record["name"])
+    return examples
+
+
+def optimize_team(
+    must_include: Optional[List[str]] = None,
+    banned_types: Optional[List[str]] = None,
+    max_critical: Optional[int] = None,
+    pokedex: Optional[Pokedex] = None,
+    top_n: int = 5,
+    time_budget: float = 30.0,
+    workers: Optional[int] = None,
+) -> Dict:
+    """
+    Finds the type compositions with the lowest weakness penalty.
+
+    Args:
+        must_include: Pokemon names that must be on the team
+        banned_types: Types no searched member may have
+        max_critical: Maximum number of critical (4x) weakness types allowed
+        pokedex: Restrict candidates to combinations that exist in this snapshot
+        top_n: Number of teams to return
+        time_budget: Seconds before returning the best teams found so far
+        workers: Search processes (defaults to CPU count)
+
+    Returns:
+        Dictionary with the best teams and search statistics
+    """
+
+    start = time.monotonic()
+    deadline = start + time_budget
+    must_include = must_include or []
+    banned = set(banned_types or [])
+
+    if len(must_include) > TEAM_SIZE:
+        raise ValueError("Pokemon teams should have maximum 6 members")
+
+    base_team = tuple(_resolve_member_types(name, pokedex) for name in must_include)
+    base_state = (0, 0, 0, 0)
+    for combo in base_team:
+        base_state = _add_member(base_state, get_defensive_profile(list(combo)))
+
+    if pokedex is not None:
+        available = set(_examples_by_combo(pokedex))
+        candidates = [c for c in TYPE_COMBINATIONS if c in available]
+    else:
+        candidates = list(TYPE_COMBINATIONS)
+    # Searched members never repeat a must_include combination
+    candidates = [c for c in candidates if not banned & set(c) and c not in base_team]
+
+    # Visit members with few weaknesses first so good incumbents appear early
+    candidates.sort(
+        key=lambda c: (
+            _popcount(DEFENSIVE_PROFILES[c].vulnerable_mask),
+            -_popcount(
+                DEFENSIVE_PROFILES[c].resistant_mask | DEFENSIVE_PROFILES[c].immune_mask
+            ),
+        )
+    )
+
+    slots = TEAM_SIZE - len(base_team)
+    best = []
+    nodes = 0
+    timed_out = False
+
+    if slots == 0:
+        best = [(_score(base_state), base_team)]
+    elif candidates:
+        workers = workers or os.cpu_count() or 1
+        shared_bound = multiprocessing.Value("d", float("inf"))
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(shared_bound,)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _search_branch,
+                    first,
+                    candidates,
+                    base_state,
+                    base_team,
+                    slots,
+                    top_n,
+                    max_critical,
+                    deadline,
+                )
+                for first in range(len(candidates))
+            ]
+            for future in futures:
+                branch_best, branch_nodes, branch_timed_out = future.result()
+                best.extend(branch_best)
+                nodes += branch_nodes
+                timed_out = timed_out or branch_timed_out
+
+    best.sort(key=lambda item: item[0])
+    teams = [_team_result(score, team, pokedex) for score, team in best[:top_n]]
+
+    return {
+        "teams": teams,
+        "nodes": nodes,
+        "timed_out": timed_out,
+        "seconds": round(time.monotonic() - start, 3),
+    }
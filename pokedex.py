@@ -0,0 +1,239 @@
+"""
+Local Pokedex snapshot.
+
+`python pokedex.py sync` pulls every species from PokeAPI once and writes a
+compact Arrow IPC file (name, id, type indices, sprite URL). The file is
+memory-mapped on load, so workers can resolve Pokemon without any network
+access and with next to no startup cost. JSON snapshots (a list of
+get_pokemon_data records) are still supported.
+"""
+
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from metrics import configure_logging
+from pokemon_analyzer import (
+    ALL_TYPES,
+    POKEAPI_BASE_URL,
+    POKEAPI_MAX_WORKERS,
+    TYPE_CHART,
+    TYPE_INDEX,
+    get_pokemon_data,
+    pokeapi_client,
+)
+
+logger = logging.getLogger(__name__)
+
+POKEDEX_PATH = os.getenv("POKEDEX_PATH", "data/pokedex.arrow")
+
+NO_TYPE = -1
+
+
+class Pokedex:
+    """
+    Columnar snapshot of every species: lowercased API name, id, primary and
+    secondary type indices (ALL_TYPES order, -1 for none) and sprite URL.
+
+    Records are handed out in the same shape get_pokemon_data returns:
+    {"name", "id", "types", "sprite"}.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        ids: np.ndarray,
+        type1: np.ndarray,
+        type2: np.ndarray,
+        sprites: List[Optional[str]],
+    ):
+        self.names = names
+        self.ids = ids
+        self.type1 = type1
+        self.type2 = type2
+        self.sprites = sprites
+
+        # name -> row and id -> row
+        self.index = {name: row for row, name in enumerate(names)}
+        self.id_index = {int(pokemon_id): row for row, pokemon_id in enumerate(ids)}
+
+        self._records = None
+        self._multipliers = None
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "Pokedex":
+        type1 = []
+        type2 = []
+        for record in records:
+            types = [TYPE_INDEX[t] for t in record["types"] if t in TYPE_INDEX]
+            type1.append(types[0] if types else NO_TYPE)
+            type2.append(types[1] if len(types) > 1 else NO_TYPE)
+
+        return cls(
+            names=[record["name"].lower() for record in records],
+            ids=np.array([record["id"] for record in records], dtype=np.int32),
+            type1=np.array(type1, dtype=np.int8),
+            type2=np.array(type2, dtype=np.int8),
+            sprites=[record.get("sprite") for record in records],
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def record(self, row: int) -> Dict:
+        types = [ALL_TYPES[t] for t in (self.type1[row], self.type2[row]) if t >= 0]
+        return {
+            "name": self.names[row].title(),
+            "id": int(self.ids[row]),
+            "types": types,
+            "sprite": self.sprites[row],
+        }
+
+    @property
+    def records(self) -> List[Dict]:
+        if self._records is None:
+            self._records = [self.record(row) for row in range(len(self))]
+        return self._records
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Looks up a species by name or numeric id"""
+
+        name = name.lower()
+        if name.isdigit():
+            row = self.id_index.get(int(name))
+        else:
+            row = self.index.get(name)
+        return self.record(row) if row is not None else None
+
+    @property
+    def multipliers(self) -> np.ndarray:
+        """N species x 18 attacking types defensive multiplier matrix"""
+
+        if self._multipliers is None:
+            # Column NO_TYPE (-1) of the padded chart is all ones
+            padded = np.hstack([TYPE_CHART, np.ones((len(ALL_TYPES), 1))])
+            self._multipliers = (padded[:, self.type1] * padded[:, self.type2]).T
+        return self._multipliers
+
+
+def save_pokedex(pokedex: Pokedex, path: str = POKEDEX_PATH) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if path.endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(pokedex.records, f)
+        return
+
+    import pyarrow as pa
+
+    table = pa.table(
+        {
+            "name": pa.array(pokedex.names, type=pa.string()),
+            "id": pa.array(pokedex.ids, type=pa.int32()),
+            "type1": pa.array(pokedex.type1, type=pa.int8()),
+            "type2": pa.array(pokedex.type2, type=pa.int8()),
+            "sprite": pa.array(pokedex.sprites, type=pa.string()),
+        }
+    )
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def load_pokedex(path: str = POKEDEX_PATH) -> Pokedex:
+    """Loads a snapshot: memory-mapped Arrow IPC file or JSON record list"""
+
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return Pokedex.from_records(json.load(f))
+
+    import pyarrow as pa
+
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    # Fixed-width columns are zero-copy views into the mapped file
+    return Pokedex(
+        names=table.column("name").to_pylist(),
+        ids=table.column("id").to_numpy(),
+        type1=table.column("type1").to_numpy(),
+        type2=table.column("type2").to_numpy(),
+        sprites=table.column("sprite").to_pylist(),
+    )
+
+
+_local_pokedex = None
+_local_pokedex_loaded = False
+
+
+def get_local_pokedex() -> Optional[Pokedex]:
+    """
+    Process-wide snapshot from POKEDEX_PATH, or None when there isn't one.
+    The file is checked once; a missing snapshot isn't looked for again.
+    """
+
+    global _local_pokedex, _local_pokedex_loaded
+    if not _local_pokedex_loaded:
+        if os.path.exists(POKEDEX_PATH):
+            _local_pokedex = load_pokedex(POKEDEX_PATH)
+        _local_pokedex_loaded = True
+    return _local_pokedex
+
+
+def list_species(limit: Optional[int] = None) -> List[str]:
+    """Every Pokemon name PokeAPI knows about (including alternate forms)"""
+
+    response = pokeapi_client.get(
+        f"{POKEAPI_BASE_URL}/pokemon",
+        params={"limit": limit or 100000, "offset": 0},
+    )
+    response.raise_for_status()
+    return [entry["name"] for entry in response.json()["results"]]
+
+
+def sync_pokedex(path: str = POKEDEX_PATH, limit: Optional[int] = None) -> Pokedex:
+    """Downloads the full species list from PokeAPI and writes a snapshot"""
+
+    names = list_species(limit)
+    logger.info("📥 Syncing %d Pokemon from PokeAPI...", len(names))
+
+    def fetch(name: str) -> Optional[Dict]:
+        return get_pokemon_data(name, use_pokedex=False)
+
+    with ThreadPoolExecutor(max_workers=POKEAPI_MAX_WORKERS) as executor:
+        results = list(executor.map(fetch, names))
+
+    records = [record for record in results if record]
+    records.sort(key=lambda record: record["id"])
+
+    pokedex = Pokedex.from_records(records)
+    save_pokedex(pokedex, path)
+
+    logger.info("✅ Saved %d Pokemon to %s", len(pokedex), path)
+    return pokedex
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local Pokedex snapshot")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync = subparsers.add_parser("sync", help="Download every species from PokeAPI")
+    sync.add_argument("-o", "--output", default=POKEDEX_PATH)
+    sync.add_argument("--limit", type=int, help="Only sync the first N species")
+
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    if args.command == "sync":
+        sync_pokedex(args.output, args.limit)
+
+
+if __name__ == "__main__":
+    main()
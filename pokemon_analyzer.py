@@ -1,16 +1,134 @@
+import functools
+import hashlib
+import itertools
+import json
+import logging
+import numpy as np
 import requests
-from typing import Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Tuple
 import os
+import threading
+import time
 from dotenv import load_dotenv
-import openai
-from google import genai
-from google.genai import types
 
-load_dotenv()
+from ai_queue import BATCH, INTERACTIVE, AIJobQueue
+from cache import NEGATIVE, LRUCache, PersistentCache, SingleFlight
+from http_client import ResilientClient
+from metrics import (
+    POKEMON_LOOKUP_SECONDS,
+    STAGE_SECONDS,
+    configure_logging,
+    register_collector,
+    timed,
+)
+
+if TYPE_CHECKING:
+    from names import NameIndex
+    from pokedex import Pokedex
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
+load_dotenv()
 
-client = genai.Client()
+logger = logging.getLogger(__name__)
+
+# Gemini client, built on first use by get_genai_client(). The google.genai
+# stack is imported lazily so type analysis alone never pays for it (or
+# needs credentials). Assign a client here to override it, e.g. with a fake.
+client = None
+_client_lock = threading.Lock()
+
+
+def get_genai_client():
+    """Returns the shared Gemini client, creating it on first use"""
+
+    global client
+    if client is None:
+        with _client_lock:
+            if client is None:
+                from google import genai
+
+                client = genai.Client()
+    return client
+
+
+# PokeAPI response cache
+POKEAPI_CACHE_PATH = os.getenv("POKEAPI_CACHE_PATH", ".cache/pokeapi.sqlite3")
+POKEAPI_CACHE_TTL = float(os.getenv("POKEAPI_CACHE_TTL", 7 * 24 * 60 * 60))
+POKEAPI_NEGATIVE_CACHE_TTL = float(os.getenv("POKEAPI_NEGATIVE_CACHE_TTL", 60 * 60))
+POKEAPI_OFFLINE = os.getenv("POKEAPI_OFFLINE", "").lower() in ("1", "true", "yes")
+
+POKEMON_MEMORY_CACHE_MAX_ENTRIES = int(
+    os.getenv("POKEMON_MEMORY_CACHE_MAX_ENTRIES", 2048)
+)
+
+pokeapi_cache = PersistentCache(POKEAPI_CACHE_PATH, namespace="pokemon")
+# Move names per species, saved from the same /pokemon response
+# (see offensive_coverage.py)
+movepool_cache = PersistentCache(POKEAPI_CACHE_PATH, namespace="movepool")
+pokemon_memory_cache = LRUCache(max_entries=POKEMON_MEMORY_CACHE_MAX_ENTRIES)
+pokemon_single_flight = SingleFlight()
+
+# Process-wide cache of analyze_team results, shared by every app session
+TEAM_CACHE_MAX_ENTRIES = int(os.getenv("TEAM_CACHE_MAX_ENTRIES", 512))
+TEAM_CACHE_TTL = float(os.getenv("TEAM_CACHE_TTL", 60 * 60))
+
+team_analysis_cache = LRUCache(max_entries=TEAM_CACHE_MAX_ENTRIES, ttl=TEAM_CACHE_TTL)
+team_single_flight = SingleFlight()
+
+# Weakness analysis templates by sorted member type combinations (names are
+# bound per team), so repeated compositions skip the computation
+WEAKNESS_CACHE_MAX_ENTRIES = int(os.getenv("WEAKNESS_CACHE_MAX_ENTRIES", 4096))
+
+weakness_template_cache = LRUCache(max_entries=WEAKNESS_CACHE_MAX_ENTRIES)
+
+# Gemini recommendation cache: in-memory LRU in front of a persistent store
+AI_MODEL = os.getenv("AI_MODEL", "gemini-2.5-flash")
+AI_SYSTEM_INSTRUCTION = "You are an expert competitive Pokemon analyst with deep knowledge of type matchups, meta strategies, and team building."
+AI_ERROR_MESSAGE = "❌ Error getting AI recommendations: {error}\n\nPlease check your API key in the .env file."
+AI_CACHE_PATH = os.getenv("AI_CACHE_PATH", ".cache/ai.sqlite3")
+AI_CACHE_TTL = float(os.getenv("AI_CACHE_TTL", 24 * 60 * 60))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", 256))
+
+ai_memory_cache = LRUCache(max_entries=AI_CACHE_MAX_ENTRIES, ttl=AI_CACHE_TTL)
+ai_disk_cache = PersistentCache(AI_CACHE_PATH, namespace="ai")
+ai_single_flight = SingleFlight()
+
+# Every Gemini call except streaming goes through ai_job_queue: at most
+# AI_MAX_CONCURRENCY calls in flight, interactive requests ahead of batch
+# ones, and batch teams packed AI_BATCH_SIZE to a request
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", 4))
+AI_RATE_LIMIT = float(os.getenv("AI_RATE_LIMIT", 0))  # requests/s, 0 = off
+AI_RATE_BURST = float(os.getenv("AI_RATE_BURST", 5))
+AI_BATCH_SIZE = int(os.getenv("AI_BATCH_SIZE", 1))  # 1 = one team per request
+AI_BATCH_WAIT = float(os.getenv("AI_BATCH_WAIT", 0.05))
+AI_RETRIES = int(os.getenv("AI_RETRIES", 2))
+AI_TIMEOUT = float(os.getenv("AI_TIMEOUT", 60))
+
+# Shared HTTP session so team fetches reuse pooled keep-alive connections
+POKEAPI_BASE_URL = os.getenv("POKEAPI_BASE_URL", "https://pokeapi.co/api/v2")
+POKEAPI_TIMEOUT = float(os.getenv("POKEAPI_TIMEOUT", 10))
+POKEAPI_CONNECT_TIMEOUT = float(os.getenv("POKEAPI_CONNECT_TIMEOUT", 3))
+POKEAPI_MAX_WORKERS = int(os.getenv("POKEAPI_MAX_WORKERS", 6))
+
+# Outbound limits and failure handling shared by every PokeAPI request
+POKEAPI_MAX_CONCURRENCY = int(os.getenv("POKEAPI_MAX_CONCURRENCY", POKEAPI_MAX_WORKERS))
+POKEAPI_RATE_LIMIT = float(os.getenv("POKEAPI_RATE_LIMIT", 20))  # requests/s, 0 = off
+POKEAPI_RATE_BURST = float(os.getenv("POKEAPI_RATE_BURST", 50))
+POKEAPI_RETRIES = int(os.getenv("POKEAPI_RETRIES", 3))
+POKEAPI_BREAKER_THRESHOLD = int(os.getenv("POKEAPI_BREAKER_THRESHOLD", 5))
+POKEAPI_BREAKER_RESET = float(os.getenv("POKEAPI_BREAKER_RESET", 30))
+
+# Its pooled session is built on the first request
+pokeapi_client = ResilientClient(
+    name="pokeapi",
+    max_concurrency=POKEAPI_MAX_CONCURRENCY,
+    rate=POKEAPI_RATE_LIMIT,
+    burst=POKEAPI_RATE_BURST,
+    retries=POKEAPI_RETRIES,
+    timeout=(POKEAPI_CONNECT_TIMEOUT, POKEAPI_TIMEOUT),
+    failure_threshold=POKEAPI_BREAKER_THRESHOLD,
+    reset_timeout=POKEAPI_BREAKER_RESET,
+)
 
 
 # Pokemon Type Effectiveness Chart
@@ -124,15 +242,236 @@ TYPE_EFFECTIVENESS = {
 }
 
 
-def get_pokemon_data(name: str) -> Optional[Dict]:
+# Type chart compiled once into an 18x18 matrix: TYPE_CHART[attacking, defending]
+ALL_TYPES = list(TYPE_EFFECTIVENESS.keys())
+TYPE_INDEX = {type_name: i for i, type_name in enumerate(ALL_TYPES)}
+
+
+def _build_type_chart() -> np.ndarray:
+    chart = np.ones((len(ALL_TYPES), len(ALL_TYPES)), dtype=np.float64)
+
+    for attacking_type, attack_data in TYPE_EFFECTIVENESS.items():
+        row = TYPE_INDEX[attacking_type]
+        for defending_type, col in TYPE_INDEX.items():
+            # Same precedence as the original list checks
+            if defending_type in attack_data["no_effect"]:
+                chart[row, col] = 0.0
+            elif defending_type in attack_data["super_effective"]:
+                chart[row, col] = 2.0
+            elif defending_type in attack_data["not_very_effective"]:
+                chart[row, col] = 0.5
+
+    chart.setflags(write=False)
+    return chart
+
+
+TYPE_CHART = _build_type_chart()
+
+
+def get_defensive_multipliers(defending_types: List[str]) -> np.ndarray:
+    """Damage multiplier of every attacking type (in ALL_TYPES order) against a type combination"""
+
+    multipliers = np.ones(len(ALL_TYPES), dtype=np.float64)
+    for defending_type in defending_types:
+        col = TYPE_INDEX.get(defending_type)
+        if col is not None:
+            multipliers = multipliers * TYPE_CHART[:, col]
+    return multipliers
+
+
+
+class DefensiveProfile(NamedTuple):
+    """Precomputed defensive data for one type combination"""
+
+    types: Tuple[str, ...]
+    multipliers: np.ndarray  # 18 entries, ALL_TYPES order
+    critical_mask: int  # bit i set when ALL_TYPES[i] deals 4x+
+    vulnerable_mask: int  # 2x or more
+    resistant_mask: int  # 0.5x or less, but not immune
+    immune_mask: int  # 0x
+    # Set bits of the four masks as row * 18 + column (WeaknessTemplate.flags)
+    flag_offsets: Tuple[int, ...]
+
+
+def _mask(flags: np.ndarray) -> int:
+    mask = 0
+    for i in np.flatnonzero(flags):
+        mask |= 1 << int(i)
+    return mask
+
+
+def _flag_offsets(*masks: int) -> Tuple[int, ...]:
+    return tuple(
+        row * len(ALL_TYPES) + col
+        for row, mask in enumerate(masks)
+        for col in range(len(ALL_TYPES))
+        if mask >> col & 1
+    )
+
+
+def canonical_types(types: List[str]) -> Tuple[str, ...]:
+    """Sorted, de-duplicated key for a type combination (ALL_TYPES order)"""
+
+    return tuple(sorted(set(types), key=lambda t: TYPE_INDEX.get(t, len(TYPE_INDEX))))
+
+
+def _build_defensive_profile(types: Tuple[str, ...]) -> DefensiveProfile:
+    multipliers = get_defensive_multipliers(list(types))
+    multipliers.setflags(write=False)
+    immune = multipliers == 0.0
+    masks = (
+        _mask(multipliers >= 4.0),
+        _mask(multipliers >= 2.0),
+        _mask((multipliers <= 0.5) & ~immune),
+        _mask(immune),
+    )
+
+    return DefensiveProfile(types, multipliers, *masks, _flag_offsets(*masks))
+
+
+# All 18 single types + 153 dual types that can reach the damage calculation
+TYPE_COMBINATIONS = [(t,) for t in ALL_TYPES] + list(
+    itertools.combinations(ALL_TYPES, 2)
+)
+DEFENSIVE_PROFILES = {
+    combo: _build_defensive_profile(combo) for combo in TYPE_COMBINATIONS
+}
+
+
+# canonical_types of every ordering of a known combination, for hot paths
+CANONICAL_TYPES = {
+    ordering: combo
+    for combo in TYPE_COMBINATIONS
+    for ordering in itertools.permutations(combo)
+}
+
+
+def get_defensive_profile(types: List[str]) -> DefensiveProfile:
+    key = canonical_types(types)
+    profile = DEFENSIVE_PROFILES.get(key)
+    if profile is None:
+        # Unknown type names: build on the fly, unknown types count as neutral
+        profile = _build_defensive_profile(key)
+    return profile
+
+
+def _pokemon_cache_key(name: str) -> str:
+    # PokeAPI accepts both names and numeric ids, so entries are stored under both
+    return f"id:{int(name)}" if name.isdigit() else f"name:{name}"
+
+
+_local_lookups = None
+
+
+def _local_indexes() -> Tuple[Optional["NameIndex"], Optional["Pokedex"]]:
+    """
+    Local name index and Pokedex snapshot (either may be None), resolved on
+    the first lookup. Both modules import this one, hence the late import.
+    """
+
+    global _local_lookups
+    if _local_lookups is None:
+        from names import get_name_index
+        from pokedex import get_local_pokedex
+
+        _local_lookups = (get_name_index(), get_local_pokedex())
+    return _local_lookups
+
+
+def get_pokemon_data(
+    name: str, offline: Optional[bool] = None, use_pokedex: bool = True
+) -> Optional[Dict]:
+
+    return lookup_pokemon(name, offline, use_pokedex)[0]
+
+
+def lookup_pokemon(
+    name: str, offline: Optional[bool] = None, use_pokedex: bool = True
+) -> Tuple[Optional[Dict], str]:
+    """
+    get_pokemon_data plus where the answer came from: "name_index" (unknown
+    name), "pokedex", "memory", "disk", "negative" (cached 404), "offline"
+    (not cached), "network", "not_found" (404), "stale" (expired cache entry
+    served because PokeAPI is unreachable), "unavailable" (unreachable and
+    nothing cached) or "error". The latency is recorded per source.
+    """
+
+    start = time.perf_counter()
+    pokemon_info, source = _lookup_pokemon(name, offline, use_pokedex)
+    elapsed = time.perf_counter() - start
+    POKEMON_LOOKUP_SECONDS.observe(elapsed, source)
+    logger.debug(
+        "Pokemon lookup",
+        extra={"pokemon": name, "source": source, "seconds": round(elapsed, 6)},
+    )
+    return pokemon_info, source
+
+
+def _lookup_pokemon(
+    name: str, offline: Optional[bool], use_pokedex: bool
+) -> Tuple[Optional[Dict], str]:
 
     name = name.lower()
 
-    url = f"https://pokeapi.co/api/v2/pokemon/{name}"
+    if offline is None:
+        offline = POKEAPI_OFFLINE
+
+    name_index, pokedex = _local_indexes() if use_pokedex else (None, None)
+
+    if name_index is not None and not name.isdigit():
+        # Canonical API slug from the local name index ("Mr. Mime" -> "mr-mime");
+        # names it doesn't know would only 404, so they never reach PokeAPI
+        slug = name_index.resolve(name)
+        if slug is None:
+            logger.warning("Pokemon %s not found (name index)", name)
+            return None, "name_index"
+        name = slug
+
+    if pokedex is not None:
+        # Local snapshot built with `python pokedex.py sync`
+        pokemon_info = pokedex.get(name)
+        if pokemon_info is not None:
+            return pokemon_info, "pokedex"
+
+    cache_key = _pokemon_cache_key(name)
+
+    # Process-wide memory cache first, then the on-disk cache
+    source = "memory"
+    cached = pokemon_memory_cache.get(cache_key)
+    if cached is None:
+        source = "disk"
+        cached, ttl = pokeapi_cache.get_with_ttl(cache_key)
+        if cached is not None:
+            # The memory copy expires with the disk entry
+            pokemon_memory_cache.set(cache_key, cached, ttl)
+
+    if cached == NEGATIVE:
+        logger.warning("Pokemon %s not found (cached)", name)
+        return None, "negative"
+
+    if cached is not None:
+        return cached, source
+
+    if offline:
+        logger.warning("Pokemon %s not in local cache (offline mode)", name)
+        return None, "offline"
+
+    # Concurrent lookups of the same Pokemon share one request
+    return pokemon_single_flight.do(cache_key, lambda: _fetch_pokemon(name, cache_key))
+
+
+def _store_pokemon(key: str, value: Dict, ttl: float) -> None:
+    pokemon_memory_cache.set(key, value, ttl)
+    pokeapi_cache.set(key, value, ttl)
+
+
+def _fetch_pokemon(name: str, cache_key: str) -> Tuple[Optional[Dict], str]:
+
+    url = f"{POKEAPI_BASE_URL}/pokemon/{name}"
 
     try:
 
-        response = requests.get(url, timeout=10)
+        response = pokeapi_client.get(url)
 
         if response.status_code == 200:
             data = response.json()
@@ -144,28 +483,143 @@ def get_pokemon_data(name: str) -> Optional[Dict]:
                 "sprite": data["sprites"]["front_default"],
             }
 
-            return pokemon_info
+            _store_pokemon(f"name:{data['name']}", pokemon_info, POKEAPI_CACHE_TTL)
+            if "moves" in data:
+                movepool_cache.set(
+                    f"name:{data['name']}",
+                    [move_info["move"]["name"] for move_info in data["moves"]],
+                    POKEAPI_CACHE_TTL,
+                )
+            _store_pokemon(f"id:{data['id']}", pokemon_info, POKEAPI_CACHE_TTL)
+            if cache_key not in (f"name:{data['name']}", f"id:{data['id']}"):
+                _store_pokemon(cache_key, pokemon_info, POKEAPI_CACHE_TTL)
+
+            return pokemon_info, "network"
+
+        elif response.status_code == 404:
+
+            _store_pokemon(cache_key, NEGATIVE, POKEAPI_NEGATIVE_CACHE_TTL)
+            logger.warning(
+                "Pokemon %s not found", name, extra={"pokemon": name, "status": 404}
+            )
+            return None, "not_found"
 
         else:
 
-            print(f"Pokemon {name} not found")
-            return None
+            # Still failing after retries (429/5xx) or an unexpected answer
+            logger.error(
+                "PokeApi answered %s for %s",
+                response.status_code,
+                name,
+                extra={"pokemon": name, "status": response.status_code},
+            )
+            return _stale_pokemon(name, cache_key)
+
     except requests.exceptions.RequestException as e:
 
-        print(f"Error connecting to PokeApi: {e}")
-        return None
+        logger.error("Error connecting to PokeApi: %s", e, extra={"pokemon": name})
+        return _stale_pokemon(name, cache_key)
 
     except KeyError as e:
-        print(f"Error parsign Pokemon data: {e}")
+        logger.error("Error parsign Pokemon data: %s", e)
+        return None, "error"
+
+
+def _stale_pokemon(name: str, cache_key: str) -> Tuple[Optional[Dict], str]:
+    # PokeAPI is unreachable: an expired copy beats failing the lookup
+    stale = pokeapi_cache.get_stale(cache_key)
+    if stale is None or stale == NEGATIVE:
+        return None, "unavailable"
+
+    logger.warning("Serving cached (expired) data for %s", name)
+    return stale, "stale"
+
+
+_prefetch_executor = None
+_prefetch_lock = threading.Lock()
+_prefetching = {}
+
+
+def prefetch_pokemon(name: str) -> Optional[Future]:
+    """
+    Resolves a Pokemon in the background so a later get_pokemon_data call is a
+    cache hit (or joins the request still in flight). Returns the future, or
+    None for blank names.
+    """
+
+    global _prefetch_executor
+
+    name = name.strip().lower()
+    if not name:
         return None
 
+    with _prefetch_lock:
+        future = _prefetching.get(name)
+        if future is not None:
+            return future
 
-def get_team_data(pokemon_list: List[str]) -> Dict:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=POKEAPI_MAX_WORKERS, thread_name_prefix="prefetch"
+            )
+
+        future = _prefetch_executor.submit(get_pokemon_data, name)
+        _prefetching[name] = future
+
+    def done(_: Future) -> None:
+        with _prefetch_lock:
+            if _prefetching.get(name) is future:
+                del _prefetching[name]
+
+    future.add_done_callback(done)
+    return future
+
+
+def get_pokemon_cache_stats() -> Dict:
+    stats = pokeapi_cache.stats.as_dict()
+    stats["entries"] = len(pokeapi_cache)
+    stats["offline"] = POKEAPI_OFFLINE
+    stats["memory"] = pokemon_memory_cache.as_dict()
+    stats["single_flight"] = pokemon_single_flight.as_dict()
+    return stats
+
+
+def get_team_data(
+    pokemon_list: List[str], lookups: Optional[Dict[str, int]] = None
+) -> Dict:
+    """
+    Fetches every member concurrently. When lookups is given, it is filled
+    with how many members came from each lookup_pokemon source.
+    """
 
     if len(pokemon_list) > 6:
-        print("Error: Pokemon teams should have maximum 6 members")
+        logger.error("Error: Pokemon teams should have maximum 6 members")
         return None
 
+    logger.info("Analyzing team of %d Pokemon...", len(pokemon_list))
+
+    for i, pokemon in enumerate(pokemon_list, 1):
+        logger.info("%d.- Fetching data of %s...", i, pokemon)
+
+    # Fetch all members at once; results come back in team order
+    results = []
+    if pokemon_list:
+        workers = min(POKEAPI_MAX_WORKERS, len(pokemon_list))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            looked_up = list(executor.map(lookup_pokemon, pokemon_list))
+        results = [pokemon_info for pokemon_info, _ in looked_up]
+        if lookups is not None:
+            for _, source in looked_up:
+                lookups[source] = lookups.get(source, 0) + 1
+
+    return build_team_data(pokemon_list, results)
+
+
+def build_team_data(
+    pokemon_list: List[str], results: List[Optional[Dict]], verbose: bool = True
+) -> Dict:
+    """Assembles the team dict from already resolved get_pokemon_data results"""
+
     team_data = {
         "team_members": [],
         "all_types": [],
@@ -173,25 +627,21 @@ def get_team_data(pokemon_list: List[str]) -> Dict:
         "failed_pokemon": [],
     }
 
-    print(f"Analyzing team of {len(pokemon_list)} Pokemon...")
-
-    for i, pokemon in enumerate(pokemon_list, 1):
-        print(f"{i}.- Fetching data of {pokemon}...")
-
-        pokemon_data = get_pokemon_data(pokemon)
-
+    for pokemon, pokemon_data in zip(pokemon_list, results):
         if pokemon_data:
             team_data["team_members"].append(pokemon_data)
             team_data["all_types"].extend(pokemon_data["types"])
             team_data["success_count"] += 1
 
-            print(f"{pokemon_data['name']} data obtained!")
+            if verbose:
+                logger.info("%s data obtained!", pokemon_data["name"])
         else:
             team_data["failed_pokemon"].append(pokemon)
-            print(f"{pokemon} data not found!")
+            if verbose:
+                logger.info("%s data not found!", pokemon)
 
-        team_data["unique_types"] = list(set(team_data["all_types"]))
-        team_data["type_coverage"] = len(team_data["unique_types"])
+    team_data["unique_types"] = list(set(team_data["all_types"]))
+    team_data["type_coverage"] = len(team_data["unique_types"])
 
     return team_data
 
@@ -200,21 +650,17 @@ def calculate_damage_multiplier(
     attacking_type: str, defending_types: List[str]
 ) -> float:
 
-    if attacking_type not in TYPE_EFFECTIVENESS:
+    row = TYPE_INDEX.get(attacking_type)
+    if row is None:
         return 1.0
 
     multiplier = 1.0
-    attack_data = TYPE_EFFECTIVENESS[attacking_type]
-
     for defending_type in defending_types:
-        if defending_type in attack_data["no_effect"]:
-            multiplier *= 0
-        elif defending_type in attack_data["super_effective"]:
-            multiplier *= 2
-        elif defending_type in attack_data["not_very_effective"]:
-            multiplier *= 0.5
+        col = TYPE_INDEX.get(defending_type)
+        if col is not None:
+            multiplier *= TYPE_CHART[row, col]
 
-    return multiplier
+    return float(multiplier)
 
 
 
@@ -243,7 +689,8 @@ def display_team_summary(team_data: Dict) -> None:
 
 
 
-def get_ai_team_recommendations(team_data: Dict, weakness_analysis: Dict) -> Optional[str]:
+def _ai_team_section(team_data: Dict, weakness_analysis: Dict) -> str:
+    """The team-specific part of a prompt: members and top weaknesses"""
 
     # Step 1: Prepare team information for the prompt
     team_summary = []
@@ -264,26 +711,17 @@ def get_ai_team_recommendations(team_data: Dict, weakness_analysis: Dict) -> Opt
             f"{weakness['type']} (threatens {', '.join(weakness['vulnerable_pokemon'])})"
         )
 
-    immunities = []
-    for immunity in weakness_analysis["immunities"][:3]:
-        immunities.append(
-            f"{immunity['type']} (immune: {', '.join(immunity['immune_pokemon'])})"
-        )
-
-    prompt = f"""You are an expert competitive Pokemon analyst. Analyze this team and provide strategic recommendations as well as recommended items for each Pokemon.
-
-CURRENT TEAM:
+    return f"""CURRENT TEAM:
 {chr(10).join([f"• {pokemon}" for pokemon in team_summary])}
 
 CRITICAL WEAKNESSES (4x damage):
 {chr(10).join([f"• {weakness}" for weakness in critical_weaknesses]) if critical_weaknesses else "• None"}
 
 MAJOR WEAKNESSES (multiple vulnerable Pokemon):
-{chr(10).join([f"• {weakness}" for weakness in major_weaknesses]) if major_weaknesses else "• None"}
+{chr(10).join([f"• {weakness}" for weakness in major_weaknesses]) if major_weaknesses else "• None"}"""
 
-Provide strategic analysis in this format:
 
-## TEAM EVALUATION
+AI_RESPONSE_FORMAT = """## TEAM EVALUATION
 [2-3 sentences about overall balance and playstyle]
 
 ## TOP 3 THREATS  
@@ -301,106 +739,491 @@ Provide strategic analysis in this format:
 
 Be specific to this composition. Focus on competitive viability."""
 
+
+def build_ai_prompt(team_data: Dict, weakness_analysis: Dict) -> str:
+
+    prompt = f"""You are an expert competitive Pokemon analyst. Analyze this team and provide strategic recommendations as well as recommended items for each Pokemon.
+
+{_ai_team_section(team_data, weakness_analysis)}
+
+Provide strategic analysis in this format:
+
+{AI_RESPONSE_FORMAT}"""
+
+    return prompt
+
+
+# Structured output for packed prompts: one entry per numbered team
+AI_PACKED_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "id": {"type": "STRING"},
+            "recommendations": {"type": "STRING"},
+        },
+        "required": ["id", "recommendations"],
+    },
+}
+
+
+def build_packed_ai_prompt(analyses: List[Tuple[Dict, Dict]]) -> str:
+    """One prompt for several (team_data, weakness_analysis) pairs, numbered from 1"""
+
+    teams = "\n\n".join(
+        f"### TEAM {i}\n{_ai_team_section(team_data, weakness_analysis)}"
+        for i, (team_data, weakness_analysis) in enumerate(analyses, 1)
+    )
+
+    return f"""You are an expert competitive Pokemon analyst. Analyze each of the {len(analyses)} teams below on its own and provide strategic recommendations as well as recommended items for each Pokemon.
+
+{teams}
+
+Answer with one entry per team: the team number as "id" and, as "recommendations", the analysis of that team in this format:
+
+{AI_RESPONSE_FORMAT}"""
+
+
+def split_packed_response(text: str, count: int) -> Dict[int, str]:
+    """
+    Recommendations by team index (0-based) from a packed JSON answer.
+    Malformed or missing entries are left out.
+    """
+
     try:
-        # Step 4: Call Gemini
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
+        entries = json.loads(text)
+    except (TypeError, ValueError):
+        return {}
+    if not isinstance(entries, list):
+        return {}
+
+    recommendations = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get("id")) - 1
+        except (TypeError, ValueError):
+            continue
+        text = entry.get("recommendations")
+        if 0 <= index < count and isinstance(text, str) and text.strip():
+            recommendations[index] = text
+    return recommendations
+
+
+def ai_team_signature(
+    team_data: Dict, weakness_analysis: Dict, model: str = AI_MODEL
+) -> str:
+    """Order-independent cache key for everything that goes into the AI prompt"""
+
+    def threat_key(threat: Dict, names_field: str) -> List:
+        return [threat["type"], sorted(threat[names_field])]
+
+    signature = {
+        "model": model,
+        "team": sorted(
+            [pokemon["name"], sorted(pokemon["types"])]
+            for pokemon in team_data["team_members"]
+        ),
+        "critical": [
+            threat_key(w, "critical_pokemon")
+            for w in weakness_analysis["critical_weaknesses"][:3]
+        ],
+        "major": [
+            threat_key(w, "vulnerable_pokemon")
+            for w in weakness_analysis["major_weaknesses"][:3]
+        ],
+    }
+    encoded = json.dumps(signature, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _cached_recommendations(key: str) -> Optional[str]:
+    cached = ai_memory_cache.get(key)
+    if cached is None:
+        cached = ai_disk_cache.get(key)
+        if cached is not None:
+            ai_memory_cache.set(key, cached)
+    return cached
+
+
+def _store_recommendations(key: str, recommendations: str) -> None:
+    ai_memory_cache.set(key, recommendations)
+    ai_disk_cache.set(key, recommendations, AI_CACHE_TTL)
+
+
+def _ai_config(**kwargs):
+    from google.genai import types
+
+    return types.GenerateContentConfig(
+        system_instruction=AI_SYSTEM_INSTRUCTION,
+        http_options=types.HttpOptions(timeout=int(AI_TIMEOUT * 1000)),
+        **kwargs,
+    )
+
+
+def _generate_text(request: Tuple[Dict, Dict], model_client) -> str:
+    # AI job queue: one (team_data, weakness_analysis) per Gemini call
+    model_client = model_client or get_genai_client()
+    response = model_client.models.generate_content(
+        model=AI_MODEL, config=_ai_config(), contents=build_ai_prompt(*request)
+    )
+    return response.text
+
+
+def _generate_packed_text(
+    requests_by_key: Dict[str, Tuple[Dict, Dict]], model_client
+) -> Dict[str, str]:
+    # AI job queue: several teams in one structured-output call
+    keys = list(requests_by_key)
+    model_client = model_client or get_genai_client()
+    response = model_client.models.generate_content(
+        model=AI_MODEL,
+        config=_ai_config(
+            response_mime_type="application/json", response_schema=AI_PACKED_SCHEMA
+        ),
+        contents=build_packed_ai_prompt([requests_by_key[key] for key in keys]),
+    )
+    return {
+        keys[index]: text
+        for index, text in split_packed_response(response.text, len(keys)).items()
+    }
+
+
+ai_job_queue = AIJobQueue(
+    _generate_text,
+    _generate_packed_text,
+    name="gemini",
+    max_concurrency=AI_MAX_CONCURRENCY,
+    batch_size=AI_BATCH_SIZE,
+    batch_wait=AI_BATCH_WAIT,
+    retries=AI_RETRIES,
+    timeout=AI_TIMEOUT,
+    rate=AI_RATE_LIMIT,
+    burst=AI_RATE_BURST,
+)
+
+
+def _generate_recommendations(
+    key: str, team_data: Dict, weakness_analysis: Dict, model_client, priority: int
+) -> Tuple[str, str]:
+    cached = ai_disk_cache.get(key)
+    if cached is not None:
+        return cached, "disk"
+
+    # Step 4: Call Gemini (through the job queue)
+    recommendations = ai_job_queue.submit(
+        key, (team_data, weakness_analysis), priority, model_client
+    ).result()
+
+    ai_disk_cache.set(key, recommendations, AI_CACHE_TTL)
+    return recommendations, "generated"
+
+
+def get_ai_team_recommendations(
+    team_data: Dict,
+    weakness_analysis: Dict,
+    model_client=None,
+    priority: int = INTERACTIVE,
+) -> Optional[str]:
+
+    return _ai_team_recommendations(
+        team_data, weakness_analysis, model_client, priority
+    )[0]
+
+
+def _ai_team_recommendations(
+    team_data: Dict,
+    weakness_analysis: Dict,
+    model_client=None,
+    priority: int = INTERACTIVE,
+) -> Tuple[str, str]:
+    # (recommendations, source): "memory", "disk", "generated" or "error"
+
+    key = ai_team_signature(team_data, weakness_analysis)
+    cached = ai_memory_cache.get(key)
+    if cached is not None:
+        return cached, "memory"
+
+    try:
+        # Identical requests already queued share one Gemini call (and an
+        # interactive one moves a queued batch request ahead)
+        recommendations, source = _generate_recommendations(
+            key, team_data, weakness_analysis, model_client, priority
+        )
+        ai_memory_cache.set(key, recommendations)
+        return recommendations, source
+
+    except Exception as e:
+        logger.error("Error getting AI recommendations: %s", e)
+        return AI_ERROR_MESSAGE.format(error=str(e)), "error"
+
+
+def get_ai_recommendations_many(
+    analyses: List[Tuple[Dict, Dict]],
+    model_client=None,
+    priority: int = BATCH,
+    batch_size: Optional[int] = None,
+) -> List[Tuple[str, str]]:
+    """
+    (recommendations, source) for each (team_data, weakness_analysis) pair.
+
+    Every cache miss is queued at once, so with a batch_size (default
+    AI_BATCH_SIZE) above 1 they are packed into shared Gemini requests. A
+    team that still fails after its retries gets the error message, without
+    affecting the others.
+    """
+
+    results: List[Optional[Tuple[str, str]]] = [None] * len(analyses)
+    pending = []
+
+    for i, (team_data, weakness_analysis) in enumerate(analyses):
+        key = ai_team_signature(team_data, weakness_analysis)
+        cached = ai_memory_cache.get(key)
+        if cached is not None:
+            results[i] = (cached, "memory")
+            continue
+        cached = ai_disk_cache.get(key)
+        if cached is not None:
+            ai_memory_cache.set(key, cached)
+            results[i] = (cached, "disk")
+            continue
+
+        future = ai_job_queue.submit(
+            key, (team_data, weakness_analysis), priority, model_client, batch_size
+        )
+        pending.append((i, key, future))
+
+    for i, key, future in pending:
+        try:
+            recommendations = future.result()
+        except Exception as e:
+            logger.error("Error getting AI recommendations: %s", e)
+            results[i] = (AI_ERROR_MESSAGE.format(error=str(e)), "error")
+            continue
+        _store_recommendations(key, recommendations)
+        results[i] = (recommendations, "generated")
+
+    return results
+
+
+def stream_ai_team_recommendations(
+    team_data: Dict, weakness_analysis: Dict, model_client=None
+) -> Iterator[str]:
+    """
+    Same as get_ai_team_recommendations, but yields the text as Gemini
+    produces it. Cached recommendations are yielded in one piece.
+    """
+
+    key = ai_team_signature(team_data, weakness_analysis)
+    cached = _cached_recommendations(key)
+    if cached is not None:
+        yield cached
+        return
+
+    # Someone is already generating this exact answer: wait for it instead
+    call, leader = ai_single_flight.begin(key)
+    if not leader:
+        try:
+            yield ai_single_flight.wait(call)
+        except Exception as e:
+            yield AI_ERROR_MESSAGE.format(error=str(e))
+        return
+
+    prompt = build_ai_prompt(team_data, weakness_analysis)
+    chunks = []
+
+    try:
+        from google.genai import types
+
+        model_client = model_client or get_genai_client()
+        stream = model_client.models.generate_content_stream(
+            model=AI_MODEL,
             config=types.GenerateContentConfig(
-                system_instruction="You are an expert competitive Pokemon analyst with deep knowledge of type matchups, meta strategies, and team building."
+                system_instruction=AI_SYSTEM_INSTRUCTION
             ),
             contents=prompt,
         )
-
-        return response.text
+        for chunk in stream:
+            if chunk.text:
+                chunks.append(chunk.text)
+                yield chunk.text
 
     except Exception as e:
-        return f"❌ Error getting AI recommendations: {str(e)}\n\nPlease check your API key in the .env file."
+        ai_single_flight.finish(key, call, error=e)
+        yield AI_ERROR_MESSAGE.format(error=str(e))
+        return
 
+    except GeneratorExit:
+        # The consumer went away mid-stream; release anyone waiting on us
+        ai_single_flight.finish(key, call, error=RuntimeError("stream cancelled"))
+        raise
 
-def analyze_team_weaknesses(team_data: Dict) -> Dict:
-    all_types = [
-        "normal",
-        "fire",
-        "water",
-        "electric",
-        "grass",
-        "ice",
-        "fighting",
-        "poison",
-        "ground",
-        "flying",
-        "psychic",
-        "bug",
-        "rock",
-        "ghost",
-        "dragon",
-        "dark",
-        "steel",
-        "fairy",
-    ]
+    recommendations = "".join(chunks)
+    _store_recommendations(key, recommendations)
+    ai_single_flight.finish(key, call, result=recommendations)
 
-    weakness_analysis = {
-        "critical_weaknesses": [],  # Types that deal 4x+ damage to someone
-        "major_weaknesses": [],  # Types that deal 2x damage to multiple members
-        "minor_weaknesses": [],  # Types that deal 2x damage to few members
-        "resistances": [],  # Types we deal 0.5x or less damage to
-        "immunities": [],  # Types that deal no damage to us (0x)
-        "team_coverage": {},  # How vulnerable each Pokemon is
-        "type_threat_level": {},  # How dangerous each type is for the team
+
+def get_ai_cache_stats() -> Dict:
+    return {
+        "memory": ai_memory_cache.as_dict(),
+        "disk": {**ai_disk_cache.stats.as_dict(), "entries": len(ai_disk_cache)},
+        "single_flight": ai_single_flight.as_dict(),
     }
 
-    for attacking_type in all_types:
-        vulnerable_pokemon = []
-        critical_pokemon = []
-        resistant_pokemon = []
-        immune_pokemon = []
 
-        for pokemon in team_data["team_members"]:
-            multiplier = calculate_damage_multiplier(attacking_type, pokemon["types"])
-
-            if multiplier >= 4.0:
-                critical_pokemon.append(pokemon["name"])
-                vulnerable_pokemon.append(pokemon["name"])
-            elif multiplier >= 2.0:
-                vulnerable_pokemon.append(pokemon["name"])
-            elif multiplier == 0.0:
-                immune_pokemon.append(pokemon["name"])
-            elif multiplier <= 0.5:
-                resistant_pokemon.append(pokemon["name"])
-
-        threat_info = {
-            "type": attacking_type,
-            "vulnerable_count": len(vulnerable_pokemon),
-            "critical_count": len(critical_pokemon),
-            "vulnerable_pokemon": vulnerable_pokemon,
-            "critical_pokemon": critical_pokemon,
-            "resistant_pokemon": resistant_pokemon,
-            "immune_pokemon": immune_pokemon,
-        }
-
-        weakness_analysis["type_threat_level"][attacking_type] = threat_info
-
-        if critical_pokemon:
-            weakness_analysis["critical_weaknesses"].append(threat_info)
-        elif len(vulnerable_pokemon) >= 2:
-            weakness_analysis["major_weaknesses"].append(threat_info)
-        elif len(vulnerable_pokemon) >= 1:
-            weakness_analysis["minor_weaknesses"].append(threat_info)
-
-        if resistant_pokemon or immune_pokemon:
-            weakness_analysis["resistances"].append(threat_info)
-
-        if immune_pokemon:
-            weakness_analysis["immunities"].append(threat_info)
-
-    weakness_analysis["critical_weaknesses"].sort(
-        key=lambda x: x["critical_count"], reverse=True
-    )
-    weakness_analysis["major_weaknesses"].sort(
-        key=lambda x: x["vulnerable_count"], reverse=True
+class WeaknessTemplate(NamedTuple):
+    """
+    Name-free weakness analysis of a multiset of type combinations. Slots
+    are the members in canonical (sorted) order; names are bound in later by
+    bind_weakness_template.
+    """
+
+    slots: Tuple[Tuple[str, ...], ...]  # canonical type combination per slot
+    # 4 x 18 slot bitmasks: critical, vulnerable, resistant, immune rows by
+    # attacking type. Plain ints, so teams of any size fit
+    flags: Tuple[int, ...]
+    # (critical, vulnerable, resistant, immune) slot bitmasks per attacking type
+    columns: Tuple[Tuple[int, int, int, int], ...]
+    mask_slots: Dict[int, Tuple[int, ...]]  # slots in each distinct flags value
+    # Attacking type columns per category, in analyze_team_weaknesses order
+    critical: Tuple[int, ...]
+    major: Tuple[int, ...]
+    minor: Tuple[int, ...]
+    resistances: Tuple[int, ...]
+    immunities: Tuple[int, ...]
+
+
+@functools.lru_cache(maxsize=4096)
+def _mask_bits(mask: int) -> Tuple[int, ...]:
+    # Set bit positions, lowest first; team masks repeat endlessly
+    return tuple(bit for bit in range(mask.bit_length()) if mask >> bit & 1)
+
+
+def _build_weakness_template(slots: Tuple[Tuple[str, ...], ...]) -> WeaknessTemplate:
+    size = len(ALL_TYPES)
+    flags = [0] * (4 * size)
+
+    for slot, types in enumerate(slots):
+        profile = DEFENSIVE_PROFILES.get(types) or get_defensive_profile(list(types))
+        bit = 1 << slot
+        for offset in profile.flag_offsets:
+            flags[offset] |= bit
+
+    critical = flags[0:size]
+    vulnerable = flags[size : 2 * size]
+    resistant = flags[2 * size : 3 * size]
+    immune = flags[3 * size : 4 * size]
+    vulnerable_counts = [len(_mask_bits(mask)) for mask in vulnerable]
+    critical_cols = [col for col in range(size) if critical[col]]
+    other_cols = [col for col in range(size) if not critical[col]]
+
+    return WeaknessTemplate(
+        slots=slots,
+        flags=tuple(flags),
+        columns=tuple(zip(critical, vulnerable, resistant, immune)),
+        mask_slots={mask: _mask_bits(mask) for mask in set(flags)},
+        critical=tuple(
+            sorted(
+                critical_cols,
+                key=lambda col: len(_mask_bits(critical[col])),
+                reverse=True,
+            )
+        ),
+        major=tuple(
+            sorted(
+                (col for col in other_cols if vulnerable_counts[col] >= 2),
+                key=vulnerable_counts.__getitem__,
+                reverse=True,
+            )
+        ),
+        minor=tuple(col for col in other_cols if vulnerable_counts[col] == 1),
+        resistances=tuple(col for col in range(size) if resistant[col] or immune[col]),
+        immunities=tuple(col for col in range(size) if immune[col]),
     )
 
-    return weakness_analysis
+
+def get_weakness_template(
+    member_types: List[List[str]],
+) -> Tuple[WeaknessTemplate, Tuple[int, ...]]:
+    """
+    The memoized template for a team's types, and the member position of
+    each template slot. Teams made of the same type combinations, in any
+    order and with any names, share one template.
+    """
+
+    combos = [
+        CANONICAL_TYPES.get(tuple(types)) or canonical_types(types)
+        for types in member_types
+    ]
+    order = tuple(sorted(range(len(combos)), key=combos.__getitem__))
+    key = tuple(combos[position] for position in order)
+
+    template = weakness_template_cache.get(key)
+    if template is None:
+        template = _build_weakness_template(key)
+        weakness_template_cache.set(key, template)
+    return template, order
+
+
+def bind_weakness_template(
+    template: WeaknessTemplate, order: Tuple[int, ...], names: List[str]
+) -> Dict:
+    """The analyze_team_weaknesses dictionary for members named names"""
+
+    # Names per distinct slot mask, back in member order
+    bound = {
+        mask: [names[position] for position in sorted([order[slot] for slot in slots])]
+        for mask, slots in template.mask_slots.items()
+    }
+
+    threats = []
+    for attacking_type, (critical, vulnerable, resistant, immune) in zip(
+        ALL_TYPES, template.columns
+    ):
+        vulnerable = bound[vulnerable][:]
+        critical = bound[critical][:]
+        threats.append(
+            {
+                "type": attacking_type,
+                "vulnerable_count": len(vulnerable),
+                "critical_count": len(critical),
+                "vulnerable_pokemon": vulnerable,
+                "critical_pokemon": critical,
+                "resistant_pokemon": bound[resistant][:],
+                "immune_pokemon": bound[immune][:],
+            }
+        )
+
+    return {
+        "critical_weaknesses": [threats[col] for col in template.critical],
+        "major_weaknesses": [threats[col] for col in template.major],
+        "minor_weaknesses": [threats[col] for col in template.minor],
+        "resistances": [threats[col] for col in template.resistances],
+        "immunities": [threats[col] for col in template.immunities],
+        "team_coverage": {},
+        "type_threat_level": {threat["type"]: threat for threat in threats},
+    }
+
+
+def get_weakness_cache_stats() -> Dict:
+    return weakness_template_cache.as_dict()
+
+
+def analyze_team_weaknesses(team_data: Dict) -> Dict:
+    """
+    Critical (4x+), major (2x on several members) and minor weaknesses,
+    resistances, immunities and the threat level of every attacking type.
+
+    The numbers come from a template memoized per multiset of member type
+    combinations; only the names are filled in per team.
+    """
+
+    members = team_data["team_members"]
+    template, order = get_weakness_template([pokemon["types"] for pokemon in members])
+    return bind_weakness_template(
+        template, order, [pokemon["name"] for pokemon in members]
+    )
 
 
 def display_weakness_analysis(weakness_analysis: Dict) -> None:
@@ -446,48 +1269,141 @@ def display_weakness_analysis(weakness_analysis: Dict) -> None:
     print("\n" + "=" * 60)
 
 
-def analyze_complete_team(pokemon_list: List[str]) -> Dict:
+def analyze_team(pokemon_list: List[str]) -> Dict:
     """
-    Complete team analysis: data + weaknesses + AI recommendations
+    Team data + weaknesses, without the (slow) AI stage
 
     Args:
         pokemon_list: List of Pokemon names
 
     Returns:
-        Dictionary with complete analysis
+        Dictionary shaped like analyze_complete_team's, with
+        ai_recommendations set to None
     """
 
-    print("🔍 Starting complete team analysis...")
+    # Seconds per stage and members per lookup_pokemon source
+    metrics = {"timings": {}, "pokemon_lookups": {}}
 
     # Step 1: Get team data
-    team_data = get_team_data(pokemon_list)
+    with timed("fetch", metrics["timings"]):
+        team_data = get_team_data(pokemon_list, metrics["pokemon_lookups"])
 
     if team_data["success_count"] == 0:
-        return {"success": False, "error": "No valid Pokemon found in the team"}
+        if metrics["pokemon_lookups"].get("unavailable"):
+            error = "PokeAPI is unavailable right now, please try again later"
+        else:
+            error = "No valid Pokemon found in the team"
+        return {"success": False, "error": error, "metrics": metrics}
 
     # Step 2: Analyze weaknesses
-    print("⚡ Calculating type effectiveness...")
-    weakness_analysis = analyze_team_weaknesses(team_data)
+    logger.info("⚡ Calculating type effectiveness...")
+    with timed("analysis", metrics["timings"]):
+        weakness_analysis = analyze_team_weaknesses(team_data)
 
-    # Step 3: Get AI recommendations
-    print("🤖 Getting AI recommendations...")
-    ai_recommendations = get_ai_team_recommendations(team_data, weakness_analysis)
+    logger.info("Team analyzed", extra=metrics)
 
-    # Step 4: Compile complete result
-    complete_analysis = {
+    return {
         "success": True,
         "team_data": team_data,
         "weakness_analysis": weakness_analysis,
-        "ai_recommendations": ai_recommendations,
+        "ai_recommendations": None,
         "summary": {
             "team_size": team_data["success_count"],
             "type_coverage": team_data["type_coverage"],
             "critical_weaknesses_count": len(weakness_analysis["critical_weaknesses"]),
             "major_weaknesses_count": len(weakness_analysis["major_weaknesses"]),
         },
+        "metrics": metrics,
     }
 
-    print("✅ Complete analysis finished!")
+
+def team_cache_key(pokemon_list: List[str]) -> Tuple[str, ...]:
+    return tuple(name.strip().lower() for name in pokemon_list)
+
+
+def get_cached_team_analysis(pokemon_list: List[str]) -> Dict:
+    """
+    analyze_team behind a process-wide LRU. Identical teams requested at the
+    same time (e.g. from several app sessions) are analyzed once.
+    Only successful analyses without failed lookups are cached, in the
+    compact models.TeamAnalysis form.
+    """
+
+    from models import TeamAnalysis
+
+    key = team_cache_key(pokemon_list)
+    cached = team_analysis_cache.get(key)
+    if cached is not None:
+        result = cached.to_result()
+        result["metrics"] = {"timings": {}, "pokemon_lookups": {}, "team_cache": "hit"}
+        return result
+
+    def compute() -> Dict:
+        result = analyze_team(pokemon_list)
+        if result["success"] and not result["team_data"]["failed_pokemon"]:
+            compact = TeamAnalysis.from_team_data(result["team_data"])
+            team_analysis_cache.set(key, compact)
+        return result
+
+    result = dict(team_single_flight.do(key, compute))
+    # Callers sharing one computation each get their own metrics dict
+    result["metrics"] = {
+        "timings": dict(result["metrics"]["timings"]),
+        "pokemon_lookups": dict(result["metrics"]["pokemon_lookups"]),
+        "team_cache": "miss",
+    }
+    return result
+
+
+def get_team_cache_stats() -> Dict:
+    return {
+        "memory": team_analysis_cache.as_dict(),
+        "single_flight": team_single_flight.as_dict(),
+    }
+
+
+register_collector("pokeapi", get_pokemon_cache_stats)
+register_collector("pokeapi_client", pokeapi_client.as_dict)
+register_collector("team", get_team_cache_stats)
+register_collector("weakness", get_weakness_cache_stats)
+register_collector("ai", get_ai_cache_stats)
+register_collector("ai_queue", ai_job_queue.as_dict)
+
+
+def analyze_complete_team(pokemon_list: List[str]) -> Dict:
+    """
+    Complete team analysis: data + weaknesses + AI recommendations
+
+    Args:
+        pokemon_list: List of Pokemon names
+
+    Returns:
+        Dictionary with complete analysis
+    """
+
+    logger.info("🔍 Starting complete team analysis...")
+    start = time.perf_counter()
+
+    # Steps 1-2: Team data and weaknesses
+    complete_analysis = analyze_team(pokemon_list)
+
+    if not complete_analysis["success"]:
+        return complete_analysis
+
+    # Step 3: Get AI recommendations
+    logger.info("🤖 Getting AI recommendations...")
+    metrics = complete_analysis["metrics"]
+    with timed("ai", metrics["timings"]):
+        recommendations, metrics["ai_source"] = _ai_team_recommendations(
+            complete_analysis["team_data"], complete_analysis["weakness_analysis"]
+        )
+    complete_analysis["ai_recommendations"] = recommendations
+
+    total = time.perf_counter() - start
+    metrics["timings"]["total"] = round(total, 4)
+    STAGE_SECONDS.observe(total, "total")
+
+    logger.info("✅ Complete analysis finished!", extra=metrics)
     return complete_analysis
 
 
@@ -519,4 +1435,5 @@ def test_pokemon_api():
 
 
 if __name__ == "__main__":
+    configure_logging()
     test_pokemon_api()
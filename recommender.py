@@ -0,0 +1,122 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from pokedex import Pokedex, load_pokedex
+from pokemon_analyzer import ALL_TYPES, get_defensive_profile
+
+# Score weights for a candidate filling the open team slot
+SCORE_WEIGHTS = {
+    "covers_critical": 3.0,  # resists/immune to a type that hits someone 4x
+    "covers_major": 2.0,  # resists/immune to a type that hits 2+ members
+    "new_immunities": 1.5,  # immunity the team didn't have yet
+    "new_resistances": 1.0,  # resistance the team didn't have yet
+    "new_critical": -3.0,  # brings in a new 4x weakness
+    "new_major": -1.5,  # turns a single weakness into a major one
+}
+
+
+def _types_where(mask: np.ndarray) -> List[str]:
+    return [ALL_TYPES[i] for i in np.flatnonzero(mask)]
+
+
+def recommend_next_member(
+    team_data: Dict, pokedex: Optional[Pokedex] = None, top_k: int = 10
+) -> List[Dict]:
+    """
+    Ranks every species in the Pokedex snapshot as the team's next member.
+
+    All candidates are scored at once against the team's per-type counts
+    (the same ones analyze_team_weaknesses uses), so no candidate needs a
+    full re-analysis.
+
+    Args:
+        team_data: Team dictionary from get_team_data
+        pokedex: Local Pokedex snapshot (loaded from POKEDEX_PATH when None)
+        top_k: Number of recommendations to return
+
+    Returns:
+        Best candidates, highest score first
+    """
+
+    if pokedex is None:
+        pokedex = load_pokedex()
+
+    if len(pokedex) == 0:
+        return []
+
+    members = team_data["team_members"]
+    if members:
+        grid = np.stack(
+            [get_defensive_profile(p["types"]).multipliers for p in members]
+        )
+    else:
+        grid = np.ones((0, len(ALL_TYPES)))
+
+    # Current per-type counts
+    critical_count = (grid >= 4.0).sum(axis=0)
+    vulnerable_count = (grid >= 2.0).sum(axis=0)
+    immune_count = (grid == 0.0).sum(axis=0)
+    resistant_count = ((grid <= 0.5) & (grid != 0.0)).sum(axis=0)
+
+    is_critical = critical_count > 0
+    is_major = ~is_critical & (vulnerable_count >= 2)
+    is_single_weakness = ~is_critical & (vulnerable_count == 1)
+
+    # Candidate flags, N x 18
+    candidates = pokedex.multipliers
+    cand_critical = candidates >= 4.0
+    cand_vulnerable = candidates >= 2.0
+    cand_immune = candidates == 0.0
+    cand_resists = candidates <= 0.5  # includes immunities
+
+    features = {
+        "covers_critical": cand_resists & is_critical,
+        "covers_major": cand_resists & is_major,
+        "new_immunities": cand_immune & (immune_count == 0),
+        "new_resistances": cand_resists & ~cand_immune & (resistant_count == 0),
+        "new_critical": cand_critical & ~is_critical,
+        "new_major": cand_vulnerable & ~cand_critical & is_single_weakness,
+    }
+
+    scores = np.zeros(len(pokedex))
+    for feature, mask in features.items():
+        scores += SCORE_WEIGHTS[feature] * mask.sum(axis=1)
+
+    # Categories after adding the candidate, as analyze_team_weaknesses would report
+    critical_after = ((critical_count + cand_critical) > 0).sum(axis=1)
+    major_after = (
+        ((critical_count + cand_critical) == 0)
+        & ((vulnerable_count + cand_vulnerable) >= 2)
+    ).sum(axis=1)
+
+    # Never recommend someone already on the team
+    for pokemon in members:
+        row = pokedex.index.get(pokemon["name"].lower())
+        if row is not None:
+            scores[row] = -np.inf
+
+    top_k = min(top_k, len(pokedex))
+    top = np.argpartition(-scores, top_k - 1)[:top_k]
+    top = top[np.lexsort((top, -scores[top]))]
+
+    recommendations = []
+    for row in top:
+        if not np.isfinite(scores[row]):
+            continue
+
+        record = pokedex.record(row)
+        recommendation = {
+            "name": record["name"],
+            "id": record["id"],
+            "types": record["types"],
+            "sprite": record.get("sprite"),
+            "score": float(scores[row]),
+            "critical_weaknesses_after": int(critical_after[row]),
+            "major_weaknesses_after": int(major_after[row]),
+        }
+        for feature, mask in features.items():
+            recommendation[feature] = _types_where(mask[row])
+        recommendations.append(recommendation)
+
+    return recommendations
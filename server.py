@@ -0,0 +1,369 @@
+"""
+Headless JSON HTTP service for bots and other services.
+
+    python server.py --port 8000
+    curl -s localhost:8000/analyze -d '{"team": ["garchomp", "scizor"], "ai": false}'
+
+Endpoints:
+    POST /analyze      {"team": [...], "ai": true}   analyze_complete_team
+    POST /weaknesses   {"team": [...]}               weakness analysis only
+    POST /batch        {"teams": [[...], ...], "ai": false}  AI at batch priority
+    GET  /health
+    GET  /metrics      Prometheus text (/metrics.json for JSON)
+
+Analyses run on a thread pool, so the event loop only parses, coalesces and
+serializes. Identical requests in flight share one job. Every request has a
+timeout ("timeout" in the body can lower it). Connections are kept alive.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional
+
+import tornado.httpserver
+import tornado.netutil
+import tornado.process
+import tornado.web
+
+from ai_queue import BATCH, INTERACTIVE
+from metrics import (
+    Histogram,
+    configure_logging,
+    metrics_as_dict,
+    register_collector,
+    register_histogram,
+    render_prometheus,
+    timed,
+)
+from pokemon_analyzer import get_ai_team_recommendations, get_cached_team_analysis
+
+logger = logging.getLogger(__name__)
+
+SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SERVER_PORT", 8000))
+# Threads running analyses; mostly waiting on PokeAPI/Gemini when caches are cold
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", 32))
+SERVER_REQUEST_TIMEOUT = float(os.getenv("SERVER_REQUEST_TIMEOUT", 30))
+SERVER_IDLE_TIMEOUT = float(os.getenv("SERVER_IDLE_TIMEOUT", 60))
+SERVER_MAX_BATCH = int(os.getenv("SERVER_MAX_BATCH", 256))
+
+MAX_TEAM_SIZE = 6
+
+REQUEST_SECONDS = register_histogram(
+    Histogram(
+        "pokemon_analyzer_request_seconds",
+        "HTTP request latency by endpoint",
+        label="endpoint",
+    )
+)
+
+
+class Coalescer:
+    """
+    Runs jobs on an executor; a job whose key is already in flight gets the
+    pending future instead of a new thread. Event loop only, so no locking.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor):
+        self.executor = executor
+        self.calls = 0
+        self.shared = 0
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+
+    def run(self, key: Hashable, fn: Callable, *args) -> asyncio.Future:
+        future = self._pending.get(key)
+        if future is not None:
+            self.shared += 1
+            return future
+
+        self.calls += 1
+        future = asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        self._pending[key] = future
+
+        def done(_: asyncio.Future) -> None:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+        future.add_done_callback(done)
+        return future
+
+    def as_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "in_flight": len(self._pending),
+        }
+
+
+def analysis_job(team: List[str], with_ai: bool, priority: int = INTERACTIVE) -> Dict:
+    """Cached weakness analysis, plus AI recommendations when asked for"""
+
+    result = get_cached_team_analysis(team)
+    if with_ai and result["success"]:
+        with timed("ai", result["metrics"]["timings"]):
+            result["ai_recommendations"] = get_ai_team_recommendations(
+                result["team_data"], result["weakness_analysis"], priority=priority
+            )
+    return result
+
+
+def weaknesses_view(result: Dict) -> Dict:
+    """The /weaknesses (and /batch) shape: no team_data or AI text"""
+
+    if not result["success"]:
+        return result
+    view = {
+        "success": True,
+        "team": [member["name"] for member in result["team_data"]["team_members"]],
+        "failed_pokemon": result["team_data"]["failed_pokemon"],
+        "summary": result["summary"],
+        "weakness_analysis": result["weakness_analysis"],
+        "metrics": result["metrics"],
+    }
+    if result.get("ai_recommendations") is not None:
+        view["ai_recommendations"] = result["ai_recommendations"]
+    return view
+
+
+def failure_status(result: Dict) -> int:
+    if result["metrics"]["pokemon_lookups"].get("unavailable"):
+        return 503
+    return 422
+
+
+def _team_key(team: List[str]) -> tuple:
+    return tuple(name.strip().lower() for name in team)
+
+
+class JSONHandler(tornado.web.RequestHandler):
+    def set_default_headers(self) -> None:
+        self.set_header("Content-Type", "application/json")
+
+    @property
+    def coalescer(self) -> Coalescer:
+        return self.application.settings["coalescer"]
+
+    def write_json(self, body: Dict, status: int = 200) -> None:
+        self.set_status(status)
+        self.finish(json.dumps(body))
+
+    def write_error(self, status_code: int, **kwargs) -> None:
+        self.finish(json.dumps({"success": False, "error": self._reason}))
+
+    def json_body(self) -> Dict:
+        try:
+            body = json.loads(self.request.body or b"{}")
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="Body must be JSON")
+        if not isinstance(body, dict):
+            raise tornado.web.HTTPError(400, reason="Body must be a JSON object")
+        return body
+
+    def team_arg(self, team) -> List[str]:
+        if (
+            not isinstance(team, list)
+            or not 1 <= len(team) <= MAX_TEAM_SIZE
+            or not all(isinstance(name, str) and name.strip() for name in team)
+        ):
+            raise tornado.web.HTTPError(
+                400, reason=f"team must be a list of 1-{MAX_TEAM_SIZE} Pokemon names"
+            )
+        return [name.strip() for name in team]
+
+    def flag_arg(self, body: Dict, name: str, default: bool) -> bool:
+        # Body field first, then ?name=0/1 in the query string
+        if name in body:
+            return bool(body[name])
+        value = self.get_query_argument(name, None)
+        if value is None:
+            return default
+        return value.lower() not in ("0", "false", "no")
+
+    def timeout_arg(self, body: Dict) -> float:
+        try:
+            timeout = float(body.get("timeout", SERVER_REQUEST_TIMEOUT))
+        except (TypeError, ValueError):
+            raise tornado.web.HTTPError(400, reason="timeout must be a number")
+        return min(max(timeout, 0.001), SERVER_REQUEST_TIMEOUT)
+
+    async def analyze(
+        self,
+        team: List[str],
+        with_ai: bool,
+        timeout: float,
+        priority: int = INTERACTIVE,
+    ) -> Dict:
+        # AI requests at different priorities stay separate jobs here; the AI
+        # job queue merges them and moves the shared one ahead
+        ai_priority = priority if with_ai else None
+        future = self.coalescer.run(
+            (_team_key(team), ai_priority), analysis_job, team, with_ai, priority
+        )
+        try:
+            # Shielded: a timeout here must not cancel the job for the others
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise tornado.web.HTTPError(
+                504, reason=f"Analysis took longer than {timeout:g}s"
+            )
+
+
+class AnalyzeHandler(JSONHandler):
+    async def post(self) -> None:
+        body = self.json_body()
+        team = self.team_arg(body.get("team"))
+        with_ai = self.flag_arg(body, "ai", True)
+
+        result = await self.analyze(team, with_ai, self.timeout_arg(body))
+        self.write_json(result, 200 if result["success"] else failure_status(result))
+
+
+class WeaknessesHandler(JSONHandler):
+    async def post(self) -> None:
+        body = self.json_body()
+        team = self.team_arg(body.get("team"))
+
+        result = await self.analyze(team, False, self.timeout_arg(body))
+        self.write_json(
+            weaknesses_view(result),
+            200 if result["success"] else failure_status(result),
+        )
+
+
+class BatchHandler(JSONHandler):
+    async def post(self) -> None:
+        body = self.json_body()
+        teams = body.get("teams")
+        if not isinstance(teams, list) or not 1 <= len(teams) <= SERVER_MAX_BATCH:
+            raise tornado.web.HTTPError(
+                400, reason=f"teams must be a list of 1-{SERVER_MAX_BATCH} teams"
+            )
+
+        # Teams can be plain lists or {"id": ..., "team": [...]}
+        entries = []
+        for i, entry in enumerate(teams):
+            if isinstance(entry, dict):
+                entries.append((entry.get("id", i), self.team_arg(entry.get("team"))))
+            else:
+                entries.append((i, self.team_arg(entry)))
+
+        with_ai = self.flag_arg(body, "ai", False)
+        timeout = self.timeout_arg(body)
+
+        async def one(team_id, team: List[str]) -> Dict:
+            try:
+                result = weaknesses_view(
+                    await self.analyze(team, with_ai, timeout, BATCH)
+                )
+            except tornado.web.HTTPError as e:
+                result = {"success": False, "error": e.reason}
+            return {"id": team_id, **result}
+
+        results = await asyncio.gather(*(one(i, team) for i, team in entries))
+        self.write_json({"results": results})
+
+
+class HealthHandler(JSONHandler):
+    def get(self) -> None:
+        self.write_json({"status": "ok", "coalescer": self.coalescer.as_dict()})
+
+
+class MetricsHandler(JSONHandler):
+    def get(self) -> None:
+        self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.finish(render_prometheus())
+
+
+class MetricsJSONHandler(JSONHandler):
+    def get(self) -> None:
+        self.write_json(metrics_as_dict())
+
+
+# Literal paths, also used as the endpoint label of the request histogram
+ROUTES = [
+    ("/analyze", AnalyzeHandler),
+    ("/weaknesses", WeaknessesHandler),
+    ("/batch", BatchHandler),
+    ("/health", HealthHandler),
+    ("/metrics", MetricsHandler),
+    ("/metrics.json", MetricsJSONHandler),
+]
+ENDPOINTS = {handler: path for path, handler in ROUTES}
+
+
+def endpoint_label(handler: tornado.web.RequestHandler) -> str:
+    # Unmatched paths share one label so scanners can't grow the series
+    endpoint = ENDPOINTS.get(type(handler))
+    if endpoint is not None:
+        return endpoint
+    return "not_found" if handler.get_status() == 404 else "other"
+
+
+def log_request(handler: tornado.web.RequestHandler) -> None:
+    seconds = handler.request.request_time()
+    REQUEST_SECONDS.observe(seconds, endpoint_label(handler))
+    logger.debug(
+        "%s %s %s",
+        handler.request.method,
+        handler.request.path,
+        handler.get_status(),
+        extra={"status": handler.get_status(), "seconds": round(seconds, 6)},
+    )
+
+
+def make_app(workers: int = SERVER_WORKERS) -> tornado.web.Application:
+    coalescer = Coalescer(
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis")
+    )
+    register_collector("server", coalescer.as_dict)
+
+    return tornado.web.Application(
+        [(re.escape(path), handler) for path, handler in ROUTES],
+        coalescer=coalescer,
+        log_function=log_request,
+    )
+
+
+def make_server(app: tornado.web.Application) -> tornado.httpserver.HTTPServer:
+    # HTTP/1.1 keep-alive is on by default; idle connections are closed
+    return tornado.httpserver.HTTPServer(
+        app, idle_connection_timeout=SERVER_IDLE_TIMEOUT, xheaders=True
+    )
+
+
+async def serve(sockets: List, workers: int) -> None:
+    server = make_server(make_app(workers))
+    server.add_sockets(sockets)
+    await asyncio.Event().wait()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pokemon team analysis JSON service")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Server processes sharing the port (0 = one per CPU)",
+    )
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    sockets = tornado.netutil.bind_sockets(args.port, args.host)
+    if args.processes != 1:
+        # Each process has its own memory caches; the on-disk caches are shared
+        tornado.process.fork_processes(args.processes)
+
+    logger.info("🚀 Serving on http://%s:%s", args.host, args.port)
+    asyncio.run(serve(sockets, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Local sprite cache.
+
+Each sprite URL is downloaded once, over pooled keep-alive connections, and
+stored in a content-addressed directory (files named by the SHA-256 of
+their bytes, so identical artwork is stored once). The URL -> digest map
+lives in the PokeAPI SQLite cache. Rendered bytes, optionally downscaled and
+recompressed with Pillow, are kept in memory and handed to st.image, so
+re-rendering results makes no external requests.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+import requests
+
+from cache import NEGATIVE, LRUCache, PersistentCache, SingleFlight
+from http_client import ResilientClient
+from metrics import register_collector
+from pokemon_analyzer import (
+    POKEAPI_BREAKER_RESET,
+    POKEAPI_BREAKER_THRESHOLD,
+    POKEAPI_CACHE_PATH,
+    POKEAPI_CONNECT_TIMEOUT,
+    POKEAPI_MAX_WORKERS,
+    POKEAPI_NEGATIVE_CACHE_TTL,
+    POKEAPI_OFFLINE,
+    POKEAPI_RETRIES,
+    POKEAPI_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+SPRITE_CACHE_DIR = os.getenv("SPRITE_CACHE_DIR", ".cache/sprites")
+SPRITE_MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("SPRITE_MEMORY_CACHE_MAX_ENTRIES", 512))
+
+sprite_index = PersistentCache(POKEAPI_CACHE_PATH, namespace="sprite")
+sprite_memory_cache = LRUCache(max_entries=SPRITE_MEMORY_CACHE_MAX_ENTRIES)
+sprite_single_flight = SingleFlight()
+
+# Sprites come from a different host than PokeAPI, so they get their own
+# pool. Static files: retries and a breaker, but no rate limit
+sprite_client = ResilientClient(
+    name="sprites",
+    max_concurrency=POKEAPI_MAX_WORKERS,
+    retries=POKEAPI_RETRIES,
+    timeout=(POKEAPI_CONNECT_TIMEOUT, POKEAPI_TIMEOUT),
+    failure_threshold=POKEAPI_BREAKER_THRESHOLD,
+    reset_timeout=POKEAPI_BREAKER_RESET,
+)
+
+_executor = None
+
+
+def _executor_instance() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=POKEAPI_MAX_WORKERS, thread_name_prefix="sprites"
+        )
+    return _executor
+
+
+def _path(digest: str, size: Optional[int] = None) -> str:
+    name = digest if size is None else f"{digest}-{size}"
+    return os.path.join(SPRITE_CACHE_DIR, digest[:2], f"{name}.png")
+
+
+def _write(path: str, data: bytes) -> None:
+    # Written under a temporary name first so readers never see partial files
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _read(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _download(url: str) -> Optional[str]:
+    """Fetches a sprite into the store; returns its digest"""
+
+    try:
+        response = sprite_client.get(url)
+        if response.status_code != 200:
+            if response.status_code == 404:
+                sprite_index.set_negative(url, POKEAPI_NEGATIVE_CACHE_TTL)
+            logger.warning("Sprite %s not available (%s)", url, response.status_code)
+            return None
+    except requests.exceptions.RequestException as e:
+        logger.error("Error downloading sprite: %s", e)
+        return None
+
+    if not response.headers.get("Content-Type", "image/").startswith("image/"):
+        logger.warning("Sprite %s is not an image", url)
+        return None
+
+    data = response.content
+    digest = hashlib.sha256(data).hexdigest()
+    path = _path(digest)
+    if not os.path.exists(path):
+        _write(path, data)
+    sprite_index.set(url, digest)
+    return digest
+
+
+def _original_digest(url: str, offline: bool) -> Optional[str]:
+    digest = sprite_index.get(url)
+    if digest == NEGATIVE:
+        return None
+    if digest is not None and os.path.exists(_path(digest)):
+        return digest
+    if offline:
+        return None
+    return sprite_single_flight.do(url, lambda: _download(url))
+
+
+def _resize(data: bytes, size: int) -> bytes:
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.thumbnail((size, size), Image.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+def get_sprite(
+    url: str, size: Optional[int] = None, offline: Optional[bool] = None
+) -> Optional[bytes]:
+    """
+    PNG bytes for a sprite URL: memory, then the local store, then one
+    download. With size, the image is scaled to fit size x size pixels (the
+    scaled copy is stored too). Returns None when it can't be loaded.
+    """
+
+    if not url:
+        return None
+
+    if offline is None:
+        offline = POKEAPI_OFFLINE
+
+    key = (url, size)
+    data = sprite_memory_cache.get(key)
+    if data is not None:
+        return data
+
+    digest = _original_digest(url, offline)
+    if digest is None:
+        return None
+
+    if size is None:
+        data = _read(_path(digest))
+    else:
+        path = _path(digest, size)
+        data = _read(path)
+        if data is None:
+            original = _read(_path(digest))
+            if original is None:
+                return None
+            try:
+                data = _resize(original, size)
+            except OSError as e:
+                logger.error("Error decoding sprite %s: %s", url, e)
+                return None
+            _write(path, data)
+
+    if data is not None:
+        sprite_memory_cache.set(key, data)
+    return data
+
+
+def get_sprites(
+    urls: Iterable[Optional[str]], size: Optional[int] = None
+) -> Dict[str, bytes]:
+    """get_sprite for many URLs at once; only the ones that loaded are returned"""
+
+    urls = [url for url in dict.fromkeys(urls) if url]
+    futures = {url: _executor_instance().submit(get_sprite, url, size) for url in urls}
+    sprites = {url: future.result() for url, future in futures.items()}
+    return {url: data for url, data in sprites.items() if data is not None}
+
+
+def prefetch_sprite(url: Optional[str], size: Optional[int] = None) -> Optional[Future]:
+    """Loads a sprite in the background so the next render is a memory hit"""
+
+    if not url:
+        return None
+    return _executor_instance().submit(get_sprite, url, size)
+
+
+def get_sprite_cache_stats() -> Dict:
+    stats = sprite_index.stats.as_dict()
+    stats["entries"] = len(sprite_index)
+    stats["memory"] = sprite_memory_cache.as_dict()
+    stats["single_flight"] = sprite_single_flight.as_dict()
+    return stats
+
+
+register_collector("sprite", get_sprite_cache_stats)
+register_collector("sprite_client", sprite_client.as_dict)
@@ -0,0 +1,69 @@
+"""
+Shared test setup: every cache lives in a temporary directory and PokeAPI
+is the local stub from benchmarks/stubs.py, so the suite runs offline.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from stubs import FakeGenaiClient, StubPokeAPI  # noqa: E402
+
+STUB = StubPokeAPI().start()
+_tmp = tempfile.mkdtemp(prefix="pokemon-analyzer-tests-")
+
+# Configure before the analyzer reads its settings at import
+os.environ["POKEAPI_BASE_URL"] = STUB.base_url
+os.environ["POKEAPI_CACHE_PATH"] = os.path.join(_tmp, "pokeapi.sqlite3")
+os.environ["AI_CACHE_PATH"] = os.path.join(_tmp, "ai.sqlite3")
+os.environ["POKEDEX_PATH"] = os.path.join(_tmp, "missing.arrow")
+os.environ["SPECIES_LIST_PATH"] = os.path.join(_tmp, "missing.json")
+os.environ["POKEAPI_RATE_LIMIT"] = "0"
+
+
+@pytest.fixture
+def analyzer():
+    """pokemon_analyzer with empty caches"""
+
+    import pokemon_analyzer
+
+    for cache in (
+        pokemon_analyzer.pokemon_memory_cache,
+        pokemon_analyzer.pokeapi_cache,
+        pokemon_analyzer.team_analysis_cache,
+        pokemon_analyzer.weakness_template_cache,
+        pokemon_analyzer.ai_memory_cache,
+        pokemon_analyzer.ai_disk_cache,
+    ):
+        cache.clear()
+    return pokemon_analyzer
+
+
+@pytest.fixture
+def stub():
+    return STUB
+
+
+@pytest.fixture
+def slow_pokeapi(analyzer, monkeypatch):
+    """The analyzer pointed at a stub PokeAPI that takes 0.2s per request"""
+
+    with StubPokeAPI(latency=0.2) as stub:
+        monkeypatch.setattr(analyzer, "POKEAPI_BASE_URL", stub.base_url)
+        yield stub
+
+
+@pytest.fixture
+def fake_ai(analyzer):
+    """A fake Gemini client installed as the analyzer's default client"""
+
+    previous = analyzer.client
+    analyzer.client = FakeGenaiClient()
+    yield analyzer.client
+    analyzer.client = previous
@@ -0,0 +1,275 @@
+import json
+import threading
+import time
+
+import pytest
+
+import batch_analyzer
+from ai_queue import BATCH, INTERACTIVE, AIJobQueue
+from stubs import FakeGenaiClient
+
+
+def _queue(generate, generate_many=None, **kwargs) -> AIJobQueue:
+    kwargs.setdefault("backoff", 0.001)
+    return AIJobQueue(generate, generate_many, **kwargs)
+
+
+def test_concurrency_is_capped():
+    lock = threading.Lock()
+    running = peak = 0
+
+    def generate(request, model_client):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return f"text {request}"
+
+    queue = _queue(generate, max_concurrency=3)
+    futures = [queue.submit(i, i) for i in range(12)]
+
+    assert [f.result(timeout=5) for f in futures] == [f"text {i}" for i in range(12)]
+    assert peak == 3
+
+
+def test_batch_jobs_are_packed():
+    packs = []
+
+    def generate_many(requests, model_client):
+        packs.append(sorted(requests))
+        return {key: f"text {request}" for key, request in requests.items()}
+
+    queue = _queue(None, generate_many, max_concurrency=1, batch_size=4, batch_wait=0.5)
+    futures = [queue.submit(i, i, BATCH) for i in range(8)]
+
+    assert [f.result(timeout=5) for f in futures] == [f"text {i}" for i in range(8)]
+    assert packs == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    assert queue.as_dict()["packed_requests"] == 2
+
+
+def test_interactive_jobs_run_ahead_of_batch_jobs():
+    release = threading.Event()
+    order = []
+
+    def generate(request, model_client):
+        if request == "blocker":
+            release.wait(5)
+        order.append(request)
+        return request
+
+    queue = _queue(generate, max_concurrency=1)
+    blocker = queue.submit("blocker", "blocker")
+    time.sleep(0.05)  # the only worker is now busy
+
+    batch = [queue.submit(f"b{i}", f"b{i}", BATCH) for i in range(3)]
+    interactive = queue.submit("i", "i", INTERACTIVE)
+    # Same key as a queued batch job: shares it and moves it ahead
+    escalated = queue.submit("b2", "b2", INTERACTIVE)
+    release.set()
+
+    for future in [blocker, *batch, interactive]:
+        future.result(timeout=5)
+    assert escalated is batch[2]
+    assert order == ["blocker", "i", "b2", "b0", "b1"]
+
+
+def test_failures_are_retried():
+    failures = {"flaky": 2}
+
+    def generate(request, model_client):
+        if failures.get(request, 0):
+            failures[request] -= 1
+            raise RuntimeError("model error")
+        return request
+
+    queue = _queue(generate, retries=2)
+
+    assert queue.submit("flaky", "flaky").result(timeout=5) == "flaky"
+    assert queue.as_dict()["retries"] == 2
+
+
+def test_permanent_failure_reaches_the_caller():
+    def generate(request, model_client):
+        raise RuntimeError("model error")
+
+    queue = _queue(generate, retries=1)
+
+    with pytest.raises(RuntimeError, match="model error"):
+        queue.submit("k", "k").result(timeout=5)
+    assert queue.as_dict()["failed"] == 1
+
+
+def test_hung_call_times_out():
+    def generate(request, model_client):
+        time.sleep(1)
+        return request
+
+    queue = _queue(generate, retries=0, timeout=0.05)
+
+    with pytest.raises(TimeoutError, match="timed out after 0.05s"):
+        queue.submit("k", "k").result(timeout=5)
+    assert queue.as_dict()["timeouts"] == 1
+
+
+def test_pack_size_is_per_job():
+    packs = []
+
+    def generate_many(requests, model_client):
+        packs.append(sorted(requests))
+        return {key: "text" for key in requests}
+
+    queue = _queue(
+        lambda request, model_client: "text",
+        generate_many,
+        max_concurrency=1,
+        batch_size=1,
+        batch_wait=0.5,
+    )
+    futures = [queue.submit(i, i, BATCH, batch_size=3) for i in range(3)]
+    futures += [queue.submit(i, i, BATCH, batch_size=2) for i in range(3, 5)]
+
+    for future in futures:
+        future.result(timeout=5)
+    assert packs == [[0, 1, 2], [3, 4]]
+    assert queue.batch_size == 1
+
+
+def test_waiting_for_a_call_thread_does_not_count_toward_the_timeout():
+    def generate(request, model_client):
+        time.sleep(0.6 if request == "hang" else 0.05)
+        return request
+
+    # One worker and two call threads, both left busy by abandoned calls
+    queue = _queue(generate, max_concurrency=1, retries=0, timeout=0.2)
+    hung = [queue.submit(f"hang{i}", "hang") for i in range(2)]
+    healthy = queue.submit("ok", "ok")
+
+    for future in hung:
+        with pytest.raises(TimeoutError):
+            future.result(timeout=5)
+    assert healthy.result(timeout=5) == "ok"
+    assert queue.as_dict()["timeouts"] == 2
+
+
+def test_jobs_missing_from_a_packed_answer_are_retried_alone():
+    def generate(request, model_client):
+        return f"alone {request}"
+
+    def generate_many(requests, model_client):
+        return {key: f"packed {key}" for key in requests if key % 2 == 0}
+
+    queue = _queue(
+        generate, generate_many, max_concurrency=1, batch_size=4, batch_wait=0.5
+    )
+    futures = [queue.submit(i, i, BATCH) for i in range(4)]
+
+    assert [f.result(timeout=5) for f in futures] == [
+        "packed 0",
+        "alone 1",
+        "packed 2",
+        "alone 3",
+    ]
+
+
+def _analyses(analyzer, teams):
+    analyses = []
+    for team in teams:
+        team_data = analyzer.get_team_data(team)
+        analyses.append((team_data, analyzer.analyze_team_weaknesses(team_data)))
+    return analyses
+
+
+TEAMS = [["garchomp"], ["scizor"], ["heatran"], ["togekiss", "pikachu"]]
+
+
+@pytest.fixture
+def gemini_queue(analyzer, monkeypatch):
+    """The analyzer's Gemini queue, with one worker and no backoff"""
+
+    queue = _queue(
+        analyzer._generate_text,
+        analyzer._generate_packed_text,
+        name="gemini",
+        max_concurrency=1,
+        batch_wait=0.5,
+    )
+    monkeypatch.setattr(analyzer, "ai_job_queue", queue)
+    return queue
+
+
+def test_recommendations_many_packs_and_retries(analyzer, fake_ai, gemini_queue):
+    fake_ai.failures = 1
+
+    results = analyzer.get_ai_recommendations_many(
+        _analyses(analyzer, TEAMS), batch_size=4
+    )
+
+    assert results == [(fake_ai.text, "generated")] * len(TEAMS)
+    # One failed packed call, then every team retried on its own
+    assert fake_ai.calls == 1 + len(TEAMS)
+    assert gemini_queue.as_dict()["packed_requests"] == 1
+
+
+def test_recommendations_many_reports_permanent_failures(
+    analyzer, fake_ai, gemini_queue
+):
+    fake_ai.failures = 100
+
+    [(text, source)] = analyzer.get_ai_recommendations_many(
+        _analyses(analyzer, TEAMS[:1])
+    )
+
+    assert source == "error"
+    assert text == analyzer.AI_ERROR_MESSAGE.format(error="fake model error")
+
+
+def test_batch_run_packs_without_changing_the_shared_queue(
+    analyzer, fake_ai, gemini_queue, tmp_path
+):
+    source = tmp_path / "teams.jsonl"
+    source.write_text("".join(json.dumps(team) + "\n" for team in TEAMS))
+    output = tmp_path / "results.jsonl"
+
+    batch_analyzer.run_batch(
+        str(source), str(output), workers=1, with_ai=True, ai_batch_size=4
+    )
+
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [r["ai_recommendations"] for r in results] == [fake_ai.text] * len(TEAMS)
+    assert fake_ai.calls == 1
+    assert gemini_queue.batch_size == 1
+
+
+def _concurrently(count, fn):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(i):
+        barrier.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+def test_concurrent_identical_requests_make_one_call(analyzer, gemini_queue):
+    fake = FakeGenaiClient(latency=0.2)
+    [(team_data, weakness_analysis)] = _analyses(analyzer, [["garchomp", "scizor"]])
+
+    results = _concurrently(
+        8,
+        lambda: analyzer.get_ai_team_recommendations(
+            team_data, weakness_analysis, fake
+        ),
+    )
+
+    assert results == [fake.text] * 8
+    assert fake.calls == 1
+    assert gemini_queue.as_dict()["shared"] == 7
@@ -0,0 +1,45 @@
+import json
+
+import batch_analyzer
+
+SIX = ["garchomp", "scizor", "rotom-wash", "heatran", "togekiss", "pikachu"]
+NINE = SIX + ["gengar", "snorlax", "dragonite"]
+
+
+def _run(analyzer, tmp_path, teams, **kwargs):
+    source = tmp_path / "teams.jsonl"
+    source.write_text("".join(json.dumps(team) + "\n" for team in teams))
+    output = tmp_path / "results.jsonl"
+
+    stats = batch_analyzer.run_batch(str(source), str(output), workers=1, **kwargs)
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    return stats, {result["id"]: result for result in results}
+
+
+def test_oversized_team_gets_its_own_error(analyzer, tmp_path):
+    stats, results = _run(
+        analyzer,
+        tmp_path,
+        [{"id": "ok", "team": SIX}, {"id": "big", "team": NINE}],
+    )
+
+    assert stats["teams"] == 2
+    assert results["ok"]["success"]
+    assert results["big"] == {
+        "id": "big",
+        "success": False,
+        "error": "Pokemon teams should have maximum 6 members",
+        "failed_pokemon": [],
+    }
+
+
+def test_matches_analyze_team_weaknesses(analyzer, tmp_path):
+    _, results = _run(analyzer, tmp_path, [SIX])
+    result = results["1"]
+
+    team_data = analyzer.get_team_data(SIX)
+    expected = analyzer.analyze_team_weaknesses(team_data)
+    for category in ("critical", "major", "minor"):
+        assert result[f"{category}_weaknesses"] == [
+            threat["type"] for threat in expected[f"{category}_weaknesses"]
+        ]
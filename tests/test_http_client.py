@@ -0,0 +1,186 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from http_client import CircuitBreaker, CircuitOpenError, ResilientClient, TokenBucket
+from stubs import StubPokeAPI
+
+
+@pytest.fixture
+def upstream():
+    """A stub PokeAPI of its own, so injected failures don't leak"""
+
+    with StubPokeAPI() as stub:
+        yield stub
+
+
+def make_client(**kwargs) -> ResilientClient:
+    kwargs.setdefault("retries", 2)
+    kwargs.setdefault("timeout", 2.0)
+    return ResilientClient(backoff=0.001, max_backoff=0.001, **kwargs)
+
+
+def pokemon_url(stub: StubPokeAPI, name: str = "garchomp") -> str:
+    return f"{stub.base_url}/pokemon/{name}"
+
+
+def open_breaker(client: ResilientClient) -> None:
+    for _ in range(client.breaker.failure_threshold):
+        client.breaker.record_failure()
+    assert client.breaker.state == "open"
+
+
+def test_token_bucket_bursts_then_paces():
+    bucket = TokenBucket(rate=50, capacity=2)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+
+    start = time.monotonic()
+    wait = bucket.acquire()
+    assert 0.0 < wait <= 0.02
+    assert time.monotonic() - start >= wait * 0.9
+
+
+def test_token_bucket_rate_zero_never_waits():
+    bucket = TokenBucket(rate=0, capacity=1)
+    assert all(bucket.acquire() == 0.0 for _ in range(100))
+
+
+def test_5xx_is_retried_until_it_succeeds(upstream):
+    upstream.failures = 2
+    client = make_client()
+
+    response = client.get(pokemon_url(upstream))
+
+    assert response.status_code == 200
+    assert upstream.requests["/api/v2/pokemon/garchomp"] == 3
+    stats = client.as_dict()
+    assert stats["retries"] == 2
+    assert stats["transient_failures"] == 2
+    assert stats["breaker"]["state"] == "closed"
+
+
+def test_persistent_5xx_returns_the_last_response(upstream):
+    upstream.failures = 10
+    upstream.failure_status = 502
+    client = make_client(retries=2, failure_threshold=10)
+
+    response = client.get(pokemon_url(upstream))
+
+    assert response.status_code == 502
+    assert upstream.request_count == 3
+
+
+def test_connection_errors_are_retried_then_raised():
+    with StubPokeAPI() as stub:
+        url = pokemon_url(stub)
+    # Nothing listens there any more
+    client = make_client(retries=2, failure_threshold=10)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get(url)
+
+    stats = client.as_dict()
+    assert stats["attempts"] == 3
+    assert stats["retries"] == 2
+    assert stats["transient_failures"] == 3
+
+
+def test_404_is_not_retried_and_counts_as_success(upstream):
+    upstream.failures = 1
+    client = make_client(retries=0, failure_threshold=2)
+
+    assert client.get(pokemon_url(upstream)).status_code == 503
+    assert client.breaker.as_dict()["consecutive_failures"] == 1
+
+    response = client.get(pokemon_url(upstream, "missingno"))
+
+    assert response.status_code == 404
+    assert upstream.requests["/api/v2/pokemon/missingno"] == 1
+    assert client.as_dict()["retries"] == 0
+    assert client.breaker.as_dict()["consecutive_failures"] == 0
+    assert client.breaker.state == "closed"
+
+
+def test_breaker_opens_probes_once_then_closes(upstream):
+    upstream.failures = 2
+    client = make_client(retries=0, failure_threshold=2, reset_timeout=0.1)
+
+    for _ in range(2):
+        assert client.get(pokemon_url(upstream)).status_code == 503
+    assert client.breaker.state == "open"
+
+    # Open: rejected without a request
+    with pytest.raises(CircuitOpenError):
+        client.get(pokemon_url(upstream))
+    assert upstream.request_count == 2
+
+    time.sleep(0.15)
+    assert client.breaker.state == "half_open"
+
+    # One slow probe goes through; everything else is still rejected
+    upstream.latency = 0.2
+    probe = {}
+    thread = threading.Thread(
+        target=lambda: probe.update(response=client.get(pokemon_url(upstream)))
+    )
+    thread.start()
+    time.sleep(0.05)
+    with pytest.raises(CircuitOpenError):
+        client.get(pokemon_url(upstream, "scizor"))
+    thread.join()
+
+    assert probe["response"].status_code == 200
+    assert upstream.request_count == 3
+    assert client.breaker.state == "closed"
+    assert client.get(pokemon_url(upstream, "scizor")).status_code == 200
+
+
+def test_failed_probe_opens_the_breaker_again():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.05)
+    for _ in range(3):
+        breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.opens == 1
+    assert not breaker.allow()
+
+
+def test_circuit_open_error_is_not_retried(upstream):
+    client = make_client(retries=3)
+    open_breaker(client)
+
+    with pytest.raises(CircuitOpenError):
+        client.get(pokemon_url(upstream))
+
+    stats = client.as_dict()
+    assert stats["rejected"] == 1
+    assert stats["retries"] == 0
+    assert stats["attempts"] == 0
+    assert upstream.request_count == 0
+
+
+def test_open_breaker_serves_the_expired_cache_entry(analyzer, stub, monkeypatch):
+    record = analyzer.get_pokemon_data("garchomp")
+    # Expire both cached copies (name and id keys)
+    analyzer.pokemon_memory_cache.clear()
+    for key in ("name:garchomp", f"id:{record['id']}"):
+        analyzer.pokeapi_cache.set(key, record, ttl=-1)
+
+    client = make_client()
+    open_breaker(client)
+    monkeypatch.setattr(analyzer, "pokeapi_client", client)
+
+    before = stub.request_count
+    assert analyzer.lookup_pokemon("garchomp") == (record, "stale")
+    assert analyzer.lookup_pokemon("scizor") == (None, "unavailable")
+    assert stub.request_count == before
+    assert client.as_dict()["rejected"] == 2
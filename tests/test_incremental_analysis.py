@@ -0,0 +1,73 @@
+import json
+import random
+
+import pytest
+
+from incremental_analysis import IncrementalTeamAnalysis
+from pokemon_analyzer import TYPE_COMBINATIONS, analyze_team_weaknesses
+
+
+def _pokemon(rng: random.Random, i: int) -> dict:
+    return {"name": f"Mon{i}", "types": list(rng.choice(TYPE_COMBINATIONS))}
+
+
+def _full(members) -> dict:
+    return analyze_team_weaknesses({"team_members": members})
+
+
+def _categories(analysis: dict) -> dict:
+    # attacking type -> category, as reported in the deltas
+    categories = {}
+    for category in ("critical", "major", "minor"):
+        for threat in analysis[f"{category}_weaknesses"]:
+            categories[threat["type"]] = category
+    return categories
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_edits_match_a_full_recompute(seed):
+    rng = random.Random(seed)
+    members = [_pokemon(rng, i) for i in range(rng.randint(0, 6))]
+    incremental = IncrementalTeamAnalysis(list(members))
+    assert json.dumps(incremental.weakness_analysis()) == json.dumps(_full(members))
+
+    for step in range(300):
+        before = _categories(_full(members))
+        action = rng.choice(["add", "remove", "replace"])
+        if action == "add" and len(members) < 6 or not members:
+            pokemon = _pokemon(rng, 100 + step)
+            members.append(pokemon)
+            delta = incremental.add(pokemon)
+        elif action == "remove":
+            index = rng.randrange(len(members))
+            members.pop(index)
+            delta = incremental.remove(index)
+        else:
+            index = rng.randrange(len(members))
+            pokemon = _pokemon(rng, 100 + step)
+            members[index] = pokemon
+            delta = incremental.replace(index, pokemon)
+
+        after = _categories(_full(members))
+        expected = {
+            t: {"before": before.get(t), "after": after.get(t)}
+            for t in set(before) | set(after)
+            if before.get(t) != after.get(t)
+        }
+        assert delta == expected
+        assert json.dumps(incremental.weakness_analysis()) == json.dumps(_full(members))
+
+
+def test_returned_analysis_can_be_modified_safely():
+    members = [
+        {"name": "Garchomp", "types": ["dragon", "ground"]},
+        {"name": "Scizor", "types": ["bug", "steel"]},
+    ]
+    incremental = IncrementalTeamAnalysis(members)
+
+    first = incremental.weakness_analysis()
+    first["critical_weaknesses"][0]["critical_pokemon"].append("Intruder")
+    first["type_threat_level"]["ice"]["vulnerable_count"] = 99
+    first["immunities"].clear()
+
+    assert json.dumps(incremental.weakness_analysis()) == json.dumps(_full(members))
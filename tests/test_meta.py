@@ -0,0 +1,114 @@
+import pytest
+
+import meta
+from meta import CHECKED_THREAT_FACTOR, MetaGame, load_usage, score_teams
+from pokemon_analyzer import calculate_damage_multiplier
+from stubs import SPECIES
+
+USAGE_CSV = """Pokemon,Usage
+Garchomp,30%
+Rotom-Wash,20%
+Heatran,15%
+Togekiss,15%
+Scizor,10%
+MissingNo,5%
+GARCHOMP,5%
+"""
+
+TEAMS = [
+    ["garchomp", "scizor", "rotom-wash", "heatran", "togekiss", "gengar"],
+    ["pikachu"],
+    [],
+    ["snorlax", "dragonite", "gengar"],
+    ["heatran", "togekiss"],
+]
+
+
+def _member(name):
+    return {"name": name.title(), "types": SPECIES[name][1]}
+
+
+def _best(attacking_types, defending_types):
+    return max(calculate_damage_multiplier(t, defending_types) for t in attacking_types)
+
+
+def reference_score(team, game, top_threats=5):
+    """One team at a time, straight from calculate_damage_multiplier"""
+
+    names = [member["name"] for member in team]
+    meta_types = [SPECIES[name.lower()][1] for name in game.names]
+
+    threats = []
+    score = coverage = checked_share = 0.0
+    for j, (types, weight) in enumerate(zip(meta_types, game.weights)):
+        offense = [_best(member["types"], types) for member in team]
+        defense = [_best(types, member["types"]) for member in team]
+        hits = [n for n, d in zip(names, defense) if d >= 2.0]
+        checked_by = [
+            n for n, o, d in zip(names, offense, defense) if o >= 2.0 and d <= 1.0
+        ]
+
+        threat = len(hits) / len(team) * weight
+        if checked_by:
+            threat *= CHECKED_THREAT_FACTOR
+            checked_share += weight
+        if any(o >= 2.0 for o in offense):
+            coverage += weight
+        score += threat
+        if threat > 0:
+            threats.append((-threat, j, hits, checked_by))
+
+    threats.sort(key=lambda entry: entry[:2])
+    return {
+        "meta_threat_score": round(score, 4),
+        "meta_coverage": round(coverage, 4),
+        "meta_checked": round(checked_share, 4),
+        "top_threats": [
+            {
+                "name": game.names[j],
+                "usage": round(game.weights[j], 4),
+                "threat": round(-threat, 4),
+                "hits": hits,
+                "checked_by": checked_by,
+            }
+            for threat, j, hits, checked_by in threats[:top_threats]
+        ],
+    }
+
+
+@pytest.fixture
+def game(analyzer, tmp_path):
+    path = tmp_path / "usage.csv"
+    path.write_text(USAGE_CSV)
+    return MetaGame.from_usage(load_usage(str(path)))
+
+
+def test_usage_file_is_combined_and_normalized(game):
+    assert game.names == ["Garchomp", "Rotom-Wash", "Heatran", "Togekiss", "Scizor"]
+    assert game.weights.tolist() == pytest.approx(
+        [w / 95 for w in (35, 20, 15, 15, 10)]
+    )
+
+
+def test_unknown_species_are_reported_missing(game):
+    assert game.missing == ["missingno"]
+
+
+def test_blocked_scores_match_a_per_team_reference(game, monkeypatch):
+    # Several blocks, the last one partial
+    monkeypatch.setattr(meta, "BLOCK_TEAMS", 2)
+    teams = [[_member(name) for name in team] for team in TEAMS]
+
+    results = score_teams(teams, game, top_threats=3)
+
+    assert results[2] is None
+    for team, result in zip(teams, results):
+        if team:
+            assert result == reference_score(team, game, top_threats=3)
+
+
+def test_one_block_matches_many(game, monkeypatch):
+    teams = [[_member(name) for name in team] for team in TEAMS]
+    single = score_teams(teams, game)
+    monkeypatch.setattr(meta, "BLOCK_TEAMS", 1)
+    assert score_teams(teams, game) == single
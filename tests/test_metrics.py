@@ -0,0 +1,151 @@
+import json
+import logging
+import socket
+import sys
+
+import pytest
+import requests
+
+import metrics
+from metrics import Histogram, JsonFormatter, register_collector, render_prometheus
+
+
+@pytest.fixture
+def histogram(monkeypatch):
+    monkeypatch.setattr(metrics, "_histograms", list(metrics._histograms))
+    return metrics.register_histogram(
+        Histogram("test_seconds", "Test latency", label="source", buckets=(0.1, 1.0))
+    )
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    monkeypatch.setattr(metrics, "_collectors", dict(metrics._collectors))
+    stats = {"hits": 3, "enabled": True, "path": "/tmp/x", "memory": {"entries": 2}}
+    register_collector("test", lambda: stats)
+    return stats
+
+
+def test_histogram_buckets_are_cumulative(histogram):
+    for seconds in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(seconds, "network")
+    histogram.observe(0.01, "memory")
+
+    series = histogram.as_dict()
+    # Bounds are inclusive, as in Prometheus: 0.1 lands in le="0.1"
+    assert series["network"]["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert series["network"]["count"] == 4
+    assert series["network"]["sum"] == pytest.approx(2.65)
+    assert series["network"]["mean"] == pytest.approx(2.65 / 4)
+    assert series["memory"]["buckets"] == {"0.1": 1, "1.0": 1, "+Inf": 1}
+
+
+def test_histogram_time_records_the_block(histogram):
+    with histogram.time("disk"):
+        pass
+    with pytest.raises(ValueError):
+        with histogram.time("disk"):
+            raise ValueError
+
+    assert histogram.as_dict()["disk"]["count"] == 2
+    histogram.reset()
+    assert histogram.as_dict() == {}
+
+
+def test_prometheus_text_format(histogram):
+    histogram.observe(0.5, "network")
+
+    assert histogram.prometheus_lines() == [
+        "# HELP test_seconds Test latency",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{source="network",le="0.1"} 0',
+        'test_seconds_bucket{source="network",le="1.0"} 1',
+        'test_seconds_bucket{source="network",le="+Inf"} 1',
+        'test_seconds_sum{source="network"} 0.5',
+        'test_seconds_count{source="network"} 1',
+    ]
+    assert "\n".join(histogram.prometheus_lines()) in render_prometheus()
+
+
+def test_registered_collectors_are_exported_as_gauges(collector):
+    lines = render_prometheus().splitlines()
+
+    assert 'pokemon_analyzer_cache_hits{cache="test"} 3.0' in lines
+    assert 'pokemon_analyzer_cache_enabled{cache="test"} 1.0' in lines
+    assert 'pokemon_analyzer_cache_memory_entries{cache="test"} 2.0' in lines
+    assert lines.count("# TYPE pokemon_analyzer_cache_hits gauge") == 1
+    # Only numbers are exported
+    assert not any("cache_path" in line for line in lines)
+
+    assert metrics.metrics_as_dict()["caches"]["test"] == collector
+
+
+def test_metrics_server_serves_both_formats(histogram, collector, monkeypatch):
+    monkeypatch.setattr(metrics, "_server", None)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = metrics.start_metrics_server(port)
+    try:
+        assert metrics.start_metrics_server(port) is server
+        base = f"http://127.0.0.1:{port}"
+
+        text = requests.get(f"{base}/metrics", timeout=5)
+        assert text.headers["Content-Type"].startswith("text/plain")
+        assert "# TYPE test_seconds histogram" in text.text
+
+        data = requests.get(f"{base}/metrics.json", timeout=5).json()
+        assert data["caches"]["test"] == collector
+        assert requests.get(f"{base}/other", timeout=5).status_code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_metrics_server_is_off_without_a_port():
+    assert metrics.start_metrics_server(0) is None
+
+
+def _format(logger_name, *args, **kwargs):
+    record = logging.getLogger(logger_name).makeRecord(
+        logger_name, logging.WARNING, __file__, 1, *args, **kwargs
+    )
+    return json.loads(JsonFormatter().format(record))
+
+
+def test_json_log_line_shape():
+    entry = _format(
+        "pokemon_analyzer",
+        "Pokemon %s not found",
+        ("missingno",),
+        None,
+        extra={"pokemon": "missingno", "status": 404, "path": object()},
+    )
+
+    assert set(entry) == {
+        "time",
+        "level",
+        "logger",
+        "message",
+        "pokemon",
+        "status",
+        "path",
+    }
+    assert entry["level"] == "WARNING"
+    assert entry["logger"] == "pokemon_analyzer"
+    assert entry["message"] == "Pokemon missingno not found"
+    assert entry["pokemon"] == "missingno"
+    assert entry["status"] == 404
+    # Values JSON can't encode are written as strings
+    assert entry["path"].startswith("<object object")
+
+
+def test_json_log_line_includes_the_exception():
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        entry = _format("server", "Request failed", (), sys.exc_info())
+
+    assert entry["message"] == "Request failed"
+    assert "RuntimeError: boom" in entry["exception"]
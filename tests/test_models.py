@@ -0,0 +1,59 @@
+import json
+
+from models import PokemonRecord, TeamAnalysis
+
+TEAM = [
+    {"name": "Garchomp", "id": 445, "types": ["dragon", "ground"], "sprite": None},
+    {"name": "Scizor", "id": 212, "types": ["bug", "steel"], "sprite": None},
+    {"name": "Rotom-Wash", "id": 10009, "types": ["electric", "water"], "sprite": None},
+]
+
+
+def _team_data(analyzer):
+    return analyzer.build_team_data(
+        [p["name"] for p in TEAM], [dict(p) for p in TEAM], verbose=False
+    )
+
+
+def test_views_match_the_dict_functions(analyzer):
+    team_data = _team_data(analyzer)
+    analysis = TeamAnalysis.from_team_data(team_data)
+
+    assert analysis.team_data() == team_data
+    assert json.dumps(analysis.weakness_analysis()) == json.dumps(
+        analyzer.analyze_team_weaknesses(team_data)
+    )
+
+
+def test_records_round_trip():
+    record = PokemonRecord.from_dict(TEAM[0])
+
+    assert record.type_ids == bytes([14, 8])
+    assert record.to_dict() == TEAM[0]
+
+
+def test_team_keeps_its_template_after_eviction(analyzer):
+    analysis = TeamAnalysis.from_team_data(_team_data(analyzer))
+    assert analysis.template is None  # computed on first use, not in build
+
+    before = analysis.weakness_analysis()
+    template = analysis.template
+    analyzer.weakness_template_cache.clear()
+
+    assert analysis.weakness_analysis() == before
+    assert analysis.template is template
+    assert len(analyzer.weakness_template_cache) == 0
+
+
+def test_teams_of_the_same_types_share_a_template(analyzer):
+    first = TeamAnalysis.from_team_data(_team_data(analyzer))
+    renamed = [dict(p, name=p["name"] + "-2") for p in reversed(TEAM)]
+    second = TeamAnalysis.build([PokemonRecord.from_dict(p) for p in renamed])
+
+    first.summary()
+    second.summary()
+
+    assert first.template is second.template
+    threats = second.weakness_analysis()["type_threat_level"]
+    assert threats["ice"]["critical_pokemon"] == ["Garchomp-2"]
+    assert threats["fire"]["critical_pokemon"] == ["Scizor-2"]
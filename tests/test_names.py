@@ -0,0 +1,95 @@
+import pytest
+
+import names
+from names import NameIndex, normalize_name, suggest_names
+
+SPECIES = [
+    "bulbasaur",
+    "charizard",
+    "charizard-mega-x",
+    "charizard-mega-y",
+    "pikachu",
+    "raichu",
+    "raichu-alola",
+    "mr-mime",
+    "mr-mime-galar",
+    "nidoran-f",
+    "nidoran-m",
+    "farfetchd",
+    "flabebe",
+    "type-null",
+    "porygon-z",
+    "ho-oh",
+    "gengar",
+    "gyarados",
+    "garchomp",
+    "giratina-altered",
+    "giratina-origin",
+]
+
+
+@pytest.fixture
+def index():
+    return NameIndex(SPECIES)
+
+
+@pytest.mark.parametrize(
+    "name, slug",
+    [
+        ("  GARCHOMP ", "garchomp"),
+        ("Mr. Mime", "mr-mime"),
+        ("Farfetch'd", "farfetchd"),
+        ("Flabébé", "flabebe"),
+        ("Nidoran♀", "nidoran-f"),
+        ("nidoran male", "nidoran-m"),
+        ("Type: Null", "type-null"),
+        ("porygon_z", "porygon-z"),
+        ("Ho--Oh", "ho-oh"),
+    ],
+)
+def test_normalize_name_punctuation_and_case(name, slug):
+    assert normalize_name(name) == slug
+
+
+@pytest.mark.parametrize(
+    "name, slug",
+    [
+        ("Alolan Raichu", "raichu-alola"),
+        ("Mega Charizard X", "charizard-mega-x"),
+        ("charizard mega y", "charizard-mega-y"),
+        ("Galarian Mr. Mime", "mr-mime-galar"),
+        ("Raichu", "raichu"),
+        # Species the API only lists with a form suffix
+        ("Giratina", "giratina-altered"),
+    ],
+)
+def test_form_words_resolve_to_the_api_slug(index, name, slug):
+    assert index.resolve(name) == slug
+
+
+@pytest.mark.parametrize(
+    "typo, best",
+    [
+        ("garchmp", "garchomp"),
+        ("pikachoo", "pikachu"),
+        ("gyrados", "gyarados"),
+        ("charzard", "charizard"),
+        ("Bulbsaur", "bulbasaur"),
+    ],
+)
+def test_misspellings_get_suggestions_instead_of_resolving(index, typo, best):
+    assert index.resolve(typo) is None
+    assert typo not in index
+    assert index.suggest(typo)[0] == best
+
+
+def test_suggestions_are_limited_and_need_enough_overlap(index):
+    assert index.suggest("charzard", limit=2) == ["charizard", "charizard-mega-x"]
+    assert index.suggest("xyzzyq") == []
+
+
+def test_suggest_names_only_reports_unresolved_names(index, monkeypatch):
+    monkeypatch.setattr(names, "_name_index", index)
+    monkeypatch.setattr(names, "_name_index_loaded", True)
+
+    assert suggest_names(["Garchomp", "gengr", "25", "xyzzyq"]) == {"gengr": ["gengar"]}
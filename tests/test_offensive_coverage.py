@@ -0,0 +1,61 @@
+import logging
+
+import pytest
+
+import offensive_coverage
+from cache import NEGATIVE
+
+
+class _Response:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+
+class _Client:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+    def get(self, url):
+        return _Response(self.status_code)
+
+
+@pytest.fixture
+def answering(monkeypatch):
+    def install(status_code: int) -> None:
+        monkeypatch.setattr(offensive_coverage, "pokeapi_client", _Client(status_code))
+
+    return install
+
+
+def test_missing_move_is_logged_as_not_found(answering, caplog):
+    answering(404)
+    with caplog.at_level(logging.WARNING, logger="offensive_coverage"):
+        assert offensive_coverage._fetch_move("no-such-move") is NEGATIVE
+    assert "Move no-such-move not found" in caplog.text
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_transient_move_failure_logs_the_status(answering, caplog, status):
+    answering(status)
+    with caplog.at_level(logging.WARNING, logger="offensive_coverage"):
+        assert offensive_coverage._fetch_move("surf") is None
+    assert f"answered {status} for move surf" in caplog.text
+    assert "not found" not in caplog.text
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_transient_movepool_failure_logs_the_status(answering, caplog, status):
+    answering(status)
+    with caplog.at_level(logging.WARNING, logger="offensive_coverage"):
+        assert offensive_coverage._fetch_movepool("garchomp") is None
+    assert f"answered {status} for the movepool of garchomp" in caplog.text
+    assert "not found" not in caplog.text
+
+
+def test_team_coverage_from_the_stub(analyzer):
+    team_data = analyzer.get_team_data(["garchomp", "rotom-wash"])
+    coverage = offensive_coverage.analyze_offensive_coverage(team_data)
+
+    assert {"dragon", "ground", "electric", "water"} <= set(coverage["attacking_types"])
+    assert coverage["combination_count"] == 171
+    assert coverage["missing_movepools"] == []
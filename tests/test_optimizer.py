@@ -0,0 +1,18 @@
+from optimizer import optimize_team
+from pokemon_analyzer import canonical_types
+from stubs import SPECIES
+
+MUST_INCLUDE = ["garchomp", "scizor", "rotom-wash", "heatran", "togekiss"]
+
+
+def test_searched_member_never_repeats_a_must_include_combination(analyzer):
+    must_combos = [canonical_types(SPECIES[name][1]) for name in MUST_INCLUDE]
+
+    result = optimize_team(must_include=MUST_INCLUDE, top_n=200, workers=1)
+
+    assert result["teams"]
+    for team in result["teams"]:
+        combos = [tuple(types) for types in team["types"]]
+        assert combos[:5] == must_combos
+        assert combos[5] not in must_combos
+        assert len(set(combos)) == 6
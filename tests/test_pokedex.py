@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pytest
+
+import names
+import pokedex as pokedex_module
+from pokedex import NO_TYPE, Pokedex, get_local_pokedex, load_pokedex, save_pokedex
+from stubs import SPECIES
+
+RECORDS = [
+    {"name": "Bulbasaur", "id": 1, "types": ["grass", "poison"], "sprite": "b.png"},
+    {"name": "Charmander", "id": 4, "types": ["fire"], "sprite": None},
+    {"name": "Mr-Mime", "id": 122, "types": ["psychic", "fairy"], "sprite": "m.png"},
+]
+
+
+@pytest.fixture
+def local_pokedex(monkeypatch, analyzer):
+    """Points the process-wide snapshot (and the indexes built on it) at a path"""
+
+    def install(path: str) -> None:
+        monkeypatch.setattr(pokedex_module, "POKEDEX_PATH", path)
+        monkeypatch.setattr(pokedex_module, "_local_pokedex", None)
+        monkeypatch.setattr(pokedex_module, "_local_pokedex_loaded", False)
+        monkeypatch.setattr(names, "_name_index", None)
+        monkeypatch.setattr(names, "_name_index_loaded", False)
+        monkeypatch.setattr(analyzer, "_local_lookups", None)
+
+    return install
+
+
+@pytest.mark.parametrize("filename", ["pokedex.arrow", "pokedex.json"])
+def test_save_load_round_trip(tmp_path, filename):
+    original = Pokedex.from_records(RECORDS)
+    path = str(tmp_path / "nested" / filename)
+    save_pokedex(original, path)
+    loaded = load_pokedex(path)
+
+    assert loaded.names == ["bulbasaur", "charmander", "mr-mime"]
+    assert loaded.records == original.records
+    assert loaded.sprites == ["b.png", None, "m.png"]
+    np.testing.assert_array_equal(loaded.ids, original.ids)
+    np.testing.assert_array_equal(loaded.type1, original.type1)
+    np.testing.assert_array_equal(loaded.type2, original.type2)
+    assert loaded.type2[1] == NO_TYPE
+    np.testing.assert_array_equal(loaded.multipliers, original.multipliers)
+
+
+def test_loaded_snapshot_looks_up_by_name_and_id(tmp_path):
+    path = str(tmp_path / "pokedex.arrow")
+    save_pokedex(Pokedex.from_records(RECORDS), path)
+    loaded = load_pokedex(path)
+
+    assert loaded.get("Mr-Mime") == RECORDS[2]
+    assert loaded.get("4") == RECORDS[1]
+    assert loaded.get("pikachu") is None
+    assert loaded.get("25") is None
+
+
+def test_sync_pokedex_writes_every_stub_species(analyzer, stub, tmp_path):
+    path = str(tmp_path / "pokedex.arrow")
+    synced = pokedex_module.sync_pokedex(path)
+
+    assert os.path.exists(path)
+    assert sorted(synced.names) == sorted(SPECIES)
+    assert list(synced.ids) == sorted(synced.ids)
+
+    loaded = load_pokedex(path)
+    assert loaded.records == synced.records
+    for name, (pokemon_id, types) in SPECIES.items():
+        record = loaded.get(name)
+        assert record["id"] == pokemon_id
+        assert record["types"] == types
+
+
+def test_missing_snapshot_is_only_looked_for_once(local_pokedex, monkeypatch, tmp_path):
+    local_pokedex(str(tmp_path / "missing.arrow"))
+    checks = []
+    real_exists = os.path.exists
+    monkeypatch.setattr(
+        pokedex_module.os.path,
+        "exists",
+        lambda path: checks.append(path) or real_exists(path),
+    )
+
+    for _ in range(3):
+        assert get_local_pokedex() is None
+    assert checks == [str(tmp_path / "missing.arrow")]
+
+
+def test_lookups_are_served_from_the_snapshot(local_pokedex, analyzer, stub, tmp_path):
+    path = str(tmp_path / "pokedex.arrow")
+    save_pokedex(Pokedex.from_records(RECORDS), path)
+    local_pokedex(path)
+
+    before = stub.request_count
+    assert analyzer.lookup_pokemon("Bulbasaur") == (RECORDS[0], "pokedex")
+    assert analyzer.lookup_pokemon("mr. mime") == (RECORDS[2], "pokedex")
+    # Names the snapshot doesn't know never reach PokeAPI
+    assert analyzer.lookup_pokemon("garchomp") == (None, "name_index")
+    assert stub.request_count == before
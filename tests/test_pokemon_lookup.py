@@ -0,0 +1,84 @@
+import time
+
+import pytest
+
+from cache import NEGATIVE
+
+TEAM = ["garchomp", "scizor", "rotom-wash", "heatran", "togekiss", "gengar"]
+
+
+def requests_for(stub, key: str) -> int:
+    return stub.requests[f"/api/v2/pokemon/{key}"]
+
+
+def test_cold_team_fetch_takes_about_one_round_trip(analyzer, slow_pokeapi):
+    lookups = {}
+    start = time.perf_counter()
+    team_data = analyzer.get_team_data(TEAM, lookups)
+    elapsed = time.perf_counter() - start
+
+    assert team_data["success_count"] == 6
+    assert lookups == {"network": 6}
+    assert slow_pokeapi.request_count == 6
+    # Six sequential requests would take 1.2s
+    assert 0.2 <= elapsed < 0.5
+
+
+def test_cached_entry_expires_after_its_ttl(analyzer, stub, monkeypatch):
+    monkeypatch.setattr(analyzer, "POKEAPI_CACHE_TTL", 0.1)
+
+    before = requests_for(stub, "garchomp")
+    assert analyzer.lookup_pokemon("garchomp")[1] == "network"
+    assert analyzer.lookup_pokemon("garchomp")[1] == "memory"
+    analyzer.pokemon_memory_cache.clear()
+    assert analyzer.lookup_pokemon("garchomp")[1] == "disk"
+    assert requests_for(stub, "garchomp") == before + 1
+
+    time.sleep(0.15)
+    assert analyzer.lookup_pokemon("garchomp")[1] == "network"
+    assert requests_for(stub, "garchomp") == before + 2
+
+
+def test_404_is_cached_and_not_refetched(analyzer, stub):
+    before = requests_for(stub, "missingno")
+    assert analyzer.lookup_pokemon("missingno") == (None, "not_found")
+    assert analyzer.pokeapi_cache.get("name:missingno") == NEGATIVE
+
+    assert analyzer.lookup_pokemon("missingno") == (None, "negative")
+    analyzer.pokemon_memory_cache.clear()
+    assert analyzer.lookup_pokemon("MissingNo") == (None, "negative")
+    assert requests_for(stub, "missingno") == before + 1
+
+
+def test_expired_404_is_asked_again(analyzer, stub, monkeypatch):
+    monkeypatch.setattr(analyzer, "POKEAPI_NEGATIVE_CACHE_TTL", 0.1)
+    before = requests_for(stub, "missingno")
+
+    assert analyzer.lookup_pokemon("missingno") == (None, "not_found")
+    time.sleep(0.15)
+    assert analyzer.lookup_pokemon("missingno") == (None, "not_found")
+    assert requests_for(stub, "missingno") == before + 2
+
+
+@pytest.mark.parametrize("first, second", [("445", "garchomp"), ("garchomp", "445")])
+def test_name_and_id_share_one_fetch(analyzer, stub, first, second):
+    before = stub.request_count
+    record, source = analyzer.lookup_pokemon(first)
+    assert source == "network"
+    assert record["id"] == 445
+
+    assert analyzer.lookup_pokemon(second) == (record, "memory")
+    assert analyzer.pokeapi_cache.get("name:garchomp") == record
+    assert analyzer.pokeapi_cache.get("id:445") == record
+    assert stub.request_count == before + 1
+
+
+def test_offline_mode_serves_only_from_cache(analyzer, stub):
+    record = analyzer.get_pokemon_data("garchomp")
+    analyzer.pokemon_memory_cache.clear()
+    before = stub.request_count
+
+    assert analyzer.lookup_pokemon("garchomp", offline=True) == (record, "disk")
+    assert analyzer.lookup_pokemon("445", offline=True) == (record, "disk")
+    assert analyzer.lookup_pokemon("scizor", offline=True) == (None, "offline")
+    assert stub.request_count == before
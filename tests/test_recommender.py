@@ -0,0 +1,113 @@
+import pytest
+
+from pokedex import Pokedex
+from pokemon_analyzer import (
+    ALL_TYPES,
+    analyze_team_weaknesses,
+    calculate_damage_multiplier,
+)
+from recommender import SCORE_WEIGHTS, recommend_next_member
+from stubs import SPECIES
+
+POKEDEX = Pokedex.from_records(
+    [
+        {"name": name, "id": pokemon_id, "types": types, "sprite": None}
+        for name, (pokemon_id, types) in sorted(
+            SPECIES.items(), key=lambda item: item[1][0]
+        )
+    ]
+)
+
+
+def _member(name):
+    return {"name": name.title(), "types": SPECIES[name][1]}
+
+
+def reference_ranking(members):
+    """Scores every candidate one type at a time with calculate_damage_multiplier"""
+
+    def multipliers(types):
+        return {t: calculate_damage_multiplier(t, types) for t in ALL_TYPES}
+
+    team = [multipliers(member["types"]) for member in members]
+    taken = {member["name"].lower() for member in members}
+
+    ranking = []
+    for row, record in enumerate(POKEDEX.records):
+        if record["name"].lower() in taken:
+            continue
+        candidate = multipliers(record["types"])
+        features = {feature: [] for feature in SCORE_WEIGHTS}
+        for t in ALL_TYPES:
+            critical = any(m[t] >= 4.0 for m in team)
+            vulnerable = sum(m[t] >= 2.0 for m in team)
+            value = candidate[t]
+            if value <= 0.5 and critical:
+                features["covers_critical"].append(t)
+            if value <= 0.5 and not critical and vulnerable >= 2:
+                features["covers_major"].append(t)
+            if value == 0.0 and not any(m[t] == 0.0 for m in team):
+                features["new_immunities"].append(t)
+            if 0.0 < value <= 0.5 and not any(0.0 < m[t] <= 0.5 for m in team):
+                features["new_resistances"].append(t)
+            if value >= 4.0 and not critical:
+                features["new_critical"].append(t)
+            if 2.0 <= value < 4.0 and not critical and vulnerable == 1:
+                features["new_major"].append(t)
+
+        score = sum(SCORE_WEIGHTS[f] * len(types) for f, types in features.items())
+        ranking.append((-score, row, record["name"], features))
+
+    ranking.sort(key=lambda entry: entry[:2])
+    return ranking
+
+
+@pytest.mark.parametrize(
+    "team",
+    [
+        [],
+        ["garchomp"],
+        ["garchomp", "scizor", "pikachu"],
+        ["gengar", "snorlax", "dragonite", "heatran", "togekiss"],
+    ],
+)
+def test_ranking_matches_a_per_candidate_loop(team):
+    members = [_member(name) for name in team]
+
+    recommendations = recommend_next_member(
+        {"team_members": members}, POKEDEX, top_k=len(POKEDEX)
+    )
+    expected = reference_ranking(members)
+
+    assert [r["name"] for r in recommendations] == [name for _, _, name, _ in expected]
+    for recommendation, (score, _, _, features) in zip(recommendations, expected):
+        assert recommendation["score"] == pytest.approx(-score)
+        for feature, types in features.items():
+            assert recommendation[feature] == types
+
+
+def test_after_counts_match_a_full_reanalysis():
+    members = [_member(name) for name in ["garchomp", "scizor", "pikachu"]]
+
+    for recommendation in recommend_next_member(
+        {"team_members": members}, POKEDEX, top_k=5
+    ):
+        candidate = {"name": recommendation["name"], "types": recommendation["types"]}
+        analysis = analyze_team_weaknesses({"team_members": members + [candidate]})
+        assert recommendation["critical_weaknesses_after"] == len(
+            analysis["critical_weaknesses"]
+        )
+        assert recommendation["major_weaknesses_after"] == len(
+            analysis["major_weaknesses"]
+        )
+
+
+def test_team_members_are_never_recommended():
+    members = [_member(name) for name in ["garchomp", "scizor"]]
+    names = {
+        r["name"]
+        for r in recommend_next_member({"team_members": members}, POKEDEX, top_k=50)
+    }
+
+    assert len(names) == len(POKEDEX) - 2
+    assert not names & {"Garchomp", "Scizor"}
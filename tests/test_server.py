@@ -0,0 +1,44 @@
+import json
+
+import pytest
+from tornado.testing import AsyncHTTPTestCase
+
+import server
+
+
+@pytest.fixture(autouse=True)
+def _empty_caches(analyzer):
+    pass
+
+
+class ServerTest(AsyncHTTPTestCase):
+    def get_app(self):
+        return server.make_app(workers=2)
+
+    def test_weaknesses(self):
+        response = self.fetch(
+            "/weaknesses",
+            method="POST",
+            body=json.dumps({"team": ["garchomp", "scizor"]}),
+        )
+        body = json.loads(response.body)
+
+        assert response.code == 200
+        assert body["team"] == ["Garchomp", "Scizor"]
+        assert "ai_recommendations" not in body
+
+    def test_invalid_team_is_rejected(self):
+        response = self.fetch(
+            "/weaknesses", method="POST", body=json.dumps({"team": []})
+        )
+
+        assert response.code == 400
+        assert not json.loads(response.body)["success"]
+
+    def test_unmatched_paths_share_one_endpoint_label(self):
+        for path in ("/health", "/metrics.json", "/wp-login.php", "/a/b", "/x?y=1"):
+            self.fetch(path)
+
+        series = server.REQUEST_SECONDS.as_dict()
+        assert {"/health", "/metrics.json", "not_found"} <= set(series)
+        assert not any(label.startswith(("/wp", "/a", "/x")) for label in series)
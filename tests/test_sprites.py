@@ -0,0 +1,124 @@
+import io
+
+import pytest
+from PIL import Image
+
+import sprites
+from cache import NEGATIVE
+from http_client import ResilientClient
+from stubs import StubPokeAPI
+
+
+def _png(color, size=96) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGBA", (size, size), color).save(out, format="PNG")
+    return out.getvalue()
+
+
+@pytest.fixture
+def sprite_host(monkeypatch, tmp_path):
+    """An empty sprite store and a stub host to download sprites from"""
+
+    monkeypatch.setattr(sprites, "SPRITE_CACHE_DIR", str(tmp_path / "sprites"))
+    monkeypatch.setattr(
+        sprites,
+        "sprite_client",
+        ResilientClient(name="sprites", retries=1, backoff=0.001, max_backoff=0.001),
+    )
+    sprites.sprite_index.clear()
+    sprites.sprite_memory_cache.clear()
+
+    with StubPokeAPI() as stub:
+        yield stub
+
+
+def serve(stub, name, body, content_type="image/png") -> str:
+    stub.files[f"/api/v2/sprites/{name}"] = (content_type, body)
+    return f"{stub.base_url}/sprites/{name}"
+
+
+def stored_files(tmp_path):
+    root = tmp_path / "sprites"
+    return sorted(p.name for p in root.rglob("*.png")) if root.exists() else []
+
+
+def test_identical_bytes_are_stored_once(sprite_host, tmp_path):
+    red = _png("red")
+    first = serve(sprite_host, "1.png", red)
+    second = serve(sprite_host, "1-shiny.png", red)
+    other = serve(sprite_host, "2.png", _png("blue"))
+
+    assert sprites.get_sprite(first) == red
+    assert sprites.get_sprite(second) == red
+    assert sprites.get_sprite(other) is not None
+
+    assert sprites.sprite_index.get(first) == sprites.sprite_index.get(second)
+    assert len(stored_files(tmp_path)) == 2
+
+
+def test_stored_sprites_are_served_without_requests(sprite_host):
+    url = serve(sprite_host, "1.png", _png("red"))
+    data = sprites.get_sprite(url)
+
+    sprites.sprite_memory_cache.clear()
+    assert sprites.get_sprite(url) == data
+    assert sprites.get_sprite(url, offline=True) == data
+    assert sprite_host.request_count == 1
+
+
+def test_resized_copy_is_stored(sprite_host, tmp_path, monkeypatch):
+    url = serve(sprite_host, "1.png", _png("red"))
+
+    small = sprites.get_sprite(url, size=32)
+    with Image.open(io.BytesIO(small)) as image:
+        assert image.size == (32, 32)
+    digest = sprites.sprite_index.get(url)
+    assert stored_files(tmp_path) == sorted([f"{digest}.png", f"{digest}-32.png"])
+
+    # Later renders read the stored copy instead of resizing again
+    sprites.sprite_memory_cache.clear()
+    monkeypatch.setattr(sprites, "_resize", pytest.fail)
+    assert sprites.get_sprite(url, size=32) == small
+    assert sprite_host.request_count == 1
+
+
+def test_missing_sprite_is_cached_as_negative(sprite_host):
+    url = f"{sprite_host.base_url}/sprites/404.png"
+
+    assert sprites.get_sprite(url) is None
+    assert sprites.sprite_index.get(url) == NEGATIVE
+    assert sprites.get_sprite(url) is None
+    assert sprite_host.request_count == 1
+
+
+def test_failed_fetch_is_not_cached(sprite_host, tmp_path):
+    url = serve(sprite_host, "1.png", _png("red"))
+    sprite_host.failures = 2
+
+    assert sprites.get_sprite(url) is None
+    assert sprites.sprite_index.get(url) is None
+    assert stored_files(tmp_path) == []
+
+    # Once the host recovers the sprite loads
+    assert sprites.get_sprite(url) is not None
+
+
+def test_non_image_answer_is_rejected(sprite_host, tmp_path):
+    url = serve(sprite_host, "1.png", b"<html>login</html>", "text/html")
+
+    assert sprites.get_sprite(url) is None
+    assert stored_files(tmp_path) == []
+
+
+def test_offline_without_a_stored_copy_makes_no_request(sprite_host):
+    url = serve(sprite_host, "1.png", _png("red"))
+
+    assert sprites.get_sprite(url, offline=True) is None
+    assert sprite_host.request_count == 0
+
+
+def test_get_sprites_skips_the_ones_that_fail(sprite_host):
+    good = serve(sprite_host, "1.png", _png("red"))
+    missing = f"{sprite_host.base_url}/sprites/404.png"
+
+    assert list(sprites.get_sprites([good, missing, None, good])) == [good]
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+
+SNIPPET = """
+import os, sys, threading
+import pokemon_analyzer, server, sprites, offensive_coverage
+print(sorted(sys.modules).count("google.genai"), threading.active_count())
+print(os.path.exists(os.environ["POKEAPI_CACHE_PATH"]), os.path.exists(os.environ["AI_CACHE_PATH"]))
+print(pokemon_analyzer.pokeapi_client._session is None, pokemon_analyzer.ai_job_queue._calls is None)
+"""
+
+
+def test_import_has_no_side_effects(tmp_path):
+    env = dict(
+        os.environ,
+        POKEAPI_CACHE_PATH=str(tmp_path / "cache" / "pokeapi.sqlite3"),
+        AI_CACHE_PATH=str(tmp_path / "cache" / "ai.sqlite3"),
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", SNIPPET],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split("\n")
+
+    assert output[:3] == ["0 1", "False False", "True True"]
+    assert not (tmp_path / "cache").exists()
+
+
+def test_persistent_cache_opens_on_first_use(tmp_path):
+    from cache import PersistentCache
+
+    path = tmp_path / "nested" / "cache.sqlite3"
+    cache = PersistentCache(str(path), namespace="test")
+    assert not path.parent.exists()
+
+    cache.set("key", {"value": 1})
+    assert path.exists()
+    assert PersistentCache(str(path), namespace="test").get("key") == {"value": 1}
@@ -0,0 +1,96 @@
+import os
+import threading
+
+import pytest
+
+from conftest import ROOT
+from stubs import FakeGenaiClient
+
+
+def _analysis(analyzer, team):
+    result = analyzer.analyze_team(team)
+    assert result["success"]
+    return result["team_data"], result["weakness_analysis"]
+
+
+def test_analyze_team_does_not_wait_for_ai(analyzer, fake_ai):
+    result = analyzer.analyze_team(["garchomp", "scizor"])
+
+    assert result["success"]
+    assert result["ai_recommendations"] is None
+    assert fake_ai.calls == 0
+
+
+def test_stream_yields_chunks_then_serves_the_cache(analyzer):
+    fake = FakeGenaiClient()
+    team_data, weakness_analysis = _analysis(analyzer, ["garchomp", "scizor"])
+
+    chunks = list(
+        analyzer.stream_ai_team_recommendations(team_data, weakness_analysis, fake)
+    )
+    assert len(chunks) > 1
+    assert "".join(chunks) == fake.text
+
+    # Cached answers come back in one piece, without another model call
+    again = list(
+        analyzer.stream_ai_team_recommendations(team_data, weakness_analysis, fake)
+    )
+    assert again == [fake.text]
+    assert fake.calls == 1
+    assert analyzer.get_ai_team_recommendations(team_data, weakness_analysis) == (
+        fake.text
+    )
+
+
+def test_abandoned_stream_is_not_cached_and_releases_waiters(analyzer):
+    fake = FakeGenaiClient()
+    team_data, weakness_analysis = _analysis(analyzer, ["pikachu"])
+
+    stream = analyzer.stream_ai_team_recommendations(team_data, weakness_analysis, fake)
+    next(stream)
+    stream.close()
+
+    chunks = list(
+        analyzer.stream_ai_team_recommendations(team_data, weakness_analysis, fake)
+    )
+    assert "".join(chunks) == fake.text
+    assert fake.calls == 2
+
+
+def test_app_renders_analysis_and_streamed_recommendations(analyzer, fake_ai):
+    AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=30)
+    app.run()
+    app.text_input(key="pokemon_0").set_value("garchomp")
+    app.text_input(key="pokemon_1").set_value("scizor")
+    app.button[0].click().run()
+
+    assert not app.exception
+    headers = [header.value for header in app.header]
+    assert headers.index("🤖 AI Strategic Recommendations") > 0
+    assert any(fake_ai.text.strip() in md.value for md in app.markdown)
+    assert fake_ai.calls == 1
+
+
+def test_concurrent_identical_streams_make_one_call(analyzer):
+    fake = FakeGenaiClient(latency=0.3)
+    team_data, weakness_analysis = _analysis(analyzer, ["gengar", "snorlax"])
+    barrier = threading.Barrier(4)
+    texts = [None] * 4
+
+    def consume(i):
+        barrier.wait()
+        stream = analyzer.stream_ai_team_recommendations(
+            team_data, weakness_analysis, fake
+        )
+        texts[i] = "".join(stream)
+
+    threads = [threading.Thread(target=consume, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert texts == [fake.text] * 4
+    assert fake.calls == 1
@@ -0,0 +1,59 @@
+import threading
+
+TEAM = ["garchomp", "scizor", "rotom-wash", "heatran"]
+
+
+def _concurrently(count, fn):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(i):
+        barrier.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+def test_concurrent_identical_teams_are_analyzed_once(analyzer, slow_pokeapi):
+    shared = analyzer.team_single_flight.as_dict()["shared"]
+
+    results = _concurrently(6, lambda: analyzer.get_cached_team_analysis(TEAM))
+
+    assert all(result["success"] for result in results)
+    assert {result["metrics"]["team_cache"] for result in results} == {"miss"}
+    assert len({id(result["metrics"]) for result in results}) == 6
+    # One request per member, not one per caller
+    assert slow_pokeapi.request_count == len(TEAM)
+    assert analyzer.team_single_flight.as_dict()["shared"] - shared == 5
+
+
+def test_equivalent_teams_share_a_cache_entry(analyzer, stub):
+    first = analyzer.get_cached_team_analysis(TEAM)
+    before = stub.request_count
+
+    again = analyzer.get_cached_team_analysis(
+        [" Garchomp", "SCIZOR ", "Rotom-Wash", "heatran"]
+    )
+
+    assert again["metrics"]["team_cache"] == "hit"
+    assert again["weakness_analysis"] == first["weakness_analysis"]
+    assert len(analyzer.team_analysis_cache) == 1
+    assert stub.request_count == before
+
+
+def test_teams_with_failed_lookups_are_not_cached(analyzer, stub):
+    result = analyzer.get_cached_team_analysis(["garchomp", "missingno"])
+
+    assert result["team_data"]["failed_pokemon"] == ["missingno"]
+    assert len(analyzer.team_analysis_cache) == 0
+    assert (
+        analyzer.get_cached_team_analysis(["garchomp", "missingno"])["metrics"][
+            "team_cache"
+        ]
+        == "miss"
+    )
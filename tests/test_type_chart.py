@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from pokemon_analyzer import (
+    ALL_TYPES,
+    DEFENSIVE_PROFILES,
+    TYPE_COMBINATIONS,
+    calculate_damage_multiplier,
+    get_defensive_profile,
+)
+
+
+def test_table_covers_every_combination():
+    assert len(TYPE_COMBINATIONS) == 171
+    assert set(DEFENSIVE_PROFILES) == set(TYPE_COMBINATIONS)
+
+
+@pytest.mark.parametrize("combo", TYPE_COMBINATIONS, ids="/".join)
+def test_profile_matches_calculate_damage_multiplier(combo):
+    profile = DEFENSIVE_PROFILES[combo]
+
+    for col, attacking_type in enumerate(ALL_TYPES):
+        expected = calculate_damage_multiplier(attacking_type, list(combo))
+        assert profile.multipliers[col] == expected, attacking_type
+
+        bit = 1 << col
+        assert bool(profile.critical_mask & bit) == (expected >= 4.0)
+        assert bool(profile.vulnerable_mask & bit) == (expected >= 2.0)
+        assert bool(profile.resistant_mask & bit) == (0 < expected <= 0.5)
+        assert bool(profile.immune_mask & bit) == (expected == 0.0)
+
+    masks = (
+        profile.critical_mask,
+        profile.vulnerable_mask,
+        profile.resistant_mask,
+        profile.immune_mask,
+    )
+    assert profile.flag_offsets == tuple(
+        row * len(ALL_TYPES) + col
+        for row, mask in enumerate(masks)
+        for col in range(len(ALL_TYPES))
+        if mask >> col & 1
+    )
+
+
+def test_lookup_is_order_independent():
+    assert (
+        get_defensive_profile(["water", "fire"])
+        is DEFENSIVE_PROFILES[("fire", "water")]
+    )
+
+
+def test_unknown_types_count_as_neutral():
+    profile = get_defensive_profile(["fire", "shadow"])
+    assert np.array_equal(
+        profile.multipliers, DEFENSIVE_PROFILES[("fire",)].multipliers
+    )
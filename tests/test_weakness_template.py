@@ -0,0 +1,112 @@
+import json
+import random
+
+import pytest
+
+from models import PokemonRecord, TeamAnalysis
+from pokemon_analyzer import (
+    ALL_TYPES,
+    TYPE_COMBINATIONS,
+    calculate_damage_multiplier,
+)
+
+
+def _reference(members) -> dict:
+    """analyze_team_weaknesses computed from scratch, without a template"""
+
+    analysis = {
+        "critical_weaknesses": [],
+        "major_weaknesses": [],
+        "minor_weaknesses": [],
+        "resistances": [],
+        "immunities": [],
+        "team_coverage": {},
+        "type_threat_level": {},
+    }
+    for attacking_type in ALL_TYPES:
+        vulnerable, critical, resistant, immune = [], [], [], []
+        for pokemon in members:
+            multiplier = calculate_damage_multiplier(attacking_type, pokemon["types"])
+            if multiplier >= 4.0:
+                critical.append(pokemon["name"])
+                vulnerable.append(pokemon["name"])
+            elif multiplier >= 2.0:
+                vulnerable.append(pokemon["name"])
+            elif multiplier == 0.0:
+                immune.append(pokemon["name"])
+            elif multiplier <= 0.5:
+                resistant.append(pokemon["name"])
+
+        threat = {
+            "type": attacking_type,
+            "vulnerable_count": len(vulnerable),
+            "critical_count": len(critical),
+            "vulnerable_pokemon": vulnerable,
+            "critical_pokemon": critical,
+            "resistant_pokemon": resistant,
+            "immune_pokemon": immune,
+        }
+        analysis["type_threat_level"][attacking_type] = threat
+        if critical:
+            analysis["critical_weaknesses"].append(threat)
+        elif len(vulnerable) >= 2:
+            analysis["major_weaknesses"].append(threat)
+        elif vulnerable:
+            analysis["minor_weaknesses"].append(threat)
+        if resistant or immune:
+            analysis["resistances"].append(threat)
+        if immune:
+            analysis["immunities"].append(threat)
+
+    analysis["critical_weaknesses"].sort(
+        key=lambda t: t["critical_count"], reverse=True
+    )
+    analysis["major_weaknesses"].sort(key=lambda t: t["vulnerable_count"], reverse=True)
+    return analysis
+
+
+def _team(rng: random.Random, size: int) -> list:
+    return [
+        {"name": f"Mon{i}", "types": list(rng.choice(TYPE_COMBINATIONS))}
+        for i in range(size)
+    ]
+
+
+@pytest.mark.parametrize("size", [0, 1, 6, 9, 12])
+def test_matches_a_computation_from_scratch(analyzer, size):
+    rng = random.Random(size)
+    for _ in range(50):
+        members = _team(rng, size)
+        result = analyzer.analyze_team_weaknesses({"team_members": members})
+        assert json.dumps(result) == json.dumps(_reference(members))
+
+
+def test_cache_hit_binds_new_names_in_team_order(analyzer):
+    members = [
+        {"name": "Garchomp", "types": ["dragon", "ground"]},
+        {"name": "Scizor", "types": ["bug", "steel"]},
+    ]
+    renamed = [
+        {"name": "Mawile", "types": ["steel", "bug"]},
+        {"name": "Flygon", "types": ["ground", "dragon"]},
+    ]
+
+    analyzer.analyze_team_weaknesses({"team_members": members})
+    hits = analyzer.get_weakness_cache_stats()["hits"]
+    result = analyzer.analyze_team_weaknesses({"team_members": renamed})
+
+    assert analyzer.get_weakness_cache_stats()["hits"] == hits + 1
+    assert json.dumps(result) == json.dumps(_reference(renamed))
+
+
+def test_team_analysis_with_more_than_eight_members(analyzer):
+    # Slot masks used to be bytes and overflowed past 8 members
+    members = _team(random.Random(9), 9)
+    records = [
+        PokemonRecord(m["name"], i, bytes(ALL_TYPES.index(t) for t in m["types"]), None)
+        for i, m in enumerate(members)
+    ]
+
+    analysis = TeamAnalysis.build(records)
+
+    assert json.dumps(analysis.weakness_analysis()) == json.dumps(_reference(members))